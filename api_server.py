@@ -5,34 +5,62 @@ Stateless API for tag suggestions.
 Endpoints:
 - POST /train: Train prototypes from training data and save to PostgreSQL
 - POST /suggest-tags: Get tag suggestions for lectures  
+- POST /suggest-tags-batch: Tag suggestions for many lectures, streamed as NDJSON
+- POST /suggest-tags-stream: Server-sent events - fast suggestions first, then the refined mode's
 - POST /reload-prototypes: Reload prototypes from PostgreSQL
 - GET /health: Health check
+- GET /metrics: In-process performance metrics
+- POST /prewarm-bios: Pre-warm the lecturer bio cache (GET for progress)
+- POST /label-sets: Register a labels list under an artifact_version (GET to list)
 - GET /: API information
 """
 
 import os
 import json
+import asyncio
 import logging
 import time
 import threading
+import contextvars
 import requests
 import urllib3
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 
 # Suppress SSL warnings for internal Replit-to-Replit calls (see fetch_training_data_from_api)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-from flask import Flask, request, jsonify, g
+from flask import Flask, Response, request, jsonify, g
 from replit import db
 from src.embeddings import EmbeddingsGenerator
 from src.prototype_knn import PrototypeKNN
 from src.config import Config
 from src.llm_arbiter import LLMArbiter
-from src.reasoning_scorer import ReasoningScorer
-from src.lecturer_search import LecturerSearchService
-from src.csv_parser import parse_csv_training_data
+from src.reasoning_scorer import EXPLAIN_LEVELS, ReasoningScorer, reasoning_output_stats
+from src.lecturer_search import LecturerSearchService, bio_search_flight, bio_cache
+from src.csv_parser import CSVFormatError, parse_csv_training_stream
+from src.json_stream import JSONStreamError, iter_object_members
 from src.prototype_storage import PrototypeStorage
 from src.ensemble_scorer import EnsembleScorer
+from src.micro_batcher import MicroBatcher
+from src.scoring_context import ScoringContext
+from src.shadow_scoring import ShadowScorer
+from src.streaming_training import StreamingTrainer
+from src.training_data_fetcher import TrainingDataFetcher
+from src.bio_prewarm import BioPrewarmJob, collect_lecturers
+from src.circuit_breaker import chat_breaker, circuit_breakers, embeddings_breaker
+from src.auto_router import (
+    ROUTE_COST_CAPPED, ROUTE_FAST, ROUTE_LLM, ROUTE_LLM_UNAVAILABLE,
+    assess_margins, auto_routing_stats, candidate_tags_for
+)
+from src.llm_hedging import arbiter_hedger, reasoning_hedger
+from src.deadline import (
+    Deadline, DeadlineExceeded, check_deadline, current_deadline, deadline_stats, parse_deadline_ms, request_deadline
+)
+from src.label_catalog import (
+    LabelCatalog, as_label_catalog, fingerprint_labels, get_label_catalog,
+    label_catalog_cache, registered_catalog_cache
+)
 from src.logging_utils import StructuredLogger, track_operation, sanitize_for_logging
 from src.request_logging import log_request_middleware, log_api_call_details, log_scoring_metrics
 from src.discord_notifier import DiscordNotifier
@@ -62,6 +90,26 @@ prototype_knn = None
 tag_embeddings_cache = None
 config = None
 
+# Coalesces concurrent fast-mode requests (created on first use)
+fast_batcher = None
+_fast_batcher_lock = threading.Lock()
+
+# Coalesces concurrent full_quality arbiter reviews into one LLM call (created on first use)
+arbiter_batcher = None
+_arbiter_batcher_lock = threading.Lock()
+
+# Runs deadline-bound LLM stages so the request can stop waiting (created on first use)
+deadline_executor = None
+_deadline_executor_lock = threading.Lock()
+
+# Background comparison runs of SHADOW_MODES (created on first use when enabled)
+shadow_scorer = None
+_shadow_scorer_lock = threading.Lock()
+
+# Latest lecturer bio pre-warm job (one runs at a time)
+bio_prewarm_job = None
+_bio_prewarm_lock = threading.Lock()
+
 
 def load_prototypes_from_db():
     """Load prototypes from PostgreSQL database."""
@@ -117,9 +165,28 @@ def validate_training_data(lectures: List[Dict], tags_data: Dict) -> Dict[str, a
     
     Returns warnings and statistics about the training data.
     """
+    # Count examples per tag (handle both v1 and v2 formats)
+    lecture_tag_counts = {}
+    for lecture in lectures:
+        tag_ids = lecture.get('lecture_tag_ids') or lecture.get('label_ids', [])
+        for tag_id in tag_ids:
+            lecture_tag_counts[tag_id] = lecture_tag_counts.get(tag_id, 0) + 1
+    
+    return summarize_training_data(len(lectures), lecture_tag_counts, tags_data)
+
+
+def summarize_training_data(num_lectures: int, lecture_tag_counts: Dict[str, int], tags_data: Dict) -> Dict[str, any]:
+    """
+    validate_training_data from precomputed counts (used by streamed training).
+    
+    Args:
+        num_lectures: Number of training lectures
+        lecture_tag_counts: tag_id -> number of lectures tagged with it (ids outside tags_data are ignored)
+        tags_data: Tags dict
+    """
     warnings = []
     stats = {
-        'total_lectures': len(lectures),
+        'total_lectures': num_lectures,
         'total_tags': len(tags_data),
         'categories': {},
         'low_data_tags': []
@@ -132,14 +199,7 @@ def validate_training_data(lectures: List[Dict], tags_data: Dict) -> Dict[str, a
     for tag_id, tag_info in tags_data.items():
         category = tag_info.get('category', 'Unknown')
         category_counts[category] = category_counts.get(category, 0) + 1
-        tag_example_counts[tag_id] = 0
-    
-    # Count examples per tag (handle both v1 and v2 formats)
-    for lecture in lectures:
-        tag_ids = lecture.get('lecture_tag_ids') or lecture.get('label_ids', [])
-        for tag_id in tag_ids:
-            if tag_id in tag_example_counts:
-                tag_example_counts[tag_id] += 1
+        tag_example_counts[tag_id] = lecture_tag_counts.get(tag_id, 0)
     
     # Check for low-data tags
     for tag_id, count in tag_example_counts.items():
@@ -167,8 +227,8 @@ def validate_training_data(lectures: List[Dict], tags_data: Dict) -> Dict[str, a
     if len(stats['low_data_tags']) > len(tags_data) * 0.5:
         warnings.append(f"{len(stats['low_data_tags'])} tags have <5 examples (>{len(tags_data)//2} tags). Model may struggle with these.")
     
-    if len(lectures) < 20:
-        warnings.append(f"Only {len(lectures)} training lectures. Recommend at least 20-50 for reliable prototypes.")
+    if num_lectures < 20:
+        warnings.append(f"Only {num_lectures} training lectures. Recommend at least 20-50 for reliable prototypes.")
     
     stats['warnings'] = warnings
     return stats
@@ -214,6 +274,20 @@ def train_from_data(training_data: dict) -> dict:
     logger.info(f"Generated embeddings for {len(lecture_embeddings)} lectures")
     
     # Generate tag label embeddings
+    tag_embeddings = _generate_tag_embeddings(embeddings_gen, tags_data)
+    
+    # Build prototypes
+    train_prototype_knn = PrototypeKNN(train_config)
+    train_prototype_knn.build_prototypes(lectures, lecture_embeddings, tags_data)
+    
+    # Calibrate thresholds
+    train_prototype_knn.calibrate_thresholds(lectures, lecture_embeddings, tag_embeddings)
+    
+    return _save_trained_prototypes(train_prototype_knn, tag_embeddings, tags_data, len(lectures), validation_stats)
+
+
+def _generate_tag_embeddings(embeddings_gen: EmbeddingsGenerator, tags_data: Dict) -> Dict[str, np.ndarray]:
+    """Embeddings of each tag's name (plus synonyms), the label side of low-data scoring."""
     tag_label_texts = {}
     for tag_id, tag_info in tags_data.items():
         name = tag_info.get('name_he', '')
@@ -225,14 +299,17 @@ def train_from_data(training_data: dict) -> dict:
     
     tag_embeddings = embeddings_gen.generate_tag_embeddings(tag_label_texts)
     logger.info(f"Generated embeddings for {len(tag_embeddings)} tags")
+    return tag_embeddings
     
-    # Build prototypes
-    train_prototype_knn = PrototypeKNN(train_config)
-    train_prototype_knn.build_prototypes(lectures, lecture_embeddings, tags_data)
-    
-    # Calibrate thresholds
-    train_prototype_knn.calibrate_thresholds(lectures, lecture_embeddings, tag_embeddings)
     
+def _save_trained_prototypes(
+    train_prototype_knn: PrototypeKNN,
+    tag_embeddings: Dict[str, np.ndarray],
+    tags_data: Dict,
+    num_lectures: int,
+    validation_stats: Dict
+) -> dict:
+    """Save trained prototypes as the default version and build the training summary."""
     # Save to PostgreSQL database
     storage = PrototypeStorage()
     version_id = storage.save_prototypes(
@@ -240,7 +317,7 @@ def train_from_data(training_data: dict) -> dict:
         tag_thresholds=train_prototype_knn.tag_thresholds,
         tag_stats=train_prototype_knn.tag_stats,
         tag_embeddings=tag_embeddings,
-        num_lectures=len(lectures),
+        num_lectures=num_lectures,
         tags_data=tags_data,
         version_name='default'
     )
@@ -250,7 +327,7 @@ def train_from_data(training_data: dict) -> dict:
     return {
         'status': 'success',
         'num_prototypes': len(train_prototype_knn.tag_prototypes),
-        'num_lectures': len(lectures),
+        'num_lectures': num_lectures,
         'num_tags': len(tags_data),
         'low_data_tags': sum(1 for s in train_prototype_knn.tag_stats.values() if s.get('is_low_data', False)),
         'validation': {
@@ -261,7 +338,163 @@ def train_from_data(training_data: dict) -> dict:
     }
 
 
-def score_lecture_fast(lecture: Dict, labels: List[Dict]) -> List[Dict]:
+def _labels_to_tags(labels: List[Dict]) -> Dict[str, Dict]:
+    """Convert a v2 labels array to the v1 tags dict (preserving category)."""
+    tags = {}
+    for label in labels:
+        tags[label['id']] = {
+            'tag_id': label['id'],
+            'name_he': label.get('name_he', ''),
+            'synonyms_he': label.get('synonyms_he', ''),
+            'category': label.get('category', 'Unknown')
+        }
+    return tags
+
+
+def _training_lecture(lecture: Dict) -> Dict:
+    """A v1 or v2 lecture in train_from_data's format (v1 fields win when both are present)."""
+    if not isinstance(lecture, dict):
+        raise ValueError("Each lecture must be a JSON object")
+    
+    return {
+        'id': lecture.get('id'),
+        'lecture_title': lecture['lecture_title'] if 'lecture_title' in lecture else lecture.get('title', ''),
+        'lecture_description': lecture['lecture_description'] if 'lecture_description' in lecture else lecture.get('description', ''),
+        'lecture_tag_ids': lecture['lecture_tag_ids'] if 'lecture_tag_ids' in lecture else lecture.get('label_ids', [])
+    }
+
+
+def train_from_stream(body) -> dict:
+    """
+    Train prototypes from a /train body (v1 or v2 format) as it is read.
+    
+    Lectures are parsed one by one, converted on the fly and embedded in
+    batches of batch_size_embeddings by a StreamingTrainer, so memory is
+    bounded by the batch size rather than the payload. Labels/tags may come
+    before or after the lectures.
+    
+    Args:
+        body: Binary stream of the JSON request body
+    
+    Raises:
+        JSONStreamError: on malformed JSON
+        ValueError: on missing lectures/tags or a lecture without an id
+    """
+    train_config = Config()
+    embeddings_gen = EmbeddingsGenerator(
+        api_key=train_config.openai_api_key,
+        model=train_config.embedding_model
+    )
+    
+    labels_tags = None
+    v1_tags = None
+    
+    with StreamingTrainer(embeddings_gen, train_config.batch_size_embeddings) as trainer:
+        for key, value in iter_object_members(body, lazy_arrays=('lectures',)):
+            if key == 'lectures':
+                for lecture in value:
+                    trainer.add_lecture(_training_lecture(lecture))
+            elif key == 'labels' and isinstance(value, list):
+                labels_tags = _labels_to_tags(value)
+            elif key == 'tags':
+                v1_tags = value
+        
+        # v2 labels take precedence over v1 tags, as in the non-streamed format detection
+        tags_data = labels_tags if labels_tags is not None else (v1_tags or {})
+        
+        if not trainer.num_lectures:
+            raise ValueError("No lectures provided in training data")
+        
+        if not tags_data:
+            raise ValueError("No tags provided in training data")
+        
+        logger.info(f"Training on {trainer.num_lectures} lectures with {len(tags_data)} tags")
+        
+        # Validate training data quality
+        validation_stats = summarize_training_data(trainer.num_lectures, trainer.tag_example_counts, tags_data)
+        for warning in validation_stats['warnings']:
+            logger.warning(f"Training validation: {warning}")
+        
+        tag_embeddings = _generate_tag_embeddings(embeddings_gen, tags_data)
+        train_prototype_knn = trainer.build(train_config, tags_data, tag_embeddings)
+        num_lectures = trainer.num_lectures
+    
+    return _save_trained_prototypes(train_prototype_knn, tag_embeddings, tags_data, num_lectures, validation_stats)
+
+
+def _score_fast_batch(items: List[tuple]) -> List[Tuple[np.ndarray, Dict[str, float]]]:
+    """
+    Process one micro-batch of fast-mode (lecture_for_embedding, label_mask) items.
+    
+    All lectures are embedded in a single API call and scored against the
+    prototypes in a single matrix pass, each restricted to its own label set.
+    Returns (embedding, scores) per item so each request's ScoringContext
+    keeps its embedding.
+    """
+    embeddings_gen = EmbeddingsGenerator(
+        api_key=config.openai_api_key,
+        model=config.embedding_model,
+        circuit_breaker=embeddings_breaker
+    )
+    
+    texts = [
+        embeddings_gen.create_lecture_text(l.get('lecture_title', ''), l.get('lecture_description', ''))
+        for l, _ in items
+    ]
+    embeddings = embeddings_gen.generate_embeddings(texts, "lectures (micro-batch)")
+    
+    scores = prototype_knn.score_lectures_batch(
+        embeddings,
+        tag_embeddings_cache,
+        tag_masks=[label_mask for _, label_mask in items]
+    )
+    return list(zip(embeddings, scores))
+
+
+def _get_fast_batcher() -> MicroBatcher:
+    """Get the process-wide fast-mode micro-batcher, creating it on first use."""
+    global fast_batcher
+    
+    with _fast_batcher_lock:
+        if fast_batcher is None:
+            fast_batcher = MicroBatcher(
+                process_batch=_score_fast_batch,
+                max_batch_size=config.fast_batch_max_size,
+                max_wait_ms=config.fast_batch_max_wait_ms,
+                name="fast_mode_batcher"
+            )
+        return fast_batcher
+
+
+def _get_arbiter_batcher() -> MicroBatcher:
+    """Get the process-wide arbiter micro-batcher, creating it on first use."""
+    global arbiter_batcher
+    
+    with _arbiter_batcher_lock:
+        if arbiter_batcher is None:
+            arbiter = LLMArbiter(api_key=config.openai_api_key, config=config)
+            arbiter_batcher = MicroBatcher(
+                process_batch=arbiter.refine_suggestions_batch,
+                max_batch_size=config.arbiter_batch_max_size,
+                max_wait_ms=config.arbiter_batch_max_wait_ms,
+                name="arbiter_batcher"
+            )
+        return arbiter_batcher
+
+
+def _scoring_context(lecture: Dict, catalog: LabelCatalog) -> ScoringContext:
+    """Per-lecture context shared by the scoring modes of one request."""
+    return ScoringContext(
+        lecture=lecture,
+        catalog=catalog,
+        prototype_knn=prototype_knn,
+        tag_embeddings=tag_embeddings_cache,
+        config=config,
+        fetch_lecturer_profile=_fetch_lecturer_profile
+    )
+
+
+def score_lecture_fast(ctx: ScoringContext) -> List[Dict]:
     """
     Fast scoring mode: Prototype similarity only with category-aware thresholds.
     
@@ -271,8 +504,7 @@ def score_lecture_fast(lecture: Dict, labels: List[Dict]) -> List[Dict]:
     - Intelligent reasons generation
     
     Args:
-        lecture: Lecture dict with id, title, description, lecturer info, etc.
-        labels: List of label dicts with id, name_he, category, active
+        ctx: ScoringContext of the lecture and the request's labels
     
     Returns:
         List of suggestions with label_id, category, confidence, reasons
@@ -280,32 +512,34 @@ def score_lecture_fast(lecture: Dict, labels: List[Dict]) -> List[Dict]:
     if not prototypes_loaded:
         raise RuntimeError("Prototypes not loaded. Please train first or reload prototypes.")
     
-    # Convert to old format for embeddings
-    lecture_for_embedding = {
-        'id': lecture.get('id'),
-        'lecture_title': lecture.get('title', ''),
-        'lecture_description': lecture.get('description', '')
-    }
-    
-    # Generate embedding
-    embeddings_gen = EmbeddingsGenerator(
-        api_key=config.openai_api_key,
-        model=config.embedding_model
-    )
-    
-    lecture_embeddings = embeddings_gen.generate_lecture_embeddings([lecture_for_embedding])
-    lecture_id = lecture.get('id')
-    
-    if lecture_id not in lecture_embeddings:
-        return []
-    
-    lecture_embedding = lecture_embeddings[lecture_id]
+    return _fast_suggestions(ctx.lecture, ctx.catalog, _fast_scores(ctx))
     
-    # Get base scores from prototype KNN
-    scores = prototype_knn.score_lecture(lecture_embedding, tag_embeddings_cache)
+
+def _fast_scores(ctx: ScoringContext) -> Dict[str, float]:
+    """Thresholded prototype scores for fast mode, memoized on the context."""
+    def build():
+        if config.fast_batching:
+            batched = {}
+            
+            def embed_batched():
+                # Embedding + prototype pass shared with concurrent fast requests
+                label_mask = ctx.catalog.prototype_mask(prototype_knn.prototype_tag_ids(tag_embeddings_cache))
+                embedding, batched['scores'] = _get_fast_batcher().submit((ctx.lecture_for_embedding(), label_mask))
+                return embedding
+            
+            # Under the embedding memo, so another mode of this request embedding the lecture
+            # (built or in flight) is waited for instead of embedded again in the batch
+            ctx.memo('embedding', embed_batched)
+            if 'scores' in batched:
+                return batched['scores']
+        return ctx.prototype_scores()
     
-    # Create label lookup by id
-    labels_by_id = {label['id']: label for label in labels if label.get('active', True)}
+    return ctx.memo('fast_scores', build)
+
+
+def _fast_suggestions(lecture: Dict, catalog: LabelCatalog, scores: Dict[str, float]) -> List[Dict]:
+    """Fast-mode suggestions from thresholded prototype scores (category thresholds, boosts, reasons)."""
+    labels_by_id = catalog.active_labels_by_id
     
     # Extract related lectures labels for co-occurrence analysis
     related_labels = set()
@@ -366,7 +600,7 @@ def score_lecture_fast(lecture: Dict, labels: List[Dict]) -> List[Dict]:
     return suggestions
 
 
-def score_lecture_with_arbiter(lecture: Dict, labels: List[Dict]) -> List[Dict]:
+def score_lecture_with_arbiter(ctx: ScoringContext) -> List[Dict]:
     """
     Full quality mode: Prototype scoring + LLM arbiter for borderline cases.
     
@@ -377,8 +611,7 @@ def score_lecture_with_arbiter(lecture: Dict, labels: List[Dict]) -> List[Dict]:
     4. Reject low confidence (< 0.60)
     
     Args:
-        lecture: Lecture dict with id, title, description, etc.
-        labels: List of label dicts
+        ctx: ScoringContext of the lecture and the request's labels
     
     Returns:
         List of high-quality suggestions
@@ -387,13 +620,13 @@ def score_lecture_with_arbiter(lecture: Dict, labels: List[Dict]) -> List[Dict]:
         raise RuntimeError("Prototypes not loaded. Please train first or reload prototypes.")
     
     # Get fast prototype scores first
-    fast_suggestions = score_lecture_fast(lecture, labels)
+    fast_suggestions = score_lecture_fast(ctx)
     
     if not fast_suggestions:
         return []
     
-    # Create labels lookup
-    labels_by_id = {label['id']: label for label in labels}
+    lecture = ctx.lecture
+    labels_by_id = ctx.catalog.labels_by_id
     
     # Split into high, borderline, and low confidence
     high_confidence = []
@@ -413,21 +646,34 @@ def score_lecture_with_arbiter(lecture: Dict, labels: List[Dict]) -> List[Dict]:
         return high_confidence
     
     # Use LLM arbiter to refine borderline suggestions
+    check_deadline("arbiter")
     logger.info(f"LLM arbiter reviewing {len(borderline)} borderline suggestions")
     
-    arbiter = LLMArbiter(api_key=config.openai_api_key, config=config)
-    
     # Convert borderline to format expected by arbiter
     borderline_scores = {sugg['label_id']: sugg['confidence'] for sugg in borderline}
     candidate_tags = {label_id: labels_by_id[label_id] for label_id in borderline_scores.keys()}
     
-    # Call arbiter
-    approved_ids = arbiter.refine_suggestions(
-        lecture_title=lecture.get('title', ''),
-        lecture_description=lecture.get('description', ''),
-        candidate_tags=candidate_tags,
-        scores=borderline_scores
-    )
+    # Call arbiter (batched with other lectures' reviews when enabled)
+    if config.arbiter_batching:
+        deadline = current_deadline()
+        approved_ids = _get_arbiter_batcher().submit(
+            {
+                'lecture_id': lecture.get('id'),
+                'lecture_title': lecture.get('title', ''),
+                'lecture_description': lecture.get('description', ''),
+                'candidate_tags': candidate_tags,
+                'scores': borderline_scores
+            },
+            timeout=deadline.remaining() if deadline is not None else None
+        )
+    else:
+        arbiter = LLMArbiter(api_key=config.openai_api_key, config=config)
+        approved_ids = arbiter.refine_suggestions(
+            lecture_title=lecture.get('title', ''),
+            lecture_description=lecture.get('description', ''),
+            candidate_tags=candidate_tags,
+            scores=borderline_scores
+        )
     
     # Add approved borderline suggestions
     arbiter_approved = [
@@ -450,79 +696,133 @@ def score_lecture_with_arbiter(lecture: Dict, labels: List[Dict]) -> List[Dict]:
     return final_suggestions
 
 
-def score_lecture_with_reasoning(lecture: Dict, labels: List[Dict]) -> List[Dict]:
+def score_lecture_auto(
+    ctx: ScoringContext,
+    explain: Optional[str] = None,
+    max_llm_cost_usd: Optional[float] = None
+) -> List[Dict]:
     """
-    Reasoning mode: Pure LLM-based scoring using GPT-4o-mini.
-    
-    Uses structured output to generate intelligent suggestions with Hebrew rationales.
-    Highest quality but slowest and most expensive.
+    Auto mode: fast result when prototype scores are decisive, ensemble otherwise.
     
-    Automatically fetches lecturer bio if lecturer_id or lecturer_name provided.
+    Flow:
+    1. Embed the lecture and score all of the request's labels against the prototypes
+    2. If every label is at least AUTO_MARGIN above or below its calibrated
+       threshold (and some label passes), return the fast result - no LLM call
+    3. Otherwise run the ensemble with only the confident + ambiguous labels
+       as reasoning candidates, unless the estimated call cost exceeds the cap
     
     Args:
-        lecture: Lecture dict
-        labels: List of label dicts
+        ctx: ScoringContext of the lecture and the request's labels
+        explain: Rationale level for the reasoning call
+        max_llm_cost_usd: Per-request cap on the reasoning call (default AUTO_MAX_LLM_COST_USD)
     
     Returns:
-        List of LLM-generated suggestions
+        List of suggestions
     """
-    scorer = ReasoningScorer(
-        model=config.llm_model,
-        min_confidence=config.min_confidence_threshold,
-        confidence_scale=config.reasoning_confidence_scale
-    )
-    
-    # Fetch lecturer bio if available
-    lecturer_profile = None
-    lecturer_id = lecture.get('lecturer_id')
-    lecturer_name = lecture.get('lecturer_name')
-    lecture_description = lecture.get('description', '')
+    if not prototypes_loaded:
+        raise RuntimeError("Prototypes not loaded. Please train first or reload prototypes.")
     
-    if lecturer_id or lecturer_name:
-        try:
-            search_service = LecturerSearchService(api_key=config.openai_api_key)
-            lecturer_profile = search_service.get_lecturer_profile(
-                lecturer_id=lecturer_id,
-                lecturer_name=lecturer_name,
-                lecture_description=lecture_description
-            )
-            if lecturer_profile:
-                logger.info(f"Enriching reasoning with lecturer bio: {lecturer_name or lecturer_id}")
-        except Exception as e:
-            logger.warning(f"Failed to fetch lecturer bio: {e}")
+    if ctx.embedding() is None:
+        return []
     
-    # Convert lecture to format expected by reasoning scorer
-    lecture_for_scorer = {
-        'id': lecture.get('id'),
-        'lecture_title': lecture.get('title', ''),
-        'lecture_description': lecture.get('description', ''),
-        'lecturer_name': lecturer_name or ''
+    catalog = ctx.catalog
+    raw_scores = {
+        tag_id: score
+        for tag_id, score in ctx.raw_scores().items()
+        if tag_id in catalog.active_labels_by_id
     }
+    thresholds = {tag_id: prototype_knn.threshold_for(tag_id) for tag_id in raw_scores}
+    
+    decision = assess_margins(raw_scores, thresholds, config.auto_margin)
+    
+    route = ROUTE_FAST
+    if decision['needs_llm']:
+        route = ROUTE_LLM if chat_breaker.available() else ROUTE_LLM_UNAVAILABLE
+    
+    candidate_tags = []
+    estimated_cost = 0.0
+    if route == ROUTE_LLM:
+        reasoning_scorer = _build_reasoning_scorer(explain)
+        candidate_tags = candidate_tags_for(decision, catalog.tags_for_scorer)
+        # The cap is decided before the bio lookup (itself an LLM search), so a capped lecture never pays for it;
+        # a bio another mode already fetched for this lecture is included in the estimate
+        known_profile = ctx.lecturer_profile("auto") if ctx.has('lecturer_profile') else None
+        estimated_cost = reasoning_scorer.estimate_call_cost(
+            ctx.lecture_for_scorer(),
+            candidate_tags or catalog.tags_for_scorer,
+            known_profile,
+            catalog
+        )
+        cost_cap = max_llm_cost_usd if max_llm_cost_usd is not None else config.auto_max_llm_cost_usd
+        if estimated_cost > cost_cap:
+            route = ROUTE_COST_CAPPED
     
-    # Convert labels to format expected by scorer
-    labels_for_scorer = []
-    for label in labels:
-        if not label.get('active', True):
-            continue
-        labels_for_scorer.append({
-            'tag_id': label['id'],
-            'name_he': label.get('name_he', ''),
-            'synonyms_he': label.get('synonyms_he', ''),
-            'category': label.get('category', 'Unknown')
-        })
+    auto_routing_stats.record(route, len(candidate_tags), estimated_cost)
+    logger.info(
+        "Auto mode routing",
+        lecture_id=ctx.lecture_id,
+        route=route,
+        num_confident=len(decision['confident']),
+        num_ambiguous=len(decision['ambiguous']),
+        min_margin=round(decision['min_margin'], 4) if decision['min_margin'] is not None else None,
+        estimated_llm_cost_usd=round(estimated_cost, 5)
+    )
     
-    # Call reasoning scorer with lecturer profile
-    llm_suggestions = scorer.score_lecture(
-        lecture=lecture_for_scorer,
-        all_tags=labels_for_scorer,
-        lecturer_profile=lecturer_profile
+    if route != ROUTE_LLM:
+        return _fast_suggestions(ctx.lecture, catalog, ctx.prototype_scores())
+    
+    lecturer_profile = ctx.lecturer_profile("auto")
+    check_deadline("reasoning")
+    
+    ensemble_scorer = EnsembleScorer(
+        reasoning_scorer=reasoning_scorer,
+        prototype_knn=prototype_knn,
+        tags_data=catalog.tags_data,
+        config=config
+    )
+    ensemble_suggestions = ensemble_scorer.score_lecture(
+        lecture=ctx.lecture_for_scorer(),
+        all_tags=catalog.tags_for_scorer,
+        lecture_embedding=ctx.embedding(),
+        tag_embeddings=tag_embeddings_cache,
+        lecturer_profile=lecturer_profile,
+        catalog=catalog,
+        candidate_tags=candidate_tags,
+        prototype_scores=ctx.prototype_scores()
     )
     
-    # Convert to v2 format
+    return _ensemble_to_v2(ensemble_suggestions, catalog)
+
+
+def _fetch_lecturer_profile(lecture: Dict, purpose: str) -> Optional[str]:
+    """Fetch lecturer bio if lecturer_id or lecturer_name is provided (None on failure)."""
+    lecturer_id = lecture.get('lecturer_id')
+    lecturer_name = lecture.get('lecturer_name')
+    
+    if not (lecturer_id or lecturer_name):
+        return None
+    
+    try:
+        search_service = LecturerSearchService(api_key=config.openai_api_key)
+        lecturer_profile = search_service.get_lecturer_profile(
+            lecturer_id=lecturer_id,
+            lecturer_name=lecturer_name,
+            lecture_description=lecture.get('description', '')
+        )
+        if lecturer_profile:
+            logger.info(f"Enriching {purpose} with lecturer bio: {lecturer_name or lecturer_id}")
+        return lecturer_profile
+    except Exception as e:
+        logger.warning(f"Failed to fetch lecturer bio: {e}")
+        return None
+
+
+def _reasoning_to_v2(llm_suggestions: List[Dict], catalog: LabelCatalog) -> List[Dict]:
+    """Convert reasoning scorer output to v2 suggestions."""
     v2_suggestions = []
     for llm_sugg in llm_suggestions:
         # Find the label to get category
-        label = next((l for l in labels if l['id'] == llm_sugg['tag_id']), None)
+        label = catalog.labels_by_id.get(llm_sugg['tag_id'])
         if not label:
             continue
         
@@ -537,7 +837,103 @@ def score_lecture_with_reasoning(lecture: Dict, labels: List[Dict]) -> List[Dict
     return v2_suggestions
 
 
-def score_lecture_with_ensemble(lecture: Dict, labels: List[Dict]) -> List[Dict]:
+def _ensemble_to_v2(ensemble_suggestions: List[Dict], catalog: LabelCatalog) -> List[Dict]:
+    """Convert ensemble scorer output to v2 suggestions."""
+    v2_suggestions = []
+    for sugg in ensemble_suggestions:
+        label = catalog.labels_by_id.get(sugg['tag_id'])
+        if not label:
+            continue
+        
+        reasons = ['ensemble']
+        if sugg.get('agreement_bonus_applied'):
+            reasons.append('model_agreement')
+        
+        v2_suggestions.append({
+            'label_id': sugg['tag_id'],
+            'category': label.get('category', 'Unknown'),
+            'confidence': sugg['score'],
+            'reasons': reasons,
+            'rationale_he': sugg.get('rationale', '')
+        })
+    
+    return v2_suggestions
+
+
+def _build_reasoning_scorer(explain: Optional[str] = None) -> ReasoningScorer:
+    return ReasoningScorer(
+        model=config.llm_model,
+        min_confidence=config.min_confidence_threshold,
+        confidence_scale=config.reasoning_confidence_scale,
+        pack_size=config.batch_size_llm,
+        constrained_output=config.constrained_tag_output,
+        compact_codes=config.compact_tag_codes,
+        explain=explain or config.default_explain,
+        explain_top_k=config.explain_top_k,
+        hedging=config.llm_hedging
+    )
+
+
+def normalize_explain(explain: Optional[str]) -> Optional[str]:
+    """Normalize a request's explain level ("top-k" -> "top_k"); raises ValueError if unknown."""
+    if explain is None:
+        return None
+    
+    level = str(explain).strip().lower().replace('-', '_')
+    if level not in EXPLAIN_LEVELS:
+        raise ValueError(f"Invalid explain level '{explain}'. Expected one of: none, top_k, full")
+    return level
+
+
+def _reasoning_suggestions(ctx: ScoringContext, scorer: ReasoningScorer, lecturer_profile: Optional[str]) -> List[Dict]:
+    """Full-label reasoning call for the lecture, shared by the reasoning and ensemble modes of a request."""
+    return ctx.memo(('reasoning', scorer.explain), lambda: scorer.score_lecture(
+        lecture=ctx.lecture_for_scorer(),
+        all_tags=ctx.catalog.tags_for_scorer,
+        lecturer_profile=lecturer_profile,
+        catalog=ctx.catalog
+    ))
+
+
+async def _areasoning_suggestions(ctx: ScoringContext, scorer: ReasoningScorer, lecturer_profile: Optional[str]) -> List[Dict]:
+    """Async variant of _reasoning_suggestions (AsyncOpenAI)."""
+    return await ctx.amemo(('reasoning', scorer.explain), lambda: scorer.ascore_lecture(
+        lecture=ctx.lecture_for_scorer(),
+        all_tags=ctx.catalog.tags_for_scorer,
+        lecturer_profile=lecturer_profile,
+        catalog=ctx.catalog
+    ))
+
+
+def score_lecture_with_reasoning(ctx: ScoringContext, explain: Optional[str] = None) -> List[Dict]:
+    """
+    Reasoning mode: Pure LLM-based scoring using GPT-4o-mini.
+    
+    Uses structured output to generate intelligent suggestions with Hebrew rationales.
+    Highest quality but slowest and most expensive.
+    
+    Automatically fetches lecturer bio if lecturer_id or lecturer_name provided.
+    
+    Args:
+        ctx: ScoringContext of the lecture and the request's labels
+        explain: Rationale level ("none", "top_k", "full"; default from config)
+    
+    Returns:
+        List of LLM-generated suggestions
+    """
+    scorer = _build_reasoning_scorer(explain)
+    
+    # Fetch lecturer bio if available
+    lecturer_profile = ctx.lecturer_profile("reasoning")
+    check_deadline("reasoning")
+    
+    # Call reasoning scorer with lecturer profile
+    llm_suggestions = _reasoning_suggestions(ctx, scorer, lecturer_profile)
+    
+    return _reasoning_to_v2(llm_suggestions, ctx.catalog)
+
+
+def score_lecture_with_ensemble(ctx: ScoringContext, explain: Optional[str] = None) -> List[Dict]:
     """
     Ensemble mode: Combines reasoning and prototype scores for best accuracy.
     
@@ -545,8 +941,8 @@ def score_lecture_with_ensemble(lecture: Dict, labels: List[Dict]) -> List[Dict]
     Default weights: 80% reasoning, 20% prototype, +15% agreement bonus.
     
     Args:
-        lecture: Lecture dict
-        labels: List of label dicts
+        ctx: ScoringContext of the lecture and the request's labels
+        explain: Rationale level for the reasoning call ("none", "top_k", "full")
     
     Returns:
         List of ensemble suggestions
@@ -554,110 +950,244 @@ def score_lecture_with_ensemble(lecture: Dict, labels: List[Dict]) -> List[Dict]
     if not prototypes_loaded:
         raise RuntimeError("Prototypes not loaded. Please train first or reload prototypes.")
     
-    # Generate embedding for prototype scoring
-    lecture_for_embedding = {
-        'id': lecture.get('id'),
-        'lecture_title': lecture.get('title', ''),
-        'lecture_description': lecture.get('description', '')
-    }
+    # Embedding + prototype scores (shared with any other mode run on this context)
+    lecture_embedding = ctx.embedding()
+    if lecture_embedding is None:
+        return []
     
-    embeddings_gen = EmbeddingsGenerator(
-        api_key=config.openai_api_key,
-        model=config.embedding_model
+    # Fetch lecturer bio if available
+    lecturer_profile = ctx.lecturer_profile("ensemble")
+    check_deadline("reasoning")
+    
+    reasoning_scorer = _build_reasoning_scorer(explain)
+    ensemble_scorer = EnsembleScorer(
+        reasoning_scorer=reasoning_scorer,
+        prototype_knn=prototype_knn,
+        tags_data=ctx.catalog.tags_data,
+        config=config
     )
-    lecture_embeddings = embeddings_gen.generate_lecture_embeddings([lecture_for_embedding])
-    lecture_embedding = lecture_embeddings[lecture.get('id')]
     
-    # Fetch lecturer bio if available
-    lecturer_profile = None
-    lecturer_id = lecture.get('lecturer_id')
-    lecturer_name = lecture.get('lecturer_name')
-    lecture_description = lecture.get('description', '')
+    # Score with ensemble
+    ensemble_suggestions = ensemble_scorer.score_lecture(
+        lecture=ctx.lecture_for_scorer(),
+        all_tags=ctx.catalog.tags_for_scorer,
+        lecture_embedding=lecture_embedding,
+        tag_embeddings=tag_embeddings_cache,
+        lecturer_profile=lecturer_profile,
+        catalog=ctx.catalog,
+        prototype_scores=ctx.prototype_scores(),
+        reasoning_suggestions=_reasoning_suggestions(ctx, reasoning_scorer, lecturer_profile)
+    )
     
-    if lecturer_id or lecturer_name:
-        try:
-            search_service = LecturerSearchService(api_key=config.openai_api_key)
-            lecturer_profile = search_service.get_lecturer_profile(
-                lecturer_id=lecturer_id,
-                lecturer_name=lecturer_name,
-                lecture_description=lecture_description
-            )
-            if lecturer_profile:
-                logger.info(f"Enriching ensemble with lecturer bio: {lecturer_name or lecturer_id}")
-        except Exception as e:
-            logger.warning(f"Failed to fetch lecturer bio: {e}")
+    return _ensemble_to_v2(ensemble_suggestions, ctx.catalog)
+        
+        
+async def ascore_lecture_with_reasoning(ctx: ScoringContext, explain: Optional[str] = None) -> List[Dict]:
+    """Async reasoning mode: bio lookup, then the GPT-4o call via AsyncOpenAI."""
+    scorer = _build_reasoning_scorer(explain)
     
-    # Prepare data for scorers
-    lecture_for_scorer = {
-        'id': lecture.get('id'),
-        'lecture_title': lecture.get('title', ''),
-        'lecture_description': lecture.get('description', ''),
-        'lecturer_name': lecturer_name or ''
-    }
+    lecturer_profile = await ctx.alecturer_profile("reasoning")
     
-    labels_for_scorer = []
-    tags_data = {}
-    for label in labels:
-        if not label.get('active', True):
-            continue
-        labels_for_scorer.append({
-            'tag_id': label['id'],
-            'name_he': label.get('name_he', ''),
-            'synonyms_he': label.get('synonyms_he', ''),
-            'category': label.get('category', 'Unknown')
-        })
-        tags_data[label['id']] = {
-            'tag_id': label['id'],
-            'name_he': label.get('name_he', ''),
-            'category': label.get('category', 'Unknown')
-        }
+    llm_suggestions = await _areasoning_suggestions(ctx, scorer, lecturer_profile)
     
-    # Initialize ensemble scorer
-    reasoning_scorer = ReasoningScorer(
-        model=config.llm_model,
-        min_confidence=config.min_confidence_threshold,
-        confidence_scale=config.reasoning_confidence_scale
+    return _reasoning_to_v2(llm_suggestions, ctx.catalog)
+
+
+async def ascore_lecture_with_ensemble(ctx: ScoringContext, explain: Optional[str] = None) -> List[Dict]:
+    """
+    Async ensemble mode.
+    
+    The lecture embedding and the lecturer bio lookup run concurrently; the
+    reasoning call goes through AsyncOpenAI.
+    """
+    if not prototypes_loaded:
+        raise RuntimeError("Prototypes not loaded. Please train first or reload prototypes.")
+    
+    lecture_embedding, lecturer_profile = await asyncio.gather(
+        ctx.aembedding(),
+        ctx.alecturer_profile("ensemble")
     )
+    if lecture_embedding is None:
+        return []
     
+    reasoning_scorer = _build_reasoning_scorer(explain)
     ensemble_scorer = EnsembleScorer(
         reasoning_scorer=reasoning_scorer,
         prototype_knn=prototype_knn,
-        tags_data=tags_data,
+        tags_data=ctx.catalog.tags_data,
         config=config
     )
     
-    # Score with ensemble
-    ensemble_suggestions = ensemble_scorer.score_lecture(
-        lecture=lecture_for_scorer,
-        all_tags=labels_for_scorer,
+    ensemble_suggestions = await ensemble_scorer.ascore_lecture(
+        lecture=ctx.lecture_for_scorer(),
+        all_tags=ctx.catalog.tags_for_scorer,
         lecture_embedding=lecture_embedding,
         tag_embeddings=tag_embeddings_cache,
-        lecturer_profile=lecturer_profile
+        lecturer_profile=lecturer_profile,
+        catalog=ctx.catalog,
+        prototype_scores=ctx.prototype_scores(),
+        reasoning_suggestions=await _areasoning_suggestions(ctx, reasoning_scorer, lecturer_profile)
     )
     
-    # Convert to v2 format
-    v2_suggestions = []
-    for sugg in ensemble_suggestions:
-        label = next((l for l in labels if l['id'] == sugg['tag_id']), None)
-        if not label:
-            continue
-        
-        reasons = ['ensemble']
-        if sugg.get('agreement_bonus_applied'):
-            reasons.append('model_agreement')
-        
-        v2_suggestions.append({
-            'label_id': sugg['tag_id'],
-            'category': label.get('category', 'Unknown'),
-            'confidence': sugg['score'],
-            'reasons': reasons,
-            'rationale_he': sugg.get('rationale', '')
-        })
+    return _ensemble_to_v2(ensemble_suggestions, ctx.catalog)
+
+
+# Upstreams each scoring mode calls, and the fallback modes in order of cost
+MODE_UPSTREAMS = {
+    "fast": ("embeddings",),
+    "auto": ("embeddings",),  # Skips the LLM by itself while chat is down
+    "full_quality": ("embeddings", "chat"),
+    "reasoning": ("chat",),
+    "ensemble": ("embeddings", "chat")
+}
+FALLBACK_MODES = ("fast", "reasoning")
+SCORING_MODES = tuple(MODE_UPSTREAMS)
+
+
+def _mode_available(mode: str) -> bool:
+    if mode in ("fast", "auto", "full_quality", "ensemble") and not prototypes_loaded:
+        return False
+    return all(circuit_breakers[upstream].available() for upstream in MODE_UPSTREAMS.get(mode, ("embeddings",)))
+
+
+def resolve_scoring_mode(mode: str) -> Tuple[str, Optional[str]]:
+    """
+    The scoring mode to run: the requested one, or the cheapest mode whose
+    upstreams are not behind an open circuit breaker.
+
+    Returns:
+        (mode, downgrade_reason) - reason is None when the requested mode runs
+    """
+    open_upstreams = [
+        upstream for upstream in MODE_UPSTREAMS.get(mode, ("embeddings",))
+        if not circuit_breakers[upstream].available()
+    ]
+    if not open_upstreams:
+        return mode, None
+    
+    for fallback in FALLBACK_MODES:
+        if fallback != mode and _mode_available(fallback):
+            reason = f"circuit_open:{','.join(open_upstreams)}"
+            logger.warning(
+                "Downgrading scoring mode",
+                requested_mode=mode,
+                scoring_mode_used=fallback,
+                reason=reason
+            )
+            return fallback, reason
     
-    return v2_suggestions
+    # Nothing cheaper works either - run the requested mode and let it fail fast
+    return mode, None
 
 
-def score_lecture_v2(lecture: Dict, labels: List[Dict], scoring_mode: str = None) -> List[Dict]:
+def _get_deadline_executor() -> ThreadPoolExecutor:
+    """Get the process-wide pool for deadline-bound LLM stages, creating it on first use."""
+    global deadline_executor
+    
+    with _deadline_executor_lock:
+        if deadline_executor is None:
+            deadline_executor = ThreadPoolExecutor(
+                max_workers=config.deadline_workers,
+                thread_name_prefix="deadline-stage"
+            )
+        return deadline_executor
+
+
+def _llm_stage_budget(deadline: Optional[Deadline]) -> Optional[float]:
+    """
+    Seconds an LLM mode may take so the fast fallback still fits in the deadline.
+
+    None when the stage is unbounded: no deadline, or no fast mode to fall back to.
+    """
+    if deadline is None or not prototypes_loaded or not embeddings_breaker.available():
+        return None
+    return deadline.remaining() - config.deadline_fast_reserve_ms / 1000.0
+
+
+def _degrade_to_fast(ctx: ScoringContext, deadline: Deadline, mode: str, reason: str) -> List[Dict]:
+    """Prototype-only result for a request whose LLM stage did not fit its deadline."""
+    deadline.mark_degraded(reason, stage=mode)
+    logger.warning(
+        "Deadline: returning prototype-only result",
+        lecture_id=ctx.lecture_id,
+        scoring_mode=mode,
+        reason=reason,
+        deadline_ms=deadline.budget_ms,
+        remaining_ms=round(deadline.remaining_ms(), 1)
+    )
+    # Reuses the embedding if the LLM mode got that far
+    return score_lecture_fast(ctx)
+
+
+def _score_within_deadline(mode: str, score_fn, ctx: ScoringContext, *args) -> List[Dict]:
+    """
+    Run an LLM scoring mode bounded by the current request's deadline.
+
+    The mode runs in a worker thread; if it has not finished when its budget
+    runs out, the request stops waiting and returns the fast result. A stage
+    still queued for a worker is cancelled; one already running stops at its
+    next deadline check or LLM call timeout.
+    """
+    deadline = current_deadline()
+    budget = _llm_stage_budget(deadline)
+    if budget is None:
+        # Nothing to fall back to: run unbounded
+        with request_deadline(None):
+            return score_fn(ctx, *args)
+    if budget <= 0:
+        return _degrade_to_fast(ctx, deadline, mode, "budget_exhausted")
+    
+    future = _get_deadline_executor().submit(contextvars.copy_context().run, _run_deadline_stage, mode, score_fn, ctx, *args)
+    try:
+        return future.result(timeout=budget)
+    except FutureTimeoutError:
+        if future.cancel():
+            logger.warning(
+                "Deadline: LLM stage never started - all DEADLINE_WORKERS busy",
+                lecture_id=ctx.lecture_id,
+                scoring_mode=mode,
+                deadline_workers=config.deadline_workers
+            )
+        return _degrade_to_fast(ctx, deadline, mode, "deadline_exceeded")
+    except DeadlineExceeded:
+        # The stage started as its budget ran out (see _run_deadline_stage)
+        return _degrade_to_fast(ctx, deadline, mode, "budget_exhausted")
+
+
+def _run_deadline_stage(mode: str, score_fn, ctx: ScoringContext, *args) -> List[Dict]:
+    """A deadline-bound stage as run by the worker: skipped if its budget ran out while it was queued."""
+    check_deadline(mode)
+    budget = _llm_stage_budget(current_deadline())
+    if budget is not None and budget <= 0:
+        raise DeadlineExceeded(f"No budget left for stage '{mode}' once the fast fallback is reserved")
+    return score_fn(ctx, *args)
+
+
+async def _ascore_within_deadline(mode: str, score_coro_fn, ctx: ScoringContext, *args) -> List[Dict]:
+    """Async variant of _score_within_deadline: the LLM mode is cancelled when its budget runs out."""
+    deadline = current_deadline()
+    budget = _llm_stage_budget(deadline)
+    if budget is None:
+        with request_deadline(None):
+            return await score_coro_fn(ctx, *args)
+    if budget <= 0:
+        return await asyncio.to_thread(_degrade_to_fast, ctx, deadline, mode, "budget_exhausted")
+    
+    try:
+        return await asyncio.wait_for(score_coro_fn(ctx, *args), timeout=budget)
+    except asyncio.TimeoutError:
+        return await asyncio.to_thread(_degrade_to_fast, ctx, deadline, mode, "deadline_exceeded")
+
+
+def score_lecture_v2(
+    lecture: Dict,
+    labels: Union[List[Dict], LabelCatalog],
+    scoring_mode: str = None,
+    explain: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    max_llm_cost_usd: Optional[float] = None,
+    ctx: Optional[ScoringContext] = None
+) -> List[Dict]:
     """
     Router function for scoring modes.
     
@@ -666,11 +1196,17 @@ def score_lecture_v2(lecture: Dict, labels: List[Dict], scoring_mode: str = None
     - "fast": Prototype similarity only (fastest, cheapest)
     - "full_quality": Prototype + LLM arbiter (balanced)
     - "reasoning": Pure LLM reasoning (high quality, most expensive)
+    - "auto": Fast when prototype scores are decisive, ensemble for ambiguous lectures
     
     Args:
         lecture: Lecture dict
-        labels: List of label dicts
+        labels: List of label dicts or an already resolved LabelCatalog
         scoring_mode: Override config scoring mode
+        explain: Rationale level for LLM modes ("none", "top_k", "full")
+        deadline: Optional request deadline; LLM modes that cannot finish
+            in time return the fast result and mark the deadline degraded
+        max_llm_cost_usd: Auto mode's cap on the reasoning call cost
+        ctx: Scoring context to use (and keep, e.g. for shadow runs); a new one by default
     
     Returns:
         List of suggestions
@@ -685,14 +1221,302 @@ def score_lecture_v2(lecture: Dict, labels: List[Dict], scoring_mode: str = None
         has_lecturer_info=bool(lecture.get('lecturer_id') or lecture.get('lecturer_name'))
     )
     
+    if ctx is None:
+        ctx = _scoring_context(lecture, as_label_catalog(labels))
+    
+    with request_deadline(deadline):
+        return _score_mode(ctx, mode, explain, max_llm_cost_usd)
+
+
+def _score_mode(ctx: ScoringContext, mode: str, explain: Optional[str], max_llm_cost_usd: Optional[float]) -> List[Dict]:
+    """Run one scoring mode on a context, under the current request deadline."""
     if mode == "ensemble":
-        return score_lecture_with_ensemble(lecture, labels)
+        return _score_within_deadline(mode, score_lecture_with_ensemble, ctx, explain)
     elif mode == "reasoning":
-        return score_lecture_with_reasoning(lecture, labels)
+        return _score_within_deadline(mode, score_lecture_with_reasoning, ctx, explain)
     elif mode == "full_quality":
-        return score_lecture_with_arbiter(lecture, labels)
+        return _score_within_deadline(mode, score_lecture_with_arbiter, ctx)
+    elif mode == "auto":
+        return _score_within_deadline(mode, score_lecture_auto, ctx, explain, max_llm_cost_usd)
     else:  # "fast" or default
-        return score_lecture_fast(lecture, labels)
+        return score_lecture_fast(ctx)
+
+
+async def ascore_lecture_v2(
+    lecture: Dict,
+    labels: Union[List[Dict], LabelCatalog],
+    scoring_mode: str = None,
+    explain: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    max_llm_cost_usd: Optional[float] = None,
+    ctx: Optional[ScoringContext] = None
+) -> List[Dict]:
+    """
+    Async router for scoring modes.
+    
+    The I/O-bound modes ("ensemble", "reasoning") run natively on asyncio;
+    "fast" and "full_quality" run the sync implementation in a worker thread.
+    """
+    mode = scoring_mode or config.scoring_mode
+    
+    logger.info(
+        f"Scoring lecture with mode: {mode} (async pipeline)",
+        lecture_id=lecture.get('id'),
+        scoring_mode=mode,
+        num_labels=len(labels),
+        has_lecturer_info=bool(lecture.get('lecturer_id') or lecture.get('lecturer_name'))
+    )
+    
+    if ctx is None:
+        ctx = _scoring_context(lecture, as_label_catalog(labels))
+    
+    with request_deadline(deadline):
+        return await _ascore_mode(ctx, mode, explain, max_llm_cost_usd)
+
+
+async def _ascore_mode(ctx: ScoringContext, mode: str, explain: Optional[str], max_llm_cost_usd: Optional[float]) -> List[Dict]:
+    """Async variant of _score_mode."""
+    if mode == "ensemble":
+        return await _ascore_within_deadline(mode, ascore_lecture_with_ensemble, ctx, explain)
+    elif mode == "reasoning":
+        return await _ascore_within_deadline(mode, ascore_lecture_with_reasoning, ctx, explain)
+    elif mode == "full_quality":
+        return await _ascore_within_deadline(
+            mode,
+            lambda c: asyncio.to_thread(score_lecture_with_arbiter, c),
+            ctx
+        )
+    elif mode == "auto":
+        return await _ascore_within_deadline(
+            mode,
+            lambda c: asyncio.to_thread(score_lecture_auto, c, explain, max_llm_cost_usd),
+            ctx
+        )
+    else:  # "fast" or default
+        return await asyncio.to_thread(score_lecture_fast, ctx)
+
+
+def normalize_scoring_modes(modes: List) -> List[str]:
+    """Validate a list of scoring modes (order kept, duplicates dropped); raises ValueError."""
+    if not modes:
+        raise ValueError("scoring_mode list is empty")
+    
+    normalized = []
+    for mode in modes:
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Invalid scoring mode '{mode}'. Expected one of: {', '.join(SCORING_MODES)}")
+        if mode not in normalized:
+            normalized.append(mode)
+    return normalized
+
+
+def _requested_deadline_ms(data: Dict):
+    """
+    Raw deadline for a request: X-Request-Deadline-Ms header, else body deadline_ms, else REQUEST_DEADLINE_MS.
+    
+    An explicit 0 (or negative) value is kept, so parse_deadline_ms can disable the deadline for that request.
+    """
+    header_value = request.headers.get('X-Request-Deadline-Ms')
+    if header_value is not None:
+        return header_value
+    if data.get('deadline_ms') is not None:
+        return data['deadline_ms']
+    return config.request_deadline_ms
+
+
+def _mode_deadline(deadline: Optional[Deadline]) -> Optional[Deadline]:
+    """Own deadline (same expiry) for one mode of a multi-mode request, so each degrades independently."""
+    return Deadline(deadline.remaining_ms()) if deadline is not None else None
+
+
+def _mode_result(
+    suggestions: List[Dict],
+    started_at: float,
+    mode_used: str,
+    downgrade_reason: Optional[str],
+    deadline: Optional[Deadline]
+) -> Dict:
+    result = {
+        'suggestions': suggestions,
+        'duration_ms': round((time.time() - started_at) * 1000, 1),
+        'degraded': bool(downgrade_reason or (deadline and deadline.degraded))
+    }
+    if downgrade_reason:
+        result['degraded_reason'] = downgrade_reason
+        result['scoring_mode_used'] = mode_used
+    elif deadline and deadline.degraded:
+        result['degraded_reason'] = deadline.degraded_reason
+    return result
+
+
+def _mode_error(mode: str, lecture: Dict, started_at: float, error: Exception) -> Dict:
+    logger.error(
+        "Scoring mode failed in multi-mode request",
+        lecture_id=lecture.get('id'),
+        scoring_mode=mode,
+        error_type=type(error).__name__,
+        error_message=str(error)
+    )
+    return {
+        'suggestions': [],
+        'duration_ms': round((time.time() - started_at) * 1000, 1),
+        'error': f"{type(error).__name__}: {error}"
+    }
+
+
+def _mark_request_degraded(deadline: Optional[Deadline], results: Dict[str, Dict]) -> None:
+    """Carry the first degraded mode's deadline reason to the request deadline (for deadline stats)."""
+    if deadline is None:
+        return
+    for mode, result in results.items():
+        if result.get('degraded') and 'scoring_mode_used' not in result:
+            deadline.mark_degraded(result['degraded_reason'], stage=mode)
+            return
+
+
+def score_lecture_modes(
+    lecture: Dict,
+    labels: Union[List[Dict], LabelCatalog],
+    modes: List[str],
+    explain: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    max_llm_cost_usd: Optional[float] = None
+) -> Dict[str, Dict]:
+    """
+    Score one lecture with several modes for comparison.
+    
+    The modes run concurrently on one ScoringContext, so they share the
+    embedding, the prototype scores, the bio lookup and the full-label
+    reasoning call (reasoning + ensemble); a comparison costs about as much
+    as its most expensive mode. Fast mode's micro-batched embedding goes
+    through the same embedding memo, so it never embeds the lecture again. Each mode is downgraded by circuit breakers
+    and degraded by the deadline on its own.
+    
+    Returns:
+        mode -> {suggestions, duration_ms, degraded[, degraded_reason,
+        scoring_mode_used]}, or {suggestions: [], duration_ms, error} if
+        the mode failed. duration_ms is the mode's wall time, including
+        waits on work shared with the other modes.
+    """
+    ctx = _scoring_context(lecture, as_label_catalog(labels))
+    
+    logger.info(
+        "Scoring lecture with multiple modes",
+        lecture_id=lecture.get('id'),
+        scoring_modes=modes,
+        num_labels=len(ctx.catalog)
+    )
+    
+    def run(mode: str) -> Dict:
+        started_at = time.time()
+        try:
+            mode_used, downgrade_reason = resolve_scoring_mode(mode)
+            mode_deadline = _mode_deadline(deadline)
+            with request_deadline(mode_deadline):
+                suggestions = _score_mode(ctx, mode_used, explain, max_llm_cost_usd)
+            return _mode_result(suggestions, started_at, mode_used, downgrade_reason, mode_deadline)
+        except Exception as e:
+            return _mode_error(mode, lecture, started_at, e)
+    
+    # One short-lived thread per mode (at most len(SCORING_MODES)); LLM stages
+    # still go through the shared deadline executor
+    with ThreadPoolExecutor(max_workers=len(modes), thread_name_prefix="multi-mode") as pool:
+        futures = {mode: pool.submit(contextvars.copy_context().run, run, mode) for mode in modes}
+        results = {mode: future.result() for mode, future in futures.items()}
+    
+    _mark_request_degraded(deadline, results)
+    return results
+
+
+async def ascore_lecture_modes(
+    lecture: Dict,
+    labels: Union[List[Dict], LabelCatalog],
+    modes: List[str],
+    explain: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    max_llm_cost_usd: Optional[float] = None
+) -> Dict[str, Dict]:
+    """Async variant of score_lecture_modes (modes run as concurrent tasks)."""
+    ctx = _scoring_context(lecture, as_label_catalog(labels))
+    
+    logger.info(
+        "Scoring lecture with multiple modes (async pipeline)",
+        lecture_id=lecture.get('id'),
+        scoring_modes=modes,
+        num_labels=len(ctx.catalog)
+    )
+    
+    async def run(mode: str) -> Dict:
+        started_at = time.time()
+        try:
+            mode_used, downgrade_reason = resolve_scoring_mode(mode)
+            mode_deadline = _mode_deadline(deadline)
+            with request_deadline(mode_deadline):
+                suggestions = await _ascore_mode(ctx, mode_used, explain, max_llm_cost_usd)
+            return _mode_result(suggestions, started_at, mode_used, downgrade_reason, mode_deadline)
+        except Exception as e:
+            return _mode_error(mode, lecture, started_at, e)
+    
+    mode_results = await asyncio.gather(*(run(mode) for mode in modes))
+    results = dict(zip(modes, mode_results))
+    
+    _mark_request_degraded(deadline, results)
+    return results
+
+
+def _score_shadow_mode(ctx: ScoringContext, mode: str, explain: Optional[str]) -> List[Dict]:
+    """Run a shadow mode: off the request path, so no deadline and the default auto cost cap."""
+    with request_deadline(None):
+        return _score_mode(ctx, mode, explain, None)
+
+
+def _get_shadow_scorer() -> Optional[ShadowScorer]:
+    """Get the process-wide shadow scorer, creating it on first use (None when shadow scoring is off)."""
+    global shadow_scorer
+    
+    if not config.shadow_modes or config.shadow_sample_rate <= 0:
+        return None
+    
+    with _shadow_scorer_lock:
+        if shadow_scorer is None:
+            unknown_modes = [mode for mode in config.shadow_modes if mode not in SCORING_MODES]
+            if unknown_modes:
+                logger.warning("Ignoring unknown shadow modes", shadow_modes=unknown_modes)
+            shadow_scorer = ShadowScorer(
+                score_mode=_score_shadow_mode,
+                modes=[mode for mode in config.shadow_modes if mode in SCORING_MODES],
+                sample_rate=config.shadow_sample_rate,
+                workers=config.shadow_workers,
+                max_queue_size=config.shadow_queue_size
+            )
+        return shadow_scorer
+
+
+def _resolve_label_catalog(artifact_version: str, labels: List[Dict]) -> Optional[LabelCatalog]:
+    """
+    Catalog for a request: the inline labels list if given, otherwise the
+    label set registered under artifact_version (None if neither exists).
+    """
+    if labels:
+        return get_label_catalog(labels)
+    
+    if not artifact_version or artifact_version == 'unknown':
+        return None
+    
+    hit, catalog = registered_catalog_cache.get(artifact_version)
+    if hit:
+        return catalog
+    
+    try:
+        registered_labels = PrototypeStorage().load_label_set(artifact_version)
+    except Exception as e:
+        logger.error(f"Error loading label set '{artifact_version}': {e}")
+        return None
+    
+    catalog = get_label_catalog(registered_labels) if registered_labels else None
+    if catalog is not None:
+        registered_catalog_cache.set(artifact_version, catalog)
+    return catalog
 
 
 @app.route('/suggest-tags', methods=['POST'])
@@ -705,7 +1529,8 @@ def suggest_tags():
         "request_id": "uuid",
         "model_version": "v1",
         "artifact_version": "labels-emb-2025-10-29",
-        "scoring_mode": "ensemble" (optional: "ensemble", "fast", "full_quality", "reasoning"),
+        "scoring_mode": "ensemble" (optional: "ensemble", "fast", "full_quality", "reasoning", "auto",
+                        or a list of them to compare modes in one request),
         "lecture": {
             "id": "rec123",
             "title": "...",
@@ -723,7 +1548,10 @@ def suggest_tags():
                 "category": "Topic",
                 "active": true
             }
-        ]
+        ] (optional if a label set is registered under artifact_version, see POST /label-sets),
+        "explain": "none" | "top_k" | "full" (optional - rationales for all, only the top, or no suggestions),
+        "deadline_ms": 3000 (optional, also X-Request-Deadline-Ms header; default REQUEST_DEADLINE_MS),
+        "max_llm_cost_usd": 0.02 (optional - "auto" mode's cap on the reasoning call)
     }
     
     Returns:
@@ -738,176 +1566,664 @@ def suggest_tags():
                 "confidence": 0.91,
                 "reasons": ["desc_match", "related_cooccur"]
             }
-        ]
-    }
-    """
-    data = None
-    lecture = None
-    try:
-        data = request.get_json()
+        ],
+        "degraded": false,
+        "degraded_reason": "deadline_exceeded" | "circuit_open:chat" (only when degraded),
+        "scoring_mode_used": "fast" (only when the mode was downgraded by a circuit breaker),
+        "results": {
+            "fast": {"suggestions": [...], "duration_ms": 180.2, "degraded": false},
+            "ensemble": {"suggestions": [...], "duration_ms": 2450.7, "degraded": false}
+        } (only when scoring_mode is a list; "suggestions" then holds the first mode's)
+    }
+    """
+    request_received_time = time.time()
+    data = None
+    try:
+        data = request.get_json()
+        parsed = _parse_suggest_tags_request(data, request_received_time)
+        if not isinstance(parsed, dict):
+            return parsed
+        
+        request_start_time = time.time()
+        
+        if parsed['scoring_modes']:
+            # Mode comparison: per-mode results, shared embedding/bio/reasoning work
+            with track_operation("score_lecture_modes", logger, request_id=parsed['request_id'], num_modes=len(parsed['scoring_modes'])):
+                mode_results = score_lecture_modes(
+                    parsed['lecture'], parsed['catalog'], parsed['scoring_modes'], explain=parsed['explain'],
+                    deadline=parsed['deadline'], max_llm_cost_usd=parsed['max_llm_cost_usd']
+                )
+            return _suggest_tags_response(parsed, request_start_time, mode_results=mode_results)
+        
+        # Score lecture with optional mode override (downgraded while an upstream is down)
+        mode_used, downgrade_reason = resolve_scoring_mode(parsed['scoring_mode'] or config.scoring_mode)
+        ctx = _scoring_context(parsed['lecture'], parsed['catalog'])  # Kept for shadow runs
+        
+        with track_operation("score_lecture", logger, request_id=parsed['request_id']):
+            suggestions = score_lecture_v2(
+                parsed['lecture'], parsed['catalog'], scoring_mode=mode_used, explain=parsed['explain'],
+                deadline=parsed['deadline'], max_llm_cost_usd=parsed['max_llm_cost_usd'], ctx=ctx
+            )
+        
+        return _suggest_tags_response(
+            parsed, request_start_time, suggestions=suggestions,
+            mode_used=mode_used, downgrade_reason=downgrade_reason, ctx=ctx
+        )
+    
+    except Exception as e:
+        return _suggest_tags_error(data, e)
+
+
+async def asuggest_tags():
+    """
+    /suggest-tags on the async pipeline (served by asgi.py, not registered on the Flask app).
+    
+    Same request and response as suggest_tags, but scoring awaits
+    ascore_lecture_v2 / ascore_lecture_modes on the server's event loop, so
+    an in-flight LLM call holds no worker thread. Validation (label-set DB
+    lookup) and the response step (Discord webhook) block, so they run in a
+    worker thread. Runs inside a Flask request context pushed by the ASGI
+    front end.
+    """
+    request_received_time = time.time()
+    data = None
+    try:
+        data = request.get_json()
+        parsed = await asyncio.to_thread(_parse_suggest_tags_request, data, request_received_time)
+        if not isinstance(parsed, dict):
+            return parsed
+        
+        request_start_time = time.time()
+        
+        if parsed['scoring_modes']:
+            with track_operation("score_lecture_modes", logger, request_id=parsed['request_id'], num_modes=len(parsed['scoring_modes'])):
+                mode_results = await ascore_lecture_modes(
+                    parsed['lecture'], parsed['catalog'], parsed['scoring_modes'], explain=parsed['explain'],
+                    deadline=parsed['deadline'], max_llm_cost_usd=parsed['max_llm_cost_usd']
+                )
+            return await asyncio.to_thread(_suggest_tags_response, parsed, request_start_time, mode_results=mode_results)
+        
+        mode_used, downgrade_reason = resolve_scoring_mode(parsed['scoring_mode'] or config.scoring_mode)
+        ctx = _scoring_context(parsed['lecture'], parsed['catalog'])
+        
+        with track_operation("score_lecture", logger, request_id=parsed['request_id']):
+            suggestions = await ascore_lecture_v2(
+                parsed['lecture'], parsed['catalog'], scoring_mode=mode_used, explain=parsed['explain'],
+                deadline=parsed['deadline'], max_llm_cost_usd=parsed['max_llm_cost_usd'], ctx=ctx
+            )
+        
+        return await asyncio.to_thread(
+            _suggest_tags_response, parsed, request_start_time, suggestions=suggestions,
+            mode_used=mode_used, downgrade_reason=downgrade_reason, ctx=ctx
+        )
+    
+    except Exception as e:
+        return await asyncio.to_thread(_suggest_tags_error, data, e)
+
+
+def _parse_suggest_tags_request(data: Optional[Dict], request_received_time: float) -> Union[Dict, Tuple[Response, int]]:
+    """
+    Validate a /suggest-tags body and resolve its label catalog.
+    
+    Returns:
+        {request_id, model_version, artifact_version, scoring_mode,
+        scoring_modes, explain, max_llm_cost_usd, lecture, catalog, deadline},
+        or a (response, status) to return as-is when the request is invalid
+    """
+    if not data:
+        logger.warning("No JSON data provided in suggest-tags request")
+        discord_notifier.send_request_summary(
+            request_id='unknown',
+            endpoint="/suggest-tags",
+            status="error",
+            duration_ms=0,
+            details={
+                'error_message': 'No JSON data provided',
+                'error_type': 'ValidationError',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }
+        )
+        return jsonify({'error': 'No JSON data provided'}), 400
+        
+    request_id = data.get('request_id', 'unknown')
+    model_version = data.get('model_version', 'v1')
+    artifact_version = data.get('artifact_version', 'unknown')
+    scoring_mode = data.get('scoring_mode')  # Optional override
+    explain = data.get('explain')  # Optional rationale level
+    max_llm_cost_usd = data.get('max_llm_cost_usd')  # Optional auto mode cost cap
+    lecture = data.get('lecture')
+    labels = data.get('labels', [])
+        
+    # Log request metadata (NOT the full payload - security)
+    logger.info(
+        "Tag suggestion request received",
+        request_id=request_id,
+        model_version=model_version,
+        artifact_version=artifact_version,
+        scoring_mode=scoring_mode or config.scoring_mode,
+        num_labels=len(labels),
+        lecture_id=lecture.get('id') if lecture else None,
+        has_description=bool(lecture.get('description')) if lecture else False
+    )
+        
+    if not lecture:
+        logger.warning("No lecture provided", request_id=request_id)
+        discord_notifier.send_request_summary(
+            request_id=request_id,
+            endpoint="/suggest-tags",
+            status="error",
+            duration_ms=0,
+            details={
+                'error_message': 'No lecture provided',
+                'error_type': 'ValidationError',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }
+        )
+        return jsonify({'error': 'No lecture provided'}), 400
         
-        if not data:
-            logger.warning("No JSON data provided in suggest-tags request")
-            discord_notifier.send_request_summary(
-                request_id='unknown',
-                endpoint="/suggest-tags",
-                status="error",
-                duration_ms=0,
-                details={
-                    'error_message': 'No JSON data provided',
-                    'error_type': 'ValidationError',
-                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-                }
-            )
-            return jsonify({'error': 'No JSON data provided'}), 400
+    try:
+        explain = normalize_explain(explain)
+    except ValueError as e:
+        logger.warning("Invalid explain level", request_id=request_id, explain=explain)
+        return jsonify({'error': str(e)}), 400
         
-        request_id = data.get('request_id', 'unknown')
-        model_version = data.get('model_version', 'v1')
-        artifact_version = data.get('artifact_version', 'unknown')
-        scoring_mode = data.get('scoring_mode')  # Optional override
-        lecture = data.get('lecture')
-        labels = data.get('labels', [])
+    scoring_modes = None
+    if isinstance(scoring_mode, list):
+        try:
+            scoring_modes = normalize_scoring_modes(scoring_mode)
+        except ValueError as e:
+            logger.warning("Invalid scoring modes", request_id=request_id)
+            return jsonify({'error': str(e)}), 400
+        scoring_mode = ",".join(scoring_modes)  # For logs and notifications
         
-        # Log request metadata (NOT the full payload - security)
-        logger.info(
-            "Tag suggestion request received",
-            request_id=request_id,
-            model_version=model_version,
-            artifact_version=artifact_version,
-            scoring_mode=scoring_mode or config.scoring_mode,
-            num_labels=len(labels),
-            lecture_id=lecture.get('id') if lecture else None,
-            has_description=bool(lecture.get('description')) if lecture else False
+    try:
+        deadline_ms = parse_deadline_ms(
+            _requested_deadline_ms(data)
         )
+    except ValueError as e:
+        logger.warning("Invalid deadline", request_id=request_id)
+        return jsonify({'error': str(e)}), 400
         
-        if not lecture:
-            logger.warning("No lecture provided", request_id=request_id)
-            discord_notifier.send_request_summary(
-                request_id=request_id,
-                endpoint="/suggest-tags",
-                status="error",
-                duration_ms=0,
-                details={
-                    'error_message': 'No lecture provided',
-                    'error_type': 'ValidationError',
-                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-                }
-            )
-            return jsonify({'error': 'No lecture provided'}), 400
+    if max_llm_cost_usd is not None:
+        try:
+            max_llm_cost_usd = float(max_llm_cost_usd)
+        except (TypeError, ValueError):
+            logger.warning("Invalid max_llm_cost_usd", request_id=request_id)
+            return jsonify({'error': f"Invalid max_llm_cost_usd '{max_llm_cost_usd}'"}), 400
         
-        if not labels:
-            logger.warning("No labels provided", request_id=request_id)
-            discord_notifier.send_request_summary(
-                request_id=request_id,
-                endpoint="/suggest-tags",
-                status="error",
-                duration_ms=0,
-                details={
-                    'error_message': 'No labels provided',
-                    'error_type': 'ValidationError',
-                    'num_labels': 0,
-                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-                }
-            )
-            return jsonify({'error': 'No labels provided'}), 400
+    deadline = None
+    if deadline_ms:
+        # The budget counts from when the request arrived
+        deadline = Deadline(deadline_ms - (time.time() - request_received_time) * 1000)
         
-        # Score lecture with optional mode override
-        request_start_time = time.time()
+    catalog = _resolve_label_catalog(artifact_version, labels)
+        
+    if catalog is None:
+        logger.warning("No labels provided", request_id=request_id, artifact_version=artifact_version)
+        discord_notifier.send_request_summary(
+            request_id=request_id,
+            endpoint="/suggest-tags",
+            status="error",
+            duration_ms=0,
+            details={
+                'error_message': 'No labels provided',
+                'error_type': 'ValidationError',
+                'num_labels': 0,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }
+        )
+        return jsonify({'error': f"No labels provided and no label set registered for artifact_version '{artifact_version}'"}), 400
         
-        with track_operation("score_lecture", logger, request_id=request_id):
-            suggestions = score_lecture_v2(lecture, labels, scoring_mode=scoring_mode)
+    return {
+        'request_id': request_id,
+        'model_version': model_version,
+        'artifact_version': artifact_version,
+        'scoring_mode': scoring_mode,
+        'scoring_modes': scoring_modes,
+        'explain': explain,
+        'max_llm_cost_usd': max_llm_cost_usd,
+        'lecture': lecture,
+        'catalog': catalog,
+        'deadline': deadline
+    }
         
-        request_duration = (time.time() - request_start_time) * 1000  # Convert to ms
         
-        # Log scoring metrics
-        confidence_stats = {}
-        category_counts = {}
+def _suggest_tags_response(
+    parsed: Dict,
+    request_start_time: float,
+    suggestions: Optional[List[Dict]] = None,
+    mode_results: Optional[Dict[str, Dict]] = None,
+    mode_used: Optional[str] = None,
+    downgrade_reason: Optional[str] = None,
+    ctx: Optional[ScoringContext] = None
+) -> Tuple[Response, int]:
+    """Log metrics, notify and build the /suggest-tags response (shadow runs are attached to its close)."""
+    request_id = parsed['request_id']
+    scoring_mode = parsed['scoring_mode']
+    explain = parsed['explain']
+    catalog = parsed['catalog']
+    deadline = parsed['deadline']
+    if mode_results is not None:
+        suggestions = mode_results[parsed['scoring_modes'][0]]['suggestions']
+        
+    if deadline is not None:
+        deadline_stats.record(deadline)
+        
+    request_duration = (time.time() - request_start_time) * 1000  # Convert to ms
+        
+    # Log scoring metrics
+    confidence_stats = {}
+    category_counts = {}
         
-        if suggestions:
-            confidences = [s['confidence'] for s in suggestions]
-            confidence_stats = {
-                'avg': round(sum(confidences) / len(confidences), 3),
-                'max': round(max(confidences), 3),
-                'min': round(min(confidences), 3)
-            }
+    if suggestions:
+        confidences = [s['confidence'] for s in suggestions]
+        confidence_stats = {
+            'avg': round(sum(confidences) / len(confidences), 3),
+            'max': round(max(confidences), 3),
+            'min': round(min(confidences), 3)
+        }
             
-            # Log category breakdown
-            for s in suggestions:
-                cat = s.get('category', 'Unknown')
-                category_counts[cat] = category_counts.get(cat, 0) + 1
+        # Log category breakdown
+        for s in suggestions:
+            cat = s.get('category', 'Unknown')
+            category_counts[cat] = category_counts.get(cat, 0) + 1
             
-            log_scoring_metrics(
-                num_labels=len(labels),
-                num_suggestions=len(suggestions),
-                scoring_mode=scoring_mode or config.scoring_mode,
-                confidence_stats=confidence_stats
-            )
+        log_scoring_metrics(
+            num_labels=len(catalog),
+            num_suggestions=len(suggestions),
+            scoring_mode=scoring_mode or config.scoring_mode,
+            confidence_stats=confidence_stats
+        )
             
-            logger.info(
-                "Scoring metrics",
-                request_id=request_id,
-                category_breakdown=category_counts,
-                confidence_stats=confidence_stats
-            )
-        
-        response = {
-            'request_id': request_id,
-            'model_version': model_version,
-            'artifact_version': artifact_version,
-            'suggestions': suggestions
-        }
-        
         logger.info(
-            "Tag suggestion request completed successfully",
+            "Scoring metrics",
             request_id=request_id,
-            num_suggestions=len(suggestions)
+            category_breakdown=category_counts,
+            confidence_stats=confidence_stats
         )
         
-        # Send Discord notification with request summary
-        discord_notifier.send_request_summary(
-            request_id=request_id,
-            endpoint="/suggest-tags",
-            status="success",
-            duration_ms=request_duration,
-            details={
-                'scoring_mode': scoring_mode or config.scoring_mode,
-                'num_suggestions': len(suggestions),
-                'num_labels': len(labels),
-                'confidence_stats': confidence_stats,
-                'category_breakdown': category_counts,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }
-        )
+    response = {
+        'request_id': request_id,
+        'model_version': parsed['model_version'],
+        'artifact_version': parsed['artifact_version'],
+        'suggestions': suggestions,
+        'degraded': bool(downgrade_reason or (deadline and deadline.degraded))
+    }
+    if mode_results is not None:
+        response['results'] = mode_results
+        response['degraded'] = any(result.get('degraded') for result in mode_results.values())
+    elif downgrade_reason:
+        response['degraded_reason'] = downgrade_reason
+        response['scoring_mode_used'] = mode_used
+    elif deadline and deadline.degraded:
+        response['degraded_reason'] = deadline.degraded_reason
         
-        return jsonify(response), 200
+    logger.info(
+        "Tag suggestion request completed successfully",
+        request_id=request_id,
+        num_suggestions=len(suggestions),
+        degraded=response['degraded']
+    )
         
-    except Exception as e:
-        error_request_id = data.get('request_id') if data else 'unknown'
+    # Send Discord notification with request summary
+    discord_notifier.send_request_summary(
+        request_id=request_id,
+        endpoint="/suggest-tags",
+        status="success",
+        duration_ms=request_duration,
+        details={
+            'scoring_mode': scoring_mode or config.scoring_mode,
+            'explain': explain or config.default_explain,
+            'degraded': response['degraded'],
+            'num_suggestions': len(suggestions),
+            'num_labels': len(catalog),
+            'confidence_stats': confidence_stats,
+            'category_breakdown': category_counts,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }
+    )
+        
+    http_response = jsonify(response)
+        
+    # Shadow modes run in the background once the response has been sent, on this request's context
+    shadow = _get_shadow_scorer() if mode_results is None else None
+    if shadow is not None and shadow.sample():
+        shadow_modes = [mode for mode in shadow.modes_for(mode_used) if _mode_available(mode)]
+        if shadow_modes:
+            request_context = contextvars.copy_context()  # Request id for shadow logs (cleared before close)
+            http_response.call_on_close(lambda: request_context.run(
+                shadow.submit, ctx, shadow_modes, mode_used, suggestions,
+                primary_degraded=response['degraded'], explain=explain, request_id=request_id
+            ))
+        
+    return http_response, 200
+        
+
+def _suggest_tags_error(data: Optional[Dict], e: Exception) -> Tuple[Response, int]:
+    """Log and notify an unexpected /suggest-tags failure."""
+    error_request_id = data.get('request_id') if data else 'unknown'
+    lecture = data.get('lecture') if data else None
+        
+    logger.error(
+        f"Error in suggest-tags endpoint",
+        request_id=error_request_id,
+        error_type=type(e).__name__,
+        error_message=str(e),
+        lecture_id=lecture.get('id') if lecture else None
+    )
+    import traceback
+    traceback.print_exception(e)
+        
+    # Send Discord notification for error
+    discord_notifier.send_request_summary(
+        request_id=error_request_id,
+        endpoint="/suggest-tags",
+        status="error",
+        duration_ms=0,
+        details={
+            'error_message': str(e),
+            'error_type': type(e).__name__,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }
+    )
+        
+    return jsonify({'error': str(e)}), 500
+
+
+def _parse_scoring_options(data: Dict, scoring_mode: str) -> Dict:
+    """
+    Validate the per-request scoring options of a streamed request body.
+
+    Raises:
+        ValueError: on an unknown mode or explain level, or a malformed
+            deadline_ms / max_llm_cost_usd
+    """
+    normalize_scoring_modes([scoring_mode])
+    max_llm_cost_usd = data.get('max_llm_cost_usd')
+    try:
+        max_llm_cost_usd = float(max_llm_cost_usd) if max_llm_cost_usd is not None else None
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid max_llm_cost_usd '{max_llm_cost_usd}'")
+    return {
+        'explain': normalize_explain(data.get('explain')),
+        'deadline_ms': parse_deadline_ms(
+            _requested_deadline_ms(data)
+        ),
+        'max_llm_cost_usd': max_llm_cost_usd
+    }
+
+
+def _score_batch_item(
+    index: int,
+    lecture: Dict,
+    catalog: LabelCatalog,
+    scoring_mode: str,
+    explain: Optional[str],
+    deadline_ms: Optional[float],
+    max_llm_cost_usd: Optional[float]
+) -> Dict:
+    """Score one lecture of a streamed batch into its NDJSON record (never raises)."""
+    started_at = time.time()
+    lecture_id = lecture.get('id') if isinstance(lecture, dict) else None
+    
+    try:
+        if not lecture_id:
+            raise ValueError("Lecture must be an object with an id")
         
+        mode_used, downgrade_reason = resolve_scoring_mode(scoring_mode)
+        deadline = Deadline(deadline_ms) if deadline_ms else None  # Each lecture gets the full budget
+        suggestions = score_lecture_v2(
+            lecture, catalog, scoring_mode=mode_used, explain=explain, deadline=deadline,
+            max_llm_cost_usd=max_llm_cost_usd
+        )
+        if deadline is not None:
+            deadline_stats.record(deadline)
+        
+        record = {'type': 'result', 'index': index, 'lecture_id': lecture_id}
+        record.update(_mode_result(suggestions, started_at, mode_used, downgrade_reason, deadline))
+        return record
+    except Exception as e:
         logger.error(
-            f"Error in suggest-tags endpoint",
-            request_id=error_request_id,
+            "Lecture failed in streamed batch",
+            lecture_id=lecture_id,
+            index=index,
             error_type=type(e).__name__,
-            error_message=str(e),
-            lecture_id=lecture.get('id') if lecture else None
+            error_message=str(e)
         )
-        import traceback
-        traceback.print_exc()
+        return {
+            'type': 'error',
+            'index': index,
+            'lecture_id': lecture_id,
+            'error': f"{type(e).__name__}: {e}",
+            'duration_ms': round((time.time() - started_at) * 1000, 1)
+        }
+
+
+@app.route('/suggest-tags-batch', methods=['POST'])
+def suggest_tags_batch():
+    """
+    Tag suggestions for many lectures, streamed as NDJSON.
+    
+    Takes the /suggest-tags request with "lectures": [...] instead of
+    "lecture" (scoring_mode must be a single mode), plus optional
+    "concurrency" (lectures scored in parallel, default BATCH_STREAM_CONCURRENCY).
+    deadline_ms applies to each lecture.
+    
+    Each line is written (and flushed) as soon as its lecture finishes, in
+    completion order; "index" is the lecture's position in the request:
+        {"type": "result", "index": 3, "lecture_id": "rec123", "suggestions": [...],
+         "duration_ms": 2310.4, "degraded": false}
+        {"type": "error", "index": 7, "lecture_id": "rec456", "error": "...", "duration_ms": 12.0}
+    The last line is a summary:
+        {"type": "summary", "request_id": "uuid", "num_lectures": 120, "succeeded": 119,
+         "failed": 1, "degraded": 2, "duration_ms": 81234.5}
+    
+    Only the lectures in flight are held in memory, not the finished results.
+    Validation errors are returned as a regular 400 JSON response.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No JSON data provided'}), 400
+    
+    request_id = data.get('request_id', 'unknown')
+    model_version = data.get('model_version', 'v1')
+    artifact_version = data.get('artifact_version', 'unknown')
+    scoring_mode = data.get('scoring_mode') or config.scoring_mode
+    lectures = data.get('lectures')
+    
+    if not isinstance(lectures, list) or not lectures:
+        return jsonify({'error': 'No lectures provided'}), 400
+    
+    try:
+        options = _parse_scoring_options(data, scoring_mode)
+        concurrency = int(data.get('concurrency') or config.batch_stream_concurrency)
+    except (TypeError, ValueError) as e:
+        logger.warning("Invalid batch request", request_id=request_id, error_message=str(e))
+        return jsonify({'error': str(e)}), 400
+    explain, deadline_ms, max_llm_cost_usd = options['explain'], options['deadline_ms'], options['max_llm_cost_usd']
+    concurrency = max(1, min(concurrency, config.batch_stream_max_concurrency))
+    
+    catalog = _resolve_label_catalog(artifact_version, data.get('labels', []))
+    if catalog is None:
+        return jsonify({'error': f"No labels provided and no label set registered for artifact_version '{artifact_version}'"}), 400
+    
+    logger.info(
+        "Streamed batch request received",
+        request_id=request_id,
+        model_version=model_version,
+        artifact_version=artifact_version,
+        scoring_mode=scoring_mode,
+        num_lectures=len(lectures),
+        num_labels=len(catalog),
+        concurrency=concurrency
+    )
+    
+    # The request context (request id in logs) is cleared before the body is streamed
+    request_context = contextvars.copy_context()
+    
+    def generate():
+        started_at = time.time()
+        counts = {'succeeded': 0, 'failed': 0, 'degraded': 0}
+        pending = set()
+        remaining = iter(enumerate(lectures))
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch-stream")
         
-        # Send Discord notification for error
-        discord_notifier.send_request_summary(
-            request_id=error_request_id,
-            endpoint="/suggest-tags",
-            status="error",
-            duration_ms=0,
-            details={
-                'error_message': str(e),
-                'error_type': type(e).__name__,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        def submit_next() -> None:
+            for index, lecture in remaining:
+                pending.add(pool.submit(
+                    request_context.run(contextvars.copy_context).run, _score_batch_item,
+                    index, lecture, catalog, scoring_mode, explain, deadline_ms, max_llm_cost_usd
+                ))
+                return
+        
+        try:
+            for _ in range(concurrency):
+                submit_next()
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    submit_next()
+                    
+                    record = future.result()
+                    if record['type'] == 'result':
+                        counts['succeeded'] += 1
+                        counts['degraded'] += int(record['degraded'])
+                    else:
+                        counts['failed'] += 1
+                    yield json.dumps(record, ensure_ascii=False) + "\n"
+            
+            summary = {
+                'type': 'summary',
+                'request_id': request_id,
+                'model_version': model_version,
+                'artifact_version': artifact_version,
+                'num_lectures': len(lectures),
+                **counts,
+                'duration_ms': round((time.time() - started_at) * 1000, 1)
             }
+            request_context.run(logger.info, "Streamed batch request completed", **summary)
+            yield json.dumps(summary, ensure_ascii=False) + "\n"
+        finally:
+            # Client gone (generator closed) or done: do not start lectures nobody will read
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    return Response(
+        generate(),
+        mimetype='application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'}  # Flush each line through proxies
+    )
+
+
+def _sse_event(event: str, data: Dict) -> str:
+    """One server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.route('/suggest-tags-stream', methods=['POST'])
+def suggest_tags_stream():
+    """
+    Progressive tag suggestions as server-sent events.
+    
+    Takes the /suggest-tags request (scoring_mode must be a single mode) and
+    streams up to three events:
+        event: fast      - prototype-only suggestions, sent after the first
+                           embedding round trip: {"suggestions": [...], "duration_ms": 410.2}
+        event: refined   - the requested mode's result (same fields as a
+                           /suggest-tags "results" entry); not sent for "fast"
+        event: done      - {"request_id": "uuid", "duration_ms": 3120.5}
+    or "event: error" ({"phase": "fast" | "refined", "error": "..."}) in place
+    of a failed phase. The refined phase reuses the fast phase's embedding
+    and prototype scores, and both share the request deadline.
+    
+    Request validation errors are returned as a regular 400 JSON response.
+    """
+    request_received_time = time.time()
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No JSON data provided'}), 400
+    
+    request_id = data.get('request_id', 'unknown')
+    artifact_version = data.get('artifact_version', 'unknown')
+    scoring_mode = data.get('scoring_mode') or config.scoring_mode
+    lecture = data.get('lecture')
+    
+    if not lecture:
+        return jsonify({'error': 'No lecture provided'}), 400
+    
+    try:
+        options = _parse_scoring_options(data, scoring_mode)
+    except ValueError as e:
+        logger.warning("Invalid streaming request", request_id=request_id, error_message=str(e))
+        return jsonify({'error': str(e)}), 400
+    
+    catalog = _resolve_label_catalog(artifact_version, data.get('labels', []))
+    if catalog is None:
+        return jsonify({'error': f"No labels provided and no label set registered for artifact_version '{artifact_version}'"}), 400
+    
+    logger.info(
+        "Streaming tag suggestion request received",
+        request_id=request_id,
+        artifact_version=artifact_version,
+        scoring_mode=scoring_mode,
+        num_labels=len(catalog),
+        lecture_id=lecture.get('id')
+    )
+    
+    deadline = None
+    if options['deadline_ms']:
+        deadline = Deadline(options['deadline_ms'] - (time.time() - request_received_time) * 1000)
+    ctx = _scoring_context(lecture, catalog)
+    
+    # The request context (request id in logs) is cleared before the body is streamed
+    request_context = contextvars.copy_context()
+    
+    def score_fast() -> Dict:
+        started_at = time.time()
+        suggestions = score_lecture_fast(ctx)
+        return {'suggestions': suggestions, 'duration_ms': round((time.time() - started_at) * 1000, 1)}
+    
+    def score_refined() -> Dict:
+        started_at = time.time()
+        mode_used, downgrade_reason = resolve_scoring_mode(scoring_mode)
+        suggestions = score_lecture_v2(
+            lecture, catalog, scoring_mode=mode_used, explain=options['explain'], deadline=deadline,
+            max_llm_cost_usd=options['max_llm_cost_usd'], ctx=ctx
         )
-        
-        return jsonify({'error': str(e)}), 500
+        if deadline is not None:
+            deadline_stats.record(deadline)
+        return _mode_result(suggestions, started_at, mode_used, downgrade_reason, deadline)
+    
+    def run_phase(phase: str, fn) -> str:
+        try:
+            return _sse_event(phase, request_context.run(fn))
+        except Exception as e:
+            request_context.run(
+                logger.error,
+                "Streaming phase failed",
+                request_id=request_id,
+                phase=phase,
+                error_type=type(e).__name__,
+                error_message=str(e)
+            )
+            return _sse_event('error', {'phase': phase, 'error': f"{type(e).__name__}: {e}"})
+    
+    def generate():
+        if scoring_mode == "fast" or _mode_available("fast"):
+            yield run_phase('fast', score_fast)
+        if scoring_mode != "fast":
+            yield run_phase('refined', score_refined)
+        yield _sse_event('done', {
+            'request_id': request_id,
+            'duration_ms': round((time.time() - request_received_time) * 1000, 1)
+        })
+    
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'}  # Flush each event through proxies
+    )
 
 
 @app.route('/train', methods=['POST'])
@@ -954,56 +2270,24 @@ def train():
             }
         }
     }
+    
+    The body is parsed incrementally (see train_from_stream), never loaded
+    as a whole.
     """
     try:
-        training_data = request.get_json()
-        
-        if not training_data:
+        if request.content_length == 0:
             logger.warning("No JSON data provided in train request")
             return jsonify({'error': 'No JSON data provided'}), 400
         
-        lectures_count = len(training_data.get('lectures', []))
-        labels_count = len(training_data.get('labels', [])) if 'labels' in training_data else len(training_data.get('tags', {}))
-        
         logger.info(
             "Training request received",
-            num_lectures=lectures_count,
-            num_labels=labels_count
+            content_length=request.content_length
         )
         
-        # Detect format and convert to old format if needed
-        if 'labels' in training_data and isinstance(training_data.get('labels'), list):
-            # New format (v2) - convert to old format
-            lectures = training_data.get('lectures', [])
-            labels = training_data.get('labels', [])
-            
-            # Convert labels array to tags dict (preserve category)
-            tags = {}
-            for label in labels:
-                tags[label['id']] = {
-                    'tag_id': label['id'],
-                    'name_he': label.get('name_he', ''),
-                    'synonyms_he': label.get('synonyms_he', ''),
-                    'category': label.get('category', 'Unknown')
-                }
-            
-            # Convert lectures to old format
-            converted_lectures = []
-            for lecture in lectures:
-                converted_lectures.append({
-                    'id': lecture.get('id'),
-                    'lecture_title': lecture.get('title', ''),
-                    'lecture_description': lecture.get('description', ''),
-                    'lecture_tag_ids': lecture.get('label_ids', [])
-                })
-            
-            training_data = {
-                'lectures': converted_lectures,
-                'tags': tags
-            }
-        
         with track_operation("train_prototypes", logger):
-            result = train_from_data(training_data)
+            result = train_from_stream(request.stream)
+            
+        lectures_count = result.get('num_lectures', 0)
         
         logger.info(
             "Training completed successfully",
@@ -1026,6 +2310,9 @@ def train():
         
         return jsonify(result), 200
         
+    except JSONStreamError as e:
+        logger.warning("Invalid JSON in train request", error_message=str(e))
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(
             f"Training error",
@@ -1056,51 +2343,23 @@ def train_csv():
         if 'lecture_labels' not in request.files:
             return jsonify({'error': 'Missing lecture_labels.csv file'}), 400
         
-        # Read file contents
-        lectures_csv = request.files['lectures'].read()
-        labels_csv = request.files['labels'].read()
-        lecture_labels_csv = request.files['lecture_labels'].read()
-        
         logger.info("Parsing CSV files...")
         
-        # Parse CSV data
-        training_data = parse_csv_training_data(
-            lectures_csv,
-            labels_csv,
-            lecture_labels_csv
-        )
-        
-        logger.info(f"Parsed {len(training_data['lectures'])} lectures with {len(training_data['labels'])} labels")
-        
-        # Convert labels list to tags dict (same as /train endpoint)
-        lectures = training_data.get('lectures', [])
-        labels = training_data.get('labels', [])
-        
-        # Convert labels array to tags dict (preserve category)
-        tags = {}
-        for label in labels:
-            tags[label['id']] = {
-                'tag_id': label['id'],
-                'name_he': label.get('name_he', ''),
-                'synonyms_he': label.get('synonyms_he', ''),
-                'category': label.get('category', 'Unknown')
-            }
+        # Parse the uploads as streams (row by row) straight into the training format
+        try:
+            training_data = parse_csv_training_stream(
+                request.files['lectures'].stream,
+                request.files['labels'].stream,
+                request.files['lecture_labels'].stream
+            )
+        except CSVFormatError as e:
+            logger.warning(f"Rejected CSV upload: {e}")
+            return jsonify({'error': str(e)}), 400
         
-        # Convert lectures to old format
-        converted_lectures = []
-        for lecture in lectures:
-            converted_lectures.append({
-                'id': lecture.get('id'),
-                'lecture_title': lecture.get('title', ''),
-                'lecture_description': lecture.get('description', ''),
-                'lecture_tag_ids': lecture.get('label_ids', [])
-            })
+        logger.info(f"Parsed {len(training_data['lectures'])} lectures with {len(training_data['tags'])} labels")
         
         # Train using existing logic
-        result = train_from_data({
-            'lectures': converted_lectures,
-            'tags': tags
-        })
+        result = train_from_data(training_data)
         
         # Automatically reload prototypes after training
         load_prototypes_from_db()
@@ -1141,7 +2400,30 @@ def health():
     return jsonify({
         'status': 'ok',
         'prototypes_loaded': prototypes_loaded,
-        'num_prototypes': len(prototype_knn.tag_prototypes) if prototypes_loaded else 0
+        'num_prototypes': len(prototype_knn.tag_prototypes) if prototypes_loaded else 0,
+        'circuit_breakers': {name: breaker.state for name, breaker in circuit_breakers.items()}
+    }), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """In-process performance metrics (micro-batching, caches)."""
+    return jsonify({
+        'fast_batcher': fast_batcher.stats() if fast_batcher else None,
+        'arbiter_batcher': arbiter_batcher.stats() if arbiter_batcher else None,
+        'bio_search_flight': bio_search_flight.stats(),
+        'bio_cache': bio_cache.stats(),
+        'label_catalogs': label_catalog_cache.stats(),
+        'registered_label_sets': registered_catalog_cache.stats(),
+        'reasoning_output': reasoning_output_stats.stats(),
+        'deadlines': deadline_stats.stats(),
+        'llm_hedging': {
+            'reasoning': reasoning_hedger.stats(),
+            'arbiter': arbiter_hedger.stats()
+        },
+        'circuit_breakers': {name: breaker.stats() for name, breaker in circuit_breakers.items()},
+        'auto_routing': auto_routing_stats.stats(),
+        'shadow_scoring': shadow_scorer.stats() if shadow_scorer else None
     }), 200
 
 
@@ -1160,6 +2442,59 @@ def list_prototype_versions():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/label-sets', methods=['POST'])
+def register_label_set():
+    """
+    Register a labels list once so /suggest-tags requests can reference it
+    by artifact_version instead of sending every label.
+    
+    Request body:
+    {
+        "artifact_version": "labels-emb-2025-10-29",
+        "labels": [{"id": "...", "name_he": "...", "category": "...", "active": true}]
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        artifact_version = data.get('artifact_version')
+        labels = data.get('labels') or []
+        
+        if not artifact_version:
+            return jsonify({'error': 'artifact_version is required'}), 400
+        if not labels:
+            return jsonify({'error': 'No labels provided'}), 400
+        if any('id' not in label for label in labels):
+            return jsonify({'error': 'Every label needs an id'}), 400
+        
+        fingerprint = fingerprint_labels(labels)
+        storage = PrototypeStorage()
+        version_id = storage.save_label_set(artifact_version, labels, fingerprint)
+        
+        registered_catalog_cache.set(artifact_version, get_label_catalog(labels))
+        
+        return jsonify({
+            'status': 'registered',
+            'artifact_version': artifact_version,
+            'fingerprint': fingerprint,
+            'num_labels': len(labels),
+            'version_id': version_id
+        }), 200
+    except Exception as e:
+        logger.error(f"Error registering label set: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/label-sets', methods=['GET'])
+def list_label_sets():
+    """List registered label sets."""
+    try:
+        storage = PrototypeStorage()
+        return jsonify({'label_sets': storage.list_label_sets()}), 200
+    except Exception as e:
+        logger.error(f"Error listing label sets: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/tag-info/<tag_id>', methods=['GET'])
 def get_tag_info(tag_id: str):
     """Get detailed information about a specific tag from the database."""
@@ -1482,7 +2817,14 @@ def train_ui():
                     
                     const result = await response.json();
                     
-                    if (response.ok) {
+                    if (response.ok && result.status === 'unchanged') {
+                        message.className = 'message success';
+                        message.style.display = 'block';
+                        message.innerHTML = `
+                            <strong>✅ Model Is Up To Date</strong><br><br>
+                            The training data has not changed since the last training run, so no retraining was needed.
+                        `;
+                    } else if (response.ok) {
                         message.className = 'message success';
                         message.style.display = 'block';
                         message.innerHTML = `
@@ -1857,40 +3199,47 @@ def index():
     return html
 
 
-def fetch_training_data_from_api() -> dict:
+def fetch_training_data_from_api(sync_state: Optional[Dict] = None) -> Optional[dict]:
     """
     Fetch training data from external API using X-API-KEY header.
     
+    Conditional on sync_state (validators of the last dataset trained on),
+    paginated and retried per page - see TrainingDataFetcher.
+    
     Returns:
-        Dict with 'labels', 'lectures', and 'lecture_labels' keys
+        None if the dataset is unchanged, else {'data': dict with 'labels',
+        'lectures' and 'lecture_labels' keys, 'sync': validators, 'num_pages'}
     """
-    api_url = "https://hallo-tags-manager.replit.app/v2/train-data"
+    fetch_config = config or Config()
     api_key = os.getenv('TRAIN_DATA_X_API_KEY')
     
     if not api_key:
         raise ValueError("TRAIN_DATA_X_API_KEY environment variable not set")
     
-    headers = {
-        'X-API-KEY': api_key
-    }
-    
-    logger.info(f"Fetching training data from {api_url}")
+    logger.info(f"Fetching training data from {fetch_config.train_data_api_url}")
     # SSL verification disabled due to Replit environment certificate chain issues
     # Attempted fixes: system cacert, certifi, default CA bundle - all failed
     # This is acceptable for internal Replit-to-Replit communication with API key auth
     # TODO: Investigate certificate chain for production deployment
-    response = requests.get(api_url, headers=headers, timeout=30, verify=False)
-    response.raise_for_status()
-    
-    data = response.json()
-    logger.info(
-        f"Fetched training data",
-        num_labels=len(data.get('labels', [])),
-        num_lectures=len(data.get('lectures', [])),
-        num_lecture_labels=len(data.get('lecture_labels', []))
+    fetcher = TrainingDataFetcher(
+        api_url=fetch_config.train_data_api_url,
+        api_key=api_key,
+        page_size=fetch_config.train_data_page_size,
+        max_retries=fetch_config.train_data_max_retries,
+        backoff_seconds=fetch_config.train_data_retry_backoff_seconds,
+        timeout=fetch_config.train_data_timeout_seconds,
+        verify=False
     )
+    return fetcher.fetch(sync_state)
+    
     
-    return data
+def _load_training_data_sync(source_url: str) -> Optional[Dict]:
+    """Stored validators for the training data source (None if unavailable)."""
+    try:
+        return PrototypeStorage().load_training_data_sync(source_url)
+    except Exception as e:
+        logger.warning(f"Could not load training data sync state - fetching unconditionally: {e}")
+        return None
 
 
 def transform_api_data_to_training_format(api_data: dict) -> dict:
@@ -1954,6 +3303,7 @@ def transform_api_data_to_training_format(api_data: dict) -> dict:
             'lecture_title': lecture.get('title', ''),
             'lecture_description': lecture.get('description', ''),
             'lecturer_id': lecture.get('lecturer_id', ''),
+            'lecturer_name': lecture.get('lecturer_name', ''),
             'lecture_tag_ids': label_ids
         })
     
@@ -1969,9 +3319,12 @@ def transform_api_data_to_training_format(api_data: dict) -> dict:
     }
 
 
-def run_training_in_background(training_data: dict):
+def run_training_in_background(training_data: dict, sync: Optional[Dict] = None, source_url: Optional[str] = None):
     """
     Run training in a background thread.
+    
+    sync (the fetched dataset's validators) is stored for source_url only
+    once training succeeded, so a failed run is retried on the next fetch.
     """
     try:
         logger.info("Starting background training")
@@ -1982,22 +3335,120 @@ def run_training_in_background(training_data: dict):
         load_prototypes_from_db()
         logger.info("Prototypes reloaded after training")
         
+        if sync and source_url:
+            PrototypeStorage().save_training_data_sync(source_url, sync)
+        
     except Exception as e:
         logger.error(f"Background training failed: {e}")
         import traceback
         traceback.print_exc()
 
 
+def start_bio_prewarm(lecturers: List[Dict], source: str) -> tuple:
+    """
+    Start a bio pre-warm job in a background thread.
+    
+    Returns:
+        (job, started) - started is False if a job is already running, in
+                         which case the running job is returned
+    """
+    global bio_prewarm_job
+    
+    with _bio_prewarm_lock:
+        if bio_prewarm_job is not None and bio_prewarm_job.is_running:
+            return bio_prewarm_job, False
+        
+        prewarm_config = config or Config()
+        bio_prewarm_job = BioPrewarmJob(
+            lecturers,
+            max_workers=prewarm_config.bio_prewarm_workers,
+            rate_per_sec=prewarm_config.bio_prewarm_rate_per_sec,
+            source=source
+        )
+        threading.Thread(target=bio_prewarm_job.run, daemon=True).start()
+        return bio_prewarm_job, True
+
+
+@app.route('/prewarm-bios', methods=['POST'])
+def prewarm_bios():
+    """
+    Pre-warm the lecturer bio cache.
+    
+    Request body (optional):
+    {
+        "lecturers": [{"lecturer_id": "...", "lecturer_name": "...", "lecture_description": "..."}]
+    }
+    
+    Without a lecturers list, the distinct lecturers of the training dataset
+    (fetched from the external API) are used. Returns immediately; poll
+    GET /prewarm-bios for progress.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        if data.get('lecturers'):
+            lecturers = collect_lecturers(data['lecturers'])
+            source = 'list'
+        else:
+            # Unconditional fetch (no sync state), so the full dataset is always returned
+            training_data = transform_api_data_to_training_format(fetch_training_data_from_api()['data'])
+            lecturers = collect_lecturers(training_data['lectures'])
+            source = 'training-data'
+        
+        if not lecturers:
+            return jsonify({'error': f'No lecturers found to pre-warm (source: {source})'}), 400
+        
+        job, started = start_bio_prewarm(lecturers, source)
+        if not started:
+            return jsonify({'error': 'Bio pre-warm already running', 'progress': job.progress()}), 409
+        
+        return jsonify({'status': 'prewarm initiated', 'progress': job.progress()}), 202
+    
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch training data: {e}")
+        return jsonify({'error': f'Failed to fetch training data: {str(e)}'}), 500
+    
+    except Exception as e:
+        logger.error(f"Error starting bio pre-warm: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/prewarm-bios', methods=['GET'])
+def prewarm_bios_progress():
+    """Progress of the latest bio pre-warm job."""
+    if bio_prewarm_job is None:
+        return jsonify({'status': 'never run'}), 200
+    return jsonify(bio_prewarm_job.progress()), 200
+
+
 @app.route('/get-data-and-train', methods=['POST'])
 def get_data_and_train():
     """
     Fetch training data from external API and initiate training in background.
     
-    Returns immediately with "training initiated" message.
+    Returns immediately with "training initiated" message, or 200 with
+    status "unchanged" (and no retraining) when the dataset has not changed
+    since the last successful run. Pass ?force=true (or {"force": true})
+    to fetch and retrain regardless.
     """
     try:
+        request_data = request.get_json(silent=True) or {}
+        force = request.args.get('force', '').lower() == 'true' or request_data.get('force') is True
+        
+        source_url = (config or Config()).train_data_api_url
+        sync_state = None if force else _load_training_data_sync(source_url)
+        
         # Fetch data from external API
-        api_data = fetch_training_data_from_api()
+        fetched = fetch_training_data_from_api(sync_state)
+        
+        if fetched is None:
+            return jsonify({
+                'status': 'unchanged',
+                'message': 'Training data has not changed since the last training run',
+                'last_synced_at': (sync_state or {}).get('updated_at')
+            }), 200
+        
+        api_data = fetched['data']
         
         # Transform to training format
         training_data = transform_api_data_to_training_format(api_data)
@@ -2005,16 +3456,26 @@ def get_data_and_train():
         # Start training in background thread
         training_thread = threading.Thread(
             target=run_training_in_background,
-            args=(training_data,),
+            args=(training_data, fetched['sync'], source_url),
             daemon=True
         )
         training_thread.start()
         
+        # Warm the bio cache for the dataset's lecturers alongside training
+        prewarm_started = False
+        if (config or Config()).bio_prewarm_after_training:
+            _, prewarm_started = start_bio_prewarm(
+                collect_lecturers(training_data.get('lectures', [])),
+                source='get-data-and-train'
+            )
+        
         return jsonify({
             'status': 'training initiated',
             'num_lectures': len(training_data.get('lectures', [])),
             'num_tags': len(training_data.get('tags', {})),
-            'num_lecture_labels': len(api_data.get('lecture_labels', []))
+            'num_lecture_labels': len(api_data.get('lecture_labels', [])),
+            'num_pages': fetched['num_pages'],
+            'bio_prewarm_started': prewarm_started
         }), 202
         
     except requests.RequestException as e:
@@ -0,0 +1,183 @@
+"""
+ASGI entry point for the Tag Suggestions API.
+
+POST /suggest-tags is served by api_server.asuggest_tags on the server's
+event loop: ensemble and reasoning scoring await AsyncOpenAI, so one process
+can hold many in-flight LLM requests without a thread each. Every other
+route is the unchanged Flask app, run in a worker thread with the request
+body and response streamed through (so /train ingestion and the NDJSON/SSE
+endpoints keep their memory bounds).
+
+Needs an ASGI server, e.g.:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+`python api_server.py` still serves everything, synchronously, on Flask.
+"""
+
+import asyncio
+import io
+import sys
+from typing import Dict, List, Tuple
+
+import api_server
+
+flask_app = api_server.app
+
+ASYNC_ROUTES = {('POST', '/suggest-tags'): api_server.asuggest_tags}
+
+
+class _RequestBody(io.RawIOBase):
+    """wsgi.input for a worker thread: pulls http.request messages from the event loop on demand."""
+    
+    def __init__(self, receive, loop: asyncio.AbstractEventLoop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b''
+        self._more_body = True
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        while not self._buffer and self._more_body:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._more_body = False
+                break
+            self._buffer = message.get('body', b'')
+            self._more_body = message.get('more_body', False)
+        
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body', False):
+            break
+    return b''.join(chunks)
+
+
+def _wsgi_environ(scope: Dict, body: io.IOBase) -> Dict:
+    """WSGI environ for an ASGI http scope."""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+            continue
+        key = f'HTTP_{name}'
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _response_start(status: int, headers: List[Tuple[str, str]]) -> Dict:
+    return {
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+    }
+
+
+async def _serve_async(scope: Dict, receive, send, view) -> None:
+    """Run an async view in a Flask request context (before/after_request hooks included)."""
+    environ = _wsgi_environ(scope, io.BytesIO(await _read_body(receive)))
+    
+    # Mirrors Flask.wsgi_app / full_dispatch_request with the view awaited
+    with flask_app.request_context(environ):
+        try:
+            try:
+                rv = flask_app.preprocess_request()
+                if rv is None:
+                    rv = await view()
+            except Exception as e:
+                rv = flask_app.handle_user_exception(e)
+            response = flask_app.finalize_request(rv)
+        except Exception as e:
+            response = flask_app.handle_exception(e)
+    
+    try:
+        await send(_response_start(response.status_code, response.headers.to_wsgi_list()))
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+    finally:
+        # Runs call_on_close callbacks (shadow scoring submits to its own executor)
+        response.close()
+
+
+async def _serve_wsgi(scope: Dict, receive, send) -> None:
+    """Run the Flask app in a worker thread, streaming the request and response bodies."""
+    loop = asyncio.get_running_loop()
+    environ = _wsgi_environ(scope, io.BufferedReader(_RequestBody(receive, loop)))
+    started = {}
+    
+    def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = headers
+    
+    body = await asyncio.to_thread(flask_app, environ, start_response)
+    chunks = iter(body)
+    try:
+        await send(_response_start(started['status'], started['headers']))
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        if hasattr(body, 'close'):
+            await asyncio.to_thread(body.close)
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            api_server.logger.info("Starting Tag Suggestions API (ASGI)...")
+            await asyncio.to_thread(api_server.load_prototypes_from_db)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope: Dict, receive, send) -> None:
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        raise NotImplementedError(f"Unsupported ASGI scope type '{scope['type']}'")
+    
+    view = ASYNC_ROUTES.get((scope['method'], scope['path']))
+    if view is not None:
+        await _serve_async(scope, receive, send, view)
+    else:
+        await _serve_wsgi(scope, receive, send)
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Offline bulk tagging of a lecture catalog dump.
+
+Reads lectures from CSV (id or airtable_id, title, description, lecturer_id,
+lecturer_name) or JSONL (one /suggest-tags "lecture" object per line) and
+writes one JSON line per lecture:
+    {"index": 0, "lecture_id": "rec123", "suggestions": [...]}
+    {"index": 1, "lecture_id": "rec456", "error": "..."}
+
+Lectures are processed in chunks: one bulk embedding pass per chunk,
+prototype scoring in a process pool, then (for LLM modes) the scoring mode
+on a bounded thread pool reusing each lecture's embedding. In reasoning and
+ensemble modes the full-label reasoning calls are packed BATCH_SIZE_LLM
+lectures per call (ReasoningScorer.score_batch). After every chunk
+the output is flushed and fsynced and a checkpoint (<output>.checkpoint) is
+written; rerunning the same command resumes after the last complete chunk.
+
+Uses the prototypes saved in PostgreSQL (DATABASE_URL) and OPENAI_API_KEY.
+
+Usage:
+    python bulk_tag.py lectures.csv -o tags.jsonl --labels labels.json
+    python bulk_tag.py lectures.jsonl -o tags.jsonl --artifact-version labels-2025-10-29 \\
+        --mode ensemble --llm-concurrency 8
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import api_server
+from src.config import Config
+from src.embeddings import EmbeddingsGenerator
+from src.prototype_knn import PrototypeKNN
+from src.scoring_context import ScoringContext
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+# Modes built on the full-label reasoning call, which score_batch can pack
+PACKED_REASONING_MODES = ("reasoning", "ensemble")
+
+# Prototype scorer of a pool worker process (see _init_worker)
+_worker_knn = None
+_worker_tag_embeddings = None
+
+
+def read_lectures(path: str) -> Iterator[Optional[Dict]]:
+    """Lectures of a CSV or JSONL file in file order (None for an unparseable JSONL line)."""
+    if path.lower().endswith('.csv'):
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                yield {
+                    'id': row.get('airtable_id') or row.get('id'),
+                    'title': row.get('title', ''),
+                    'description': row.get('description', ''),
+                    'lecturer_id': row.get('lecturer_id') or None,
+                    'lecturer_name': row.get('lecturer_name') or None
+                }
+    else:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield None
+
+
+def read_chunks(lectures: Iterator, chunk_size: int, skip: int) -> Iterator[List[Tuple[int, Optional[Dict]]]]:
+    """(index, lecture) chunks, starting after the first skip lectures."""
+    chunk = []
+    for index, lecture in enumerate(lectures):
+        if index < skip:
+            continue
+        chunk.append((index, lecture))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_checkpoint(output_path: str, args) -> Dict:
+    """Checkpoint of a previous run of the same command, or a fresh one."""
+    checkpoint_path = output_path + CHECKPOINT_SUFFIX
+    fresh = {
+        'input': os.path.abspath(args.input),
+        'scoring_mode': args.mode,
+        'rows_done': 0,
+        'output_bytes': 0,
+        'succeeded': 0,
+        'failed': 0
+    }
+    
+    if args.restart or not os.path.exists(checkpoint_path):
+        if not args.restart and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            sys.exit(f"❌ {output_path} exists without a checkpoint - use --restart to overwrite it")
+        return fresh
+    
+    with open(checkpoint_path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    
+    if checkpoint.get('input') != fresh['input'] or checkpoint.get('scoring_mode') != args.mode:
+        sys.exit(
+            f"❌ {checkpoint_path} is for {checkpoint.get('input')} in mode {checkpoint.get('scoring_mode')} - "
+            f"use the same input and --mode to resume, or --restart"
+        )
+    return checkpoint
+
+
+def save_checkpoint(output_path: str, checkpoint: Dict) -> None:
+    """Atomically replace the checkpoint file."""
+    checkpoint_path = output_path + CHECKPOINT_SUFFIX
+    checkpoint['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+
+def _init_worker(tag_prototypes, tag_thresholds, tag_stats, tag_embeddings) -> None:
+    """Give a pool process its own copy of the prototypes (sent once per process)."""
+    global _worker_knn, _worker_tag_embeddings
+    _worker_knn = PrototypeKNN(Config())
+    _worker_knn.tag_prototypes = tag_prototypes
+    _worker_knn.tag_thresholds = tag_thresholds
+    _worker_knn.tag_stats = tag_stats
+    _worker_tag_embeddings = tag_embeddings
+
+
+def _score_slice(args: Tuple[np.ndarray, np.ndarray]) -> List[Dict[str, float]]:
+    """Thresholded prototype scores of a slice of lecture embeddings (runs in a pool process)."""
+    embeddings, label_mask = args
+    return _worker_knn.score_lectures_batch(embeddings, _worker_tag_embeddings, tag_masks=[label_mask] * len(embeddings))
+
+
+def score_prototypes(pool: ProcessPoolExecutor, workers: int, embeddings: np.ndarray, label_mask: np.ndarray) -> List[Dict[str, float]]:
+    """Prototype scores of a chunk, split across the pool processes."""
+    slices = [s for s in np.array_split(embeddings, workers) if len(s)]
+    scores = []
+    for slice_scores in pool.map(_score_slice, [(s, label_mask) for s in slices]):
+        scores.extend(slice_scores)
+    return scores
+
+
+def seed_packed_reasoning(contexts: List[ScoringContext], args, llm_pool: ThreadPoolExecutor) -> None:
+    """
+    Run the chunk's full-label reasoning calls in packs and seed the results.
+    
+    score_batch sends config.batch_size_llm lectures per call, sharing the
+    system prompt and tag list. Each lecture's result is seeded under the
+    memo key of _reasoning_suggestions, so _score_mode reuses it. A pack that
+    fails leaves its lectures unseeded, and they are scored one by one.
+    """
+    scorer = api_server._build_reasoning_scorer(args.explain)
+    if scorer.pack_size <= 1 or not contexts:
+        return
+    
+    # Bios first (memoized on each context, so the scoring mode reuses them too)
+    profiles = list(llm_pool.map(lambda ctx: ctx.lecturer_profile(args.mode), contexts))
+    catalog = contexts[0].catalog
+    
+    def run(start: int) -> None:
+        pack = contexts[start:start + scorer.pack_size]
+        lectures = [ctx.lecture_for_scorer() for ctx in pack]
+        # By lecture id: bios may be found by lecturer id alone, and lecturers can share a name
+        lecturer_profiles = {
+            ctx.lecture_id: profile
+            for ctx, profile in zip(pack, profiles[start:start + scorer.pack_size])
+            if profile
+        }
+        try:
+            suggestions = scorer.score_batch(lectures, catalog.tags_for_scorer, lecturer_profiles, catalog=catalog)
+        except Exception as e:
+            print(f"⚠ Packed reasoning call failed ({type(e).__name__}: {e}) - scoring {len(pack)} lectures one by one")
+            return
+        for ctx in pack:
+            ctx.seed(('reasoning', scorer.explain), suggestions.get(ctx.lecture_id, []))
+    
+    list(llm_pool.map(run, range(0, len(contexts), scorer.pack_size)))
+
+
+def score_chunk(
+    chunk: List[Tuple[int, Optional[Dict]]],
+    catalog,
+    args,
+    embeddings_gen: EmbeddingsGenerator,
+    pool: ProcessPoolExecutor,
+    llm_pool: Optional[ThreadPoolExecutor]
+) -> List[Dict]:
+    """Output records of one chunk, in input order."""
+    records: Dict[int, Dict] = {}
+    valid = []
+    for index, lecture in chunk:
+        if isinstance(lecture, dict) and lecture.get('id'):
+            valid.append((index, lecture))
+        else:
+            records[index] = {'index': index, 'lecture_id': None, 'error': "Lecture must be an object with an id"}
+    
+    if valid:
+        texts = [
+            embeddings_gen.create_lecture_text(lecture.get('title', ''), lecture.get('description', ''))
+            for _, lecture in valid
+        ]
+        embeddings = embeddings_gen.generate_embeddings(texts, "lectures (bulk)")
+        label_mask = catalog.prototype_mask(api_server.prototype_knn.prototype_tag_ids(api_server.tag_embeddings_cache))
+        scores = score_prototypes(pool, args.workers, embeddings, label_mask)
+        
+        contexts = {}
+        if args.mode != "fast":
+            for (index, lecture), embedding, lecture_scores in zip(valid, embeddings, scores):
+                ctx = ScoringContext(
+                    lecture=lecture,
+                    catalog=catalog,
+                    prototype_knn=api_server.prototype_knn,
+                    tag_embeddings=api_server.tag_embeddings_cache,
+                    config=api_server.config,
+                    fetch_lecturer_profile=None if args.skip_bios else api_server._fetch_lecturer_profile
+                )
+                # The chunk's embedding pass already did this work
+                ctx.seed('embedding', embedding)
+                ctx.seed('prototype_scores', lecture_scores)
+                ctx.seed('fast_scores', lecture_scores)
+                contexts[index] = ctx
+            
+            if args.mode in PACKED_REASONING_MODES:
+                seed_packed_reasoning(list(contexts.values()), args, llm_pool)
+        
+        def run(item) -> Dict:
+            (index, lecture), lecture_scores = item
+            try:
+                if args.mode == "fast":
+                    suggestions = api_server._fast_suggestions(lecture, catalog, lecture_scores)
+                else:
+                    suggestions = api_server._score_mode(contexts[index], args.mode, args.explain, args.max_llm_cost_usd)
+                return {'index': index, 'lecture_id': lecture['id'], 'suggestions': suggestions}
+            except Exception as e:
+                return {'index': index, 'lecture_id': lecture['id'], 'error': f"{type(e).__name__}: {e}"}
+        
+        items = zip(valid, scores)
+        results = llm_pool.map(run, items) if llm_pool else map(run, items)
+        for record in results:
+            records[record['index']] = record
+    
+    return [records[index] for index, _ in chunk]
+
+
+def load_catalog(args):
+    if args.labels:
+        with open(args.labels, encoding='utf-8') as f:
+            labels = json.load(f)
+        if isinstance(labels, dict):
+            labels = labels.get('labels', [])
+        return api_server._resolve_label_catalog(args.artifact_version, labels)
+    return api_server._resolve_label_catalog(args.artifact_version, [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tag a lecture catalog dump offline (resumable).")
+    parser.add_argument('input', help="Lectures file (.csv or .jsonl)")
+    parser.add_argument('-o', '--output', required=True, help="Results file (JSONL, appended to on resume)")
+    parser.add_argument('--labels', help="Labels JSON file (list, or {\"labels\": [...]})")
+    parser.add_argument('--artifact-version', default='unknown', help="Registered label set to use without --labels")
+    parser.add_argument('--mode', default='fast', choices=api_server.SCORING_MODES, help="Scoring mode (default: fast)")
+    parser.add_argument('--explain', default='none', help="Rationale level for LLM modes (default: none)")
+    parser.add_argument('--max-llm-cost-usd', type=float, default=None, help="Auto mode's per-lecture cost cap")
+    parser.add_argument('--chunk-size', type=int, default=512, help="Lectures per embedding pass and checkpoint")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Prototype scoring processes")
+    parser.add_argument('--llm-concurrency', type=int, default=4, help="Concurrent lectures in LLM modes")
+    parser.add_argument('--skip-bios', action='store_true', help="Do not look up lecturer bios in LLM modes")
+    parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and overwrite the output")
+    args = parser.parse_args()
+    
+    args.explain = api_server.normalize_explain(args.explain)
+    args.workers = max(1, args.workers)
+    
+    if not api_server.load_prototypes_from_db():
+        sys.exit("❌ No prototypes loaded - train first")
+    
+    catalog = load_catalog(args)
+    if catalog is None:
+        sys.exit("❌ No labels - pass --labels or a registered --artifact-version")
+    
+    checkpoint = load_checkpoint(args.output, args)
+    if checkpoint['rows_done']:
+        print(f"↻ Resuming after {checkpoint['rows_done']} lectures")
+    
+    # Drop anything written after the last checkpoint (a chunk cut short by the interruption)
+    with open(args.output, 'ab') as f:
+        f.truncate(checkpoint['output_bytes'])
+    
+    config = api_server.config
+    embeddings_gen = EmbeddingsGenerator(api_key=config.openai_api_key, model=config.embedding_model)
+    knn = api_server.prototype_knn
+    
+    started_at = time.time()
+    rows_at_start = checkpoint['rows_done']
+    
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(knn.tag_prototypes, knn.tag_thresholds, knn.tag_stats, api_server.tag_embeddings_cache)
+    ) as pool, ThreadPoolExecutor(max_workers=max(1, args.llm_concurrency), thread_name_prefix="bulk-llm") as llm_pool, \
+            open(args.output, 'ab') as out:
+        try:
+            for chunk in read_chunks(read_lectures(args.input), args.chunk_size, checkpoint['rows_done']):
+                records = score_chunk(chunk, catalog, args, embeddings_gen, pool, llm_pool if args.mode != "fast" else None)
+                
+                for record in records:
+                    out.write((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+                    checkpoint['failed' if 'error' in record else 'succeeded'] += 1
+                out.flush()
+                os.fsync(out.fileno())
+                
+                checkpoint['rows_done'] = chunk[-1][0] + 1
+                checkpoint['output_bytes'] = out.tell()
+                save_checkpoint(args.output, checkpoint)
+                
+                rate = (checkpoint['rows_done'] - rows_at_start) / max(time.time() - started_at, 1e-6)
+                print(f"  {checkpoint['rows_done']} lectures ({checkpoint['failed']} failed, {rate:.1f}/s)", flush=True)
+        except KeyboardInterrupt:
+            print(f"\n⏸  Interrupted after {checkpoint['rows_done']} lectures - rerun the same command to resume")
+            sys.exit(130)
+    
+    print(f"✅ Tagged {checkpoint['rows_done']} lectures ({checkpoint['succeeded']} ok, {checkpoint['failed']} failed) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Confidence-gated routing for the "auto" scoring mode.
+
+Prototype scores are compared with each tag's calibrated threshold
+(PrototypeKNN.tag_thresholds). When every tag is clearly above or clearly
+below its threshold, the prototype (fast) result is used as is. Only lectures
+with tags inside the margin band go to the reasoning model, with the
+ambiguous and confident tags as its candidates and under a per-request cost cap.
+"""
+
+import threading
+from typing import Any, Dict, List
+
+# Routing outcomes
+ROUTE_FAST = "fast"                        # Prototype scores were decisive
+ROUTE_LLM = "llm"                          # Ambiguous - reasoning call made
+ROUTE_COST_CAPPED = "cost_capped"          # Ambiguous, but the call would exceed the cost cap
+ROUTE_LLM_UNAVAILABLE = "llm_unavailable"  # Ambiguous, but the chat upstream is down
+
+
+def assess_margins(
+    scores: Dict[str, float],
+    thresholds: Dict[str, float],
+    margin: float
+) -> Dict[str, Any]:
+    """
+    Split tags by their distance from the calibrated threshold.
+
+    Args:
+        scores: tag_id -> raw prototype score
+        thresholds: tag_id -> calibrated threshold
+        margin: Half-width of the ambiguous band around each threshold
+
+    Returns:
+        Dict with confident (clearly above, best first), ambiguous (inside
+        the band, closest to the threshold first), min_margin (smallest
+        |score - threshold|) and needs_llm - true when some tag is ambiguous
+        or no tag is confidently above its threshold.
+    """
+    margins = {tag_id: score - thresholds[tag_id] for tag_id, score in scores.items()}
+    
+    confident = sorted((t for t, m in margins.items() if m >= margin), key=lambda t: -margins[t])
+    ambiguous = sorted((t for t, m in margins.items() if -margin < m < margin), key=lambda t: abs(margins[t]))
+    
+    return {
+        'confident': confident,
+        'ambiguous': ambiguous,
+        'min_margin': min((abs(m) for m in margins.values()), default=None),
+        'needs_llm': bool(ambiguous) or not confident
+    }
+
+
+class AutoRoutingStats:
+    """How often auto mode avoided the reasoning call, and why it did not."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, int] = {}
+        self._candidates = 0
+        self._estimated_cost_usd = 0.0
+    
+    def record(self, route: str, num_candidates: int = 0, estimated_cost_usd: float = 0.0) -> None:
+        with self._lock:
+            self._routes[route] = self._routes.get(route, 0) + 1
+            if route == ROUTE_LLM:
+                self._candidates += num_candidates
+                self._estimated_cost_usd += estimated_cost_usd
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = sum(self._routes.values())
+            llm_calls = self._routes.get(ROUTE_LLM, 0)
+            return {
+                'requests': requests,
+                'llm_calls': llm_calls,
+                'llm_avoided': requests - llm_calls,
+                'llm_avoided_rate': round((requests - llm_calls) / requests, 4) if requests else 0.0,
+                'routes': dict(self._routes),
+                'avg_llm_candidates': round(self._candidates / llm_calls, 1) if llm_calls else 0.0,
+                'estimated_llm_cost_usd': round(self._estimated_cost_usd, 4)
+            }
+
+
+# Process-wide
+auto_routing_stats = AutoRoutingStats()
+
+
+def candidate_tags_for(decision: Dict[str, Any], tags: List[Dict]) -> List[Dict]:
+    """Scorer-format tags the reasoning call should consider (confident + ambiguous)."""
+    candidate_ids = set(decision['confident']) | set(decision['ambiguous'])
+    return [tag for tag in tags if tag['tag_id'] in candidate_ids]
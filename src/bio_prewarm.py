@@ -0,0 +1,168 @@
+"""
+Bulk pre-warming of the lecturer bio cache.
+
+Collects the distinct lecturers from a training dataset (or a supplied list),
+checks lecturer_bios for all of them with one query and searches the missing
+ones through a bounded worker pool under a shared rate limit, so interactive
+requests find their lecturer bios already cached.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.lecturer_search import LecturerSearchService, lecturer_cache_key
+from src.logging_utils import StructuredLogger
+
+logger = StructuredLogger(__name__)
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate_per_sec apart across all threads."""
+    
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+    
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def collect_lecturers(lectures: List[Dict]) -> List[Dict[str, Optional[str]]]:
+    """
+    Distinct lecturers in a list of lectures (training or v2 format).
+
+    Keeps the first lecture description seen per lecturer so the searched
+    bio can be validated against it.
+    """
+    lecturers = {}
+    for lecture in lectures:
+        lecturer_id = lecture.get('lecturer_id') or None
+        lecturer_name = lecture.get('lecturer_name') or None
+        if not (lecturer_id or lecturer_name):
+            continue
+        
+        key = lecturer_cache_key(lecturer_id, lecturer_name)
+        if key not in lecturers:
+            lecturers[key] = {
+                'lecturer_id': lecturer_id,
+                'lecturer_name': lecturer_name,
+                'lecture_description': lecture.get('lecture_description') or lecture.get('description') or None
+            }
+        elif lecturer_name and not lecturers[key]['lecturer_name']:
+            lecturers[key]['lecturer_name'] = lecturer_name
+    
+    return list(lecturers.values())
+
+
+class BioPrewarmJob:
+    """One pre-warm run; progress() can be polled while run() executes."""
+    
+    def __init__(
+        self,
+        lecturers: List[Dict[str, Optional[str]]],
+        max_workers: int = 4,
+        rate_per_sec: float = 2.0,
+        source: str = "list"
+    ):
+        self.lecturers = lecturers
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(rate_per_sec)
+        self.source = source
+        
+        self._lock = threading.Lock()
+        self._progress: Dict[str, Any] = {
+            'status': 'pending',
+            'source': source,
+            'total': len(lecturers),
+            'already_cached': 0,
+            'to_fetch': 0,
+            'fetched': 0,
+            'found': 0,
+            'not_found': 0,
+            'skipped_no_name': 0,
+            'failed': 0,
+            'started_at': None,
+            'finished_at': None
+        }
+    
+    def progress(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._progress)
+    
+    @property
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._progress['status'] in ('pending', 'running')
+    
+    def _update(self, **counts) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                self._progress[key] += value
+    
+    def run(self) -> Dict[str, Any]:
+        """Check the cache in bulk, then search all missing bios."""
+        with self._lock:
+            self._progress['status'] = 'running'
+            self._progress['started_at'] = datetime.now().isoformat()
+        
+        search_service = LecturerSearchService()
+        
+        try:
+            cached = search_service.get_many_from_cache(self.lecturers)
+            
+            missing = []
+            for lecturer in self.lecturers:
+                if lecturer_cache_key(lecturer['lecturer_id'], lecturer['lecturer_name']) in cached:
+                    continue
+                if not lecturer['lecturer_name']:
+                    self._update(skipped_no_name=1)
+                    continue
+                missing.append(lecturer)
+            
+            self._update(already_cached=len(cached), to_fetch=len(missing))
+            logger.info(
+                "Bio pre-warm started",
+                total=len(self.lecturers),
+                already_cached=len(cached),
+                to_fetch=len(missing)
+            )
+            
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bio-prewarm") as pool:
+                list(pool.map(lambda lecturer: self._fetch_one(search_service, lecturer), missing))
+            
+            status = 'completed'
+        
+        except Exception as e:
+            logger.error(f"Bio pre-warm failed: {e}")
+            status = 'failed'
+        
+        with self._lock:
+            self._progress['status'] = status
+            self._progress['finished_at'] = datetime.now().isoformat()
+        
+        logger.info("Bio pre-warm finished", **self.progress())
+        return self.progress()
+    
+    def _fetch_one(self, search_service: LecturerSearchService, lecturer: Dict[str, Optional[str]]) -> None:
+        self.rate_limiter.acquire()
+        try:
+            bio = search_service.get_lecturer_profile(
+                lecturer_id=lecturer['lecturer_id'],
+                lecturer_name=lecturer['lecturer_name'],
+                lecture_description=lecturer['lecture_description']
+            )
+            self._update(fetched=1, found=1 if bio else 0, not_found=0 if bio else 1)
+        except Exception as e:
+            logger.warning(f"Bio pre-warm failed for {lecturer['lecturer_name']}: {e}")
+            self._update(failed=1)
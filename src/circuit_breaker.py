@@ -0,0 +1,224 @@
+"""
+Circuit breakers for upstream services (embeddings, chat completions, bio search).
+
+Each breaker tracks the outcome of recent calls. When the share of failed or
+too-slow calls crosses a threshold it opens and calls fail fast with
+CircuitOpenError instead of waiting for the upstream to time out. After a
+cool-down it lets a few probe calls through (half-open); a successful probe
+closes it again, a failed one re-opens it.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.deadline import current_deadline
+from src.logging_utils import StructuredLogger
+
+logger = StructuredLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Failure-rate and latency based breaker for one upstream."""
+    
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_ms: Optional[float] = None,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1
+    ):
+        """
+        Args:
+            name: Upstream name used in logs, /health and /metrics
+            failure_rate_threshold: Open when this share of recent calls failed or was slow
+            slow_call_ms: Calls slower than this count as failures (None = latency ignored)
+            window_size: Number of recent calls the rate is computed over
+            min_calls: Calls needed in the window before the breaker can open
+            open_seconds: Cool-down before probing a tripped upstream again
+            half_open_probes: Concurrent probe calls allowed while half-open
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_s = slow_call_ms / 1000.0 if slow_call_ms else None
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)  # "ok", "failed" or "slow"
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        
+        self._calls = 0
+        self._failures = 0
+        self._slow_calls = 0
+        self._rejected = 0
+        self._times_opened = 0
+    
+    def _current_state(self) -> str:
+        """State with the open -> half-open transition applied (lock held)."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+            logger.info(f"Circuit breaker '{self.name}' half-open, probing upstream")
+        return self._state
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+    
+    def available(self) -> bool:
+        """Whether a call would currently be let through (no side effects)."""
+        with self._lock:
+            state = self._current_state()
+            return state == CLOSED or (state == HALF_OPEN and self._probes_in_flight < self.half_open_probes)
+    
+    def _acquire(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+    
+    def _open(self, reason: str) -> None:
+        """Trip the breaker (lock held)."""
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        logger.warning(f"Circuit breaker '{self.name}' opened", reason=reason, open_seconds=self.open_seconds)
+    
+    def _record(self, outcome: Optional[str]) -> None:
+        """Record a call outcome; None releases a probe without counting the call."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if outcome is None:
+                return
+            
+            self._calls += 1
+            if outcome == "failed":
+                self._failures += 1
+            elif outcome == "slow":
+                self._slow_calls += 1
+            
+            if self._state == HALF_OPEN:
+                if outcome == "ok":
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"Circuit breaker '{self.name}' closed, upstream recovered")
+                else:
+                    self._open(f"probe {outcome}")
+                return
+            
+            self._outcomes.append(outcome)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                bad = sum(1 for o in self._outcomes if o != "ok")
+                if bad / len(self._outcomes) >= self.failure_rate_threshold:
+                    self._open(f"{bad}/{len(self._outcomes)} recent calls failed or slow")
+    
+    def _outcome(self, duration_s: float, error: Optional[BaseException]) -> Optional[str]:
+        if error is not None:
+            # Timeouts caused by the request's own deadline say nothing about the upstream
+            deadline = current_deadline()
+            if deadline is not None and deadline.expired:
+                return None
+            return "failed"
+        if self.slow_call_s is not None and duration_s > self.slow_call_s:
+            return "slow"
+        return "ok"
+    
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run fn() through the breaker (raises CircuitOpenError while open)."""
+        if not self._acquire():
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open")
+        
+        start = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            self._record(self._outcome(time.monotonic() - start, e))
+            raise
+        except BaseException:
+            # Cancelled (e.g. a losing hedge): not an upstream outcome
+            self._record(None)
+            raise
+        self._record(self._outcome(time.monotonic() - start, None))
+        return result
+    
+    async def acall(self, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of call()."""
+        if not self._acquire():
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open")
+        
+        start = time.monotonic()
+        try:
+            result = await coro_fn()
+        except Exception as e:
+            self._record(self._outcome(time.monotonic() - start, e))
+            raise
+        except BaseException:
+            # Cancelled (e.g. a losing hedge): not an upstream outcome
+            self._record(None)
+            raise
+        self._record(self._outcome(time.monotonic() - start, None))
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            return {
+                'name': self.name,
+                'state': state,
+                'calls': self._calls,
+                'failures': self._failures,
+                'slow_calls': self._slow_calls,
+                'rejected': self._rejected,
+                'times_opened': self._times_opened,
+                'window_bad_rate': round(
+                    sum(1 for o in self._outcomes if o != "ok") / len(self._outcomes), 4
+                ) if self._outcomes else 0.0,
+                'open_for_s': round(max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)), 1)
+                if state == OPEN else 0.0
+            }
+
+
+def _circuit_breaker(name: str, default_slow_ms: str) -> CircuitBreaker:
+    prefix = f"CB_{name.upper()}"
+    return CircuitBreaker(
+        name=name,
+        failure_rate_threshold=float(os.getenv('CB_FAILURE_RATE', '0.5')),
+        slow_call_ms=float(os.getenv(f'{prefix}_SLOW_MS', default_slow_ms)),
+        window_size=int(os.getenv('CB_WINDOW_SIZE', '20')),
+        min_calls=int(os.getenv('CB_MIN_CALLS', '5')),
+        open_seconds=float(os.getenv('CB_OPEN_SECONDS', '30'))
+    )
+
+
+# Process-wide, one per upstream
+embeddings_breaker = _circuit_breaker("embeddings", '5000')
+chat_breaker = _circuit_breaker("chat", '30000')
+bio_search_breaker = _circuit_breaker("bio_search", '20000')
+
+circuit_breakers = {
+    breaker.name: breaker for breaker in (embeddings_breaker, chat_breaker, bio_search_breaker)
+}
@@ -13,9 +13,36 @@ class Config:
         # Feature flags
         self.use_llm = kwargs.get('use_llm', os.getenv("USE_LLM", "true").lower() == "true")
         
-        # Scoring mode: "ensemble" (reasoning + prototype), "full_quality" (prototype + arbiter), "reasoning" (pure LLM), "fast" (prototype only)
+        # Scoring mode: "ensemble" (reasoning + prototype), "full_quality" (prototype + arbiter), "reasoning" (pure LLM), "fast" (prototype only),
+        # "auto" (fast when prototype scores are decisive, ensemble for ambiguous lectures)
         self.scoring_mode = kwargs.get('scoring_mode', os.getenv("SCORING_MODE", "ensemble"))
         
+        # Auto mode: a label within AUTO_MARGIN of its calibrated threshold makes the lecture ambiguous;
+        # the reasoning call is skipped when its estimated cost exceeds AUTO_MAX_LLM_COST_USD
+        self.auto_margin = float(kwargs.get('auto_margin', os.getenv("AUTO_MARGIN", "0.05")))
+        self.auto_max_llm_cost_usd = float(kwargs.get('auto_max_llm_cost_usd', os.getenv("AUTO_MAX_LLM_COST_USD", "0.02")))
+        
+        # Per-request latency deadline (ms, 0 = none); overridable by X-Request-Deadline-Ms / deadline_ms.
+        # LLM stages that cannot finish in time fall back to the prototype-only (fast) result.
+        self.request_deadline_ms = float(kwargs.get('request_deadline_ms', os.getenv("REQUEST_DEADLINE_MS", "15000")))
+        # Budget kept back for the fast fallback (embedding call + prototype pass)
+        self.deadline_fast_reserve_ms = float(kwargs.get('deadline_fast_reserve_ms', os.getenv("DEADLINE_FAST_RESERVE_MS", "800")))
+        # Threads running deadline-bound LLM stages, i.e. the cap on concurrent LLM-mode requests with a
+        # deadline. Size it to the server's request concurrency (Flask's threaded server is unbounded;
+        # gunicorn: workers x threads): requests beyond it queue and spend their budget waiting.
+        self.deadline_workers = int(kwargs.get('deadline_workers', os.getenv("DEADLINE_WORKERS", "64")))
+        
+        # Hedge reasoning/arbiter LLM calls slower than LLM_HEDGE_PERCENTILE of recent calls
+        # (extra calls capped at LLM_HEDGE_MAX_RATIO of all calls, see src/llm_hedging.py)
+        self.llm_hedging = kwargs.get('llm_hedging', os.getenv("LLM_HEDGING", "false").lower() == "true")
+        
+        # Shadow scoring: for SHADOW_SAMPLE_RATE of requests, also run SHADOW_MODES (comma-separated)
+        # in the background after responding, and record agreement/cost in shadow_results
+        self.shadow_modes = kwargs.get('shadow_modes', [m.strip() for m in os.getenv("SHADOW_MODES", "").split(",") if m.strip()])
+        self.shadow_sample_rate = float(kwargs.get('shadow_sample_rate', os.getenv("SHADOW_SAMPLE_RATE", "0.0")))
+        self.shadow_workers = int(kwargs.get('shadow_workers', os.getenv("SHADOW_WORKERS", "1")))
+        self.shadow_queue_size = int(kwargs.get('shadow_queue_size', os.getenv("SHADOW_QUEUE_SIZE", "100")))
+        
         self.use_shortlist = kwargs.get('use_shortlist', os.getenv("USE_SHORTLIST", "true").lower() == "true")
         self.shortlist_fallback = kwargs.get('shortlist_fallback', os.getenv("SHORTLIST_FALLBACK", "true").lower() == "true")
         self.test_mode = kwargs.get('test_mode', os.getenv("TEST_MODE", "false").lower() == "true")
@@ -41,6 +68,16 @@ class Config:
         self.llm_borderline_lower = 0.50
         self.llm_borderline_upper = 0.80
         
+        # Constrain reasoning output to an enum of the exact tag names (structured outputs)
+        self.constrained_tag_output = kwargs.get('constrained_tag_output', os.getenv("CONSTRAINED_TAG_OUTPUT", "true").lower() == "true")
+        
+        # Send tags as short codes (T12) and get back codes + confidences only (no rationales)
+        self.compact_tag_codes = kwargs.get('compact_tag_codes', os.getenv("COMPACT_TAG_CODES", "false").lower() == "true")
+        
+        # Default rationale level for reasoning output: "none", "top_k" or "full" (overridable per request)
+        self.default_explain = kwargs.get('default_explain', os.getenv("DEFAULT_EXPLAIN", "full"))
+        self.explain_top_k = int(kwargs.get('explain_top_k', os.getenv("EXPLAIN_TOP_K", "3")))
+        
         # Reasoning mode calibration (LLMs tend to be over-confident)
         self.reasoning_confidence_scale = float(kwargs.get('reasoning_confidence_scale', 
                                                           os.getenv("REASONING_CONFIDENCE_SCALE", "0.85")))
@@ -72,13 +109,40 @@ class Config:
         self.min_k_tags = 3
         self.max_llm_candidates = 30
         
+        # Fast-mode micro-batching (coalesce concurrent requests into one embedding call + matrix pass)
+        self.fast_batching = kwargs.get('fast_batching', os.getenv("FAST_BATCHING", "true").lower() == "true")
+        self.fast_batch_max_size = int(kwargs.get('fast_batch_max_size', os.getenv("FAST_BATCH_MAX_SIZE", "32")))
+        self.fast_batch_max_wait_ms = float(kwargs.get('fast_batch_max_wait_ms', os.getenv("FAST_BATCH_MAX_WAIT_MS", "10")))
+        
+        # full_quality arbiter batching (borderline tags of concurrent lectures reviewed in one LLM call)
+        self.arbiter_batching = kwargs.get('arbiter_batching', os.getenv("ARBITER_BATCHING", "true").lower() == "true")
+        self.arbiter_batch_max_size = int(kwargs.get('arbiter_batch_max_size', os.getenv("ARBITER_BATCH_MAX_SIZE", "8")))
+        self.arbiter_batch_max_wait_ms = float(kwargs.get('arbiter_batch_max_wait_ms', os.getenv("ARBITER_BATCH_MAX_WAIT_MS", "50")))
+        
+        # /suggest-tags-batch: lectures scored in parallel per streamed request (request may lower it, not exceed the max)
+        self.batch_stream_concurrency = int(kwargs.get('batch_stream_concurrency', os.getenv("BATCH_STREAM_CONCURRENCY", "4")))
+        self.batch_stream_max_concurrency = int(kwargs.get('batch_stream_max_concurrency', os.getenv("BATCH_STREAM_MAX_CONCURRENCY", "16")))
+        
+        # Lecturer bio pre-warming (bounded pool + shared rate limit for bio searches)
+        self.bio_prewarm_workers = int(kwargs.get('bio_prewarm_workers', os.getenv("BIO_PREWARM_WORKERS", "4")))
+        self.bio_prewarm_rate_per_sec = float(kwargs.get('bio_prewarm_rate_per_sec', os.getenv("BIO_PREWARM_RATE_PER_SEC", "2")))
+        self.bio_prewarm_after_training = kwargs.get('bio_prewarm_after_training', os.getenv("BIO_PREWARM_AFTER_TRAINING", "true").lower() == "true")
+        
         # Batch settings
         self.batch_size_embeddings = 512
-        self.batch_size_llm = 1
+        # Lectures packed into one reasoning call by ReasoningScorer.score_batch (1 = no packing)
+        self.batch_size_llm = int(kwargs.get('batch_size_llm', os.getenv("BATCH_SIZE_LLM", "5")))
         
         # Training settings
         self.train_holdout_split = 0.8
     
+        # /get-data-and-train: external dataset source (conditional, paginated, retried per page)
+        self.train_data_api_url = kwargs.get('train_data_api_url', os.getenv("TRAIN_DATA_API_URL", "https://hallo-tags-manager.replit.app/v2/train-data"))
+        self.train_data_page_size = int(kwargs.get('train_data_page_size', os.getenv("TRAIN_DATA_PAGE_SIZE", "0")))
+        self.train_data_max_retries = int(kwargs.get('train_data_max_retries', os.getenv("TRAIN_DATA_MAX_RETRIES", "3")))
+        self.train_data_retry_backoff_seconds = float(kwargs.get('train_data_retry_backoff_seconds', os.getenv("TRAIN_DATA_RETRY_BACKOFF_SECONDS", "1.0")))
+        self.train_data_timeout_seconds = float(kwargs.get('train_data_timeout_seconds', os.getenv("TRAIN_DATA_TIMEOUT_SECONDS", "30")))
+    
     @classmethod
     def from_env(cls) -> "Config":
         return cls()
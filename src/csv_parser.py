@@ -2,124 +2,185 @@
 CSV parser for training data uploads.
 
 Handles lectures.csv, labels.csv, and lecture_labels.csv junction table.
+
+Uploads are read as decoded text streams row by row (never as one byte
+string), the junction table is kept as compact label codes per lecture, and
+lectures are emitted directly in train_from_data's format. Malformed files
+(missing columns, rows with the wrong number of fields, invalid UTF-8) raise
+CSVFormatError at the offending line.
 """
 
 import csv
 import io
 import logging
-from typing import Dict, List, Any
+from array import array
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+CSVSource = Union[bytes, BinaryIO, io.TextIOBase]
+
+
+class CSVFormatError(ValueError):
+    """A training CSV is missing required columns or has a malformed row."""
 
-def parse_csv_training_data(
-    lectures_csv: bytes,
-    labels_csv: bytes,
-    lecture_labels_csv: bytes
+
+def parse_csv_training_stream(
+    lectures_csv: CSVSource,
+    labels_csv: CSVSource,
+    lecture_labels_csv: CSVSource
 ) -> Dict[str, Any]:
     """
-    Parse 3 CSV files and transform to training format.
+    Parse the 3 CSV uploads into train_from_data's input format.
     
     Args:
-        lectures_csv: Lectures CSV file content
-        labels_csv: Labels CSV file content
-        lecture_labels_csv: Junction table CSV content
+        lectures_csv: Lectures CSV (binary/text file object or bytes)
+        labels_csv: Labels CSV
+        lecture_labels_csv: Junction table CSV
         
     Returns:
-        Training data dict with 'lectures' and 'labels' keys
+        {'lectures': [{'id', 'lecture_title', 'lecture_description',
+        'lecture_tag_ids'}], 'tags': {tag_id: {...}}} - only lectures with
+        at least one label, each lecture id once (first row wins)
+
+    Raises:
+        CSVFormatError: on a missing column or malformed row
     """
     # Parse labels first
-    labels_dict = _parse_labels_csv(labels_csv)
+    tags = _parse_labels_csv(labels_csv)
     
-    # Parse lecture-label mappings
-    lecture_label_map = _parse_lecture_labels_csv(lecture_labels_csv)
+    # Parse lecture-label mappings (label ids as integer codes into label_ids)
+    label_ids, lecture_label_codes = _parse_lecture_labels_csv(lecture_labels_csv)
     
     # Parse lectures and attach their labels
-    lectures_list = _parse_lectures_csv(lectures_csv, lecture_label_map)
+    lectures = list(_iter_training_lectures(lectures_csv, label_ids, lecture_label_codes))
     
-    logger.info(f"Parsed {len(lectures_list)} lectures with {len(labels_dict)} labels")
+    logger.info(f"Parsed {len(lectures)} lectures with {len(tags)} labels")
     
-    # Convert to training format expected by train_from_data
-    # (uses 'labels' list format which will be converted in /train endpoint)
     return {
-        'lectures': lectures_list,
-        'labels': list(labels_dict.values())
+        'lectures': lectures,
+        'tags': tags
     }
 
 
-def _parse_labels_csv(csv_content: bytes) -> Dict[str, Dict]:
-    """Parse labels CSV into dict keyed by label ID."""
-    labels = {}
+def _text_stream(source: CSVSource) -> io.TextIOBase:
+    """Incrementally decoded text view of an upload (UTF-8, BOM stripped)."""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if isinstance(source, io.TextIOBase):
+        return source
+    return io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+
+
+def _iter_rows(source: CSVSource, file_name: str, required: Tuple[Tuple[str, ...], ...]) -> Iterator[Dict[str, str]]:
+    """
+    Rows of a CSV upload as dicts, validated as they are read.
+
+    Args:
+        required: Column groups of which at least one column must be present
+            (e.g. ('airtable_id', 'id'))
+    """
+    stream = _text_stream(source)
+    try:
+        reader = csv.DictReader(stream)
+        try:
+            fieldnames = reader.fieldnames or []
+            for columns in required:
+                if not any(column in fieldnames for column in columns):
+                    raise CSVFormatError(f"{file_name}: missing column {' or '.join(columns)}")
     
-    csv_file = io.StringIO(csv_content.decode('utf-8'))
-    reader = csv.DictReader(csv_file)
+            for row in reader:
+                # Extra fields land under None, missing ones have None values
+                if None in row or None in row.values():
+                    raise CSVFormatError(
+                        f"{file_name}: line {reader.line_num}: expected {len(fieldnames)} fields"
+                    )
+                yield row
+        except UnicodeDecodeError as e:
+            # Decoding runs ahead of the parser in blocks, so there is no exact line to report
+            raise CSVFormatError(f"{file_name}: not valid UTF-8 ({e.reason})")
+        except csv.Error as e:
+            raise CSVFormatError(f"{file_name}: line {reader.line_num}: {e}")
+    finally:
+        if isinstance(stream, io.TextIOWrapper) and stream is not source:
+            stream.detach()  # Leave the upload open for its owner
+
+
+def _parse_labels_csv(source: CSVSource) -> Dict[str, Dict]:
+    """Parse labels CSV into a tags dict keyed by label ID."""
+    tags = {}
     
-    for row in reader:
+    for row in _iter_rows(source, "labels.csv", (('airtable_id', 'id'),)):
         label_id = row.get('airtable_id') or row.get('id')
         if not label_id:
             continue
             
-        labels[label_id] = {
-            'id': label_id,
+        tags[label_id] = {
+            'tag_id': label_id,
             'name_he': row.get('name', ''),
-            'category': _normalize_category(row.get('category', '')),
             'synonyms_he': '',
-            'active': True
+            'category': _normalize_category(row.get('category', ''))
         }
     
-    return labels
+    return tags
 
 
-def _parse_lecture_labels_csv(csv_content: bytes) -> Dict[str, List[str]]:
-    """Parse junction table into dict mapping lecture_id -> [label_ids]."""
-    lecture_labels = {}
+def _parse_lecture_labels_csv(source: CSVSource) -> Tuple[List[str], Dict[str, array]]:
+    """
+    Parse junction table into lecture_id -> label codes.
     
-    csv_file = io.StringIO(csv_content.decode('utf-8'))
-    reader = csv.DictReader(csv_file)
+    Returns:
+        (label_ids, lecture_label_codes) - codes index into label_ids, so
+        each label id string is stored once however many lectures use it
+    """
+    label_ids: List[str] = []
+    label_codes: Dict[str, int] = {}
+    lecture_label_codes: Dict[str, array] = {}
     
-    for row in reader:
-        lecture_id = row.get('lecture_id')
-        label_id = row.get('label_id')
+    for row in _iter_rows(source, "lecture_labels.csv", (('lecture_id',), ('label_id',))):
+        lecture_id = row['lecture_id']
+        label_id = row['label_id']
         
-        if lecture_id and label_id:
-            if lecture_id not in lecture_labels:
-                lecture_labels[lecture_id] = []
-            lecture_labels[lecture_id].append(label_id)
+        if not lecture_id or not label_id:
+            continue
     
-    return lecture_labels
+        code = label_codes.get(label_id)
+        if code is None:
+            code = label_codes[label_id] = len(label_ids)
+            label_ids.append(label_id)
+        
+        codes = lecture_label_codes.get(lecture_id)
+        if codes is None:
+            codes = lecture_label_codes[lecture_id] = array('I')
+        codes.append(code)
+    
+    return label_ids, lecture_label_codes
 
 
-def _parse_lectures_csv(
-    csv_content: bytes,
-    lecture_label_map: Dict[str, List[str]]
-) -> List[Dict]:
-    """Parse lectures CSV and attach labels from junction table."""
-    lectures = []
-    
-    csv_file = io.StringIO(csv_content.decode('utf-8'))
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
+def _iter_training_lectures(
+    source: CSVSource,
+    label_ids: List[str],
+    lecture_label_codes: Dict[str, array]
+) -> Iterator[Dict]:
+    """Lectures CSV rows with their labels attached, in train_from_data's format."""
+    for row in _iter_rows(source, "lectures.csv", (('airtable_id', 'id'),)):
         lecture_id = row.get('airtable_id') or row.get('id')
         if not lecture_id:
             continue
         
-        # Get labels for this lecture
-        label_ids = lecture_label_map.get(lecture_id, [])
+        # Popped so the junction entry is freed as its lecture is built (and a repeated row gets no labels)
+        codes = lecture_label_codes.pop(lecture_id, None)
         
         # Skip lectures with no labels (can't train on them)
-        if not label_ids:
+        if not codes:
             continue
         
-        lectures.append({
+        yield {
             'id': lecture_id,
-            'title': row.get('title', ''),
-            'description': row.get('description', ''),
-            'lecturer_id': row.get('lecturer_id', ''),
-            'label_ids': label_ids
-        })
-    
-    return lectures
+            'lecture_title': row.get('title', ''),
+            'lecture_description': row.get('description', ''),
+            'lecture_tag_ids': [label_ids[code] for code in codes]
+        }
 
 
 def _normalize_category(category: str) -> str:
@@ -0,0 +1,125 @@
+"""
+Per-request latency deadlines.
+
+A Deadline is the time budget of one request. It is carried in a ContextVar
+(like the request context in logging_utils), so code below the router can
+check the remaining budget between stages and bound LLM call timeouts by it.
+It also records whether the request had to degrade to a cheaper result.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised by check_deadline() when a stage starts after the budget ran out."""
+
+
+class Deadline:
+    """Monotonic time budget for one request."""
+    
+    def __init__(self, budget_ms: float):
+        self.budget_ms = float(budget_ms)
+        self._expires_at = time.monotonic() + self.budget_ms / 1000.0
+        self.degraded = False
+        self.degraded_reason: Optional[str] = None
+        self.degraded_stage: Optional[str] = None
+    
+    def remaining(self) -> float:
+        """Remaining budget in seconds (0 when expired)."""
+        return max(0.0, self._expires_at - time.monotonic())
+    
+    def remaining_ms(self) -> float:
+        return self.remaining() * 1000.0
+    
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+    
+    def mark_degraded(self, reason: str, stage: Optional[str] = None) -> None:
+        self.degraded = True
+        self.degraded_reason = reason
+        self.degraded_stage = stage
+
+
+def parse_deadline_ms(value: Any) -> Optional[float]:
+    """Parse a deadline from a header/body value; None or <= 0 means no deadline."""
+    if value is None or value == '':
+        return None
+    
+    try:
+        deadline_ms = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid deadline_ms '{value}': expected milliseconds as a number")
+    
+    return deadline_ms if deadline_ms > 0 else None
+
+
+_deadline_var: ContextVar[Optional[Deadline]] = ContextVar('request_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the current request, if any."""
+    return _deadline_var.get()
+
+
+@contextmanager
+def request_deadline(deadline: Optional[Deadline]):
+    """Make `deadline` the current request's deadline for the duration of the block."""
+    token = _deadline_var.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline_var.reset(token)
+
+
+def check_deadline(stage: str) -> None:
+    """Raise DeadlineExceeded if the current request has no budget left for `stage`."""
+    deadline = current_deadline()
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceeded(f"Deadline of {deadline.budget_ms:.0f}ms exceeded before stage '{stage}'")
+
+
+def llm_request_options(min_timeout_s: float = 0.5) -> Dict[str, float]:
+    """
+    Extra kwargs for OpenAI calls: a timeout bounded by the remaining budget.
+
+    Empty without a deadline, so the client's default timeout applies.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return {}
+    return {'timeout': max(deadline.remaining(), min_timeout_s)}
+
+
+class DeadlineStats:
+    """Counts of deadline-bound requests and how many degraded, by reason."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._degraded: Dict[str, int] = {}
+    
+    def record(self, deadline: Deadline) -> None:
+        with self._lock:
+            self._requests += 1
+            if deadline.degraded:
+                reason = deadline.degraded_reason or 'unknown'
+                self._degraded[reason] = self._degraded.get(reason, 0) + 1
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            degraded = sum(self._degraded.values())
+            return {
+                'requests': self._requests,
+                'degraded': degraded,
+                'degraded_rate': round(degraded / self._requests, 4) if self._requests else 0.0,
+                'degraded_by_reason': dict(self._degraded)
+            }
+
+
+# Process-wide
+deadline_stats = DeadlineStats()
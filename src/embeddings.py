@@ -1,18 +1,41 @@
 import numpy as np
-from openai import OpenAI
-from typing import List, Dict
+from openai import OpenAI, AsyncOpenAI
+from typing import List, Dict, Optional
 import logging
 import time
+from src.circuit_breaker import CircuitBreaker
 from src.logging_utils import StructuredLogger, track_operation
+from src.openai_clients import get_async_client
 
 logger = StructuredLogger(__name__)
 
 
 class EmbeddingsGenerator:
-    def __init__(self, api_key: str, model: str = "text-embedding-3-large", batch_size: int = 512):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-large",
+        batch_size: int = 512,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
         self.model = model
         self.batch_size = batch_size
+        self.circuit_breaker = circuit_breaker  # Request-time callers fail fast while embeddings are down
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Process-wide AsyncOpenAI client (created on first async call, not per generator)."""
+        return get_async_client(self.api_key)
+    
+    def _create(self, batch: List[str]):
+        create = lambda: self.client.embeddings.create(input=batch, model=self.model)
+        return self.circuit_breaker.call(create) if self.circuit_breaker else create()
+    
+    async def _acreate(self, batch: List[str]):
+        create = lambda: self.async_client.embeddings.create(input=batch, model=self.model)
+        return await (self.circuit_breaker.acall(create) if self.circuit_breaker else create())
     
     def _estimate_tokens(self, texts: List[str]) -> int:
         """Estimate tokens from text (rough approximation: 1 token ~ 4 chars)."""
@@ -39,10 +62,7 @@ class EmbeddingsGenerator:
             
             try:
                 with track_operation(f"embedding_batch_{batch_num}", logger, batch_size=len(batch)):
-                    response = self.client.embeddings.create(
-                        input=batch,
-                        model=self.model
-                    )
+                    response = self._create(batch)
                     
                     batch_embeddings = [item.embedding for item in response.data]
                     all_embeddings.extend(batch_embeddings)
@@ -101,7 +121,34 @@ class EmbeddingsGenerator:
         description = description or ""
         return f"[כותרת] {title}\n[תיאור] {description}"
     
-    def generate_lecture_embeddings(self, lectures: List[Dict]) -> Dict[int, np.ndarray]:
+    async def agenerate_embeddings(self, texts: List[str], desc: str = "items") -> np.ndarray:
+        """Async variant of generate_embeddings (AsyncOpenAI), meant for request-time inputs."""
+        all_embeddings = []
+        
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i:i + self.batch_size]
+            
+            with track_operation("embedding_batch_async", logger, batch_size=len(batch), description=desc):
+                response = await self._acreate(batch)
+            
+            all_embeddings.extend(item.embedding for item in response.data)
+            
+            if hasattr(response, 'usage') and response.usage:
+                tokens_used = response.usage.total_tokens
+            else:
+                tokens_used = self._estimate_tokens(batch)
+            
+            cost_per_million = 0.13 if 'large' in self.model else 0.02
+            logger.info(
+                f"Embedding batch completed",
+                num_embeddings=len(batch),
+                tokens=tokens_used,
+                estimated_cost_usd=round((tokens_used / 1_000_000) * cost_per_million, 6)
+            )
+        
+        return np.array(all_embeddings, dtype=np.float32)
+    
+    def _lecture_texts(self, lectures: List[Dict]) -> tuple[List, List[str]]:
         lecture_texts = []
         lecture_ids = []
         
@@ -113,10 +160,22 @@ class EmbeddingsGenerator:
             lecture_texts.append(text)
             lecture_ids.append(lecture['id'])
         
+        return lecture_ids, lecture_texts
+    
+    def generate_lecture_embeddings(self, lectures: List[Dict]) -> Dict[int, np.ndarray]:
+        lecture_ids, lecture_texts = self._lecture_texts(lectures)
+        
         embeddings = self.generate_embeddings(lecture_texts, "lectures")
         
         return {lecture_id: embeddings[i] for i, lecture_id in enumerate(lecture_ids)}
     
+    async def agenerate_lecture_embeddings(self, lectures: List[Dict]) -> Dict[int, np.ndarray]:
+        lecture_ids, lecture_texts = self._lecture_texts(lectures)
+        
+        embeddings = await self.agenerate_embeddings(lecture_texts, "lectures")
+        
+        return {lecture_id: embeddings[i] for i, lecture_id in enumerate(lecture_ids)}
+    
     def generate_tag_embeddings(self, tag_label_texts: Dict[str, str]) -> Dict[str, np.ndarray]:
         tag_ids = list(tag_label_texts.keys())
         tag_texts = [tag_label_texts[tag_id] for tag_id in tag_ids]
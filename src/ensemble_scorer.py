@@ -2,6 +2,8 @@ import logging
 from typing import List, Dict, Optional
 import numpy as np
 
+from src.label_catalog import LabelCatalog
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,22 +37,66 @@ class EnsembleScorer:
         all_tags: List[Dict],
         lecture_embedding: np.ndarray,
         tag_embeddings: Dict[str, np.ndarray],
-        lecturer_profile: Optional[str] = None
+        lecturer_profile: Optional[str] = None,
+        catalog: Optional[LabelCatalog] = None,
+        candidate_tags: Optional[List[Dict]] = None,
+        prototype_scores: Optional[Dict[str, float]] = None,
+        reasoning_suggestions: Optional[List[Dict]] = None
     ) -> List[Dict]:
-        lecture_id = lecture.get('id')
+        # Precomputed scores/suggestions (e.g. shared with other modes of the request) skip their call
+        if reasoning_suggestions is None:
+            reasoning_suggestions = self.reasoning_scorer.score_lecture(
+                lecture,
+                all_tags,
+                lecturer_profile,
+                candidate_tags,
+                catalog=catalog
+            )
         
-        reasoning_suggestions = self.reasoning_scorer.score_lecture(
-            lecture,
-            all_tags,
-            lecturer_profile,
-            None
-        )
+        if prototype_scores is None:
+            prototype_scores = self.prototype_knn.score_lecture(
+                lecture_embedding,
+                tag_embeddings
+            )
         
-        prototype_scores = self.prototype_knn.score_lecture(
-            lecture_embedding,
-            tag_embeddings
-        )
+        return self._combine(lecture.get('id'), reasoning_suggestions, prototype_scores)
+    
+    async def ascore_lecture(
+        self,
+        lecture: Dict,
+        all_tags: List[Dict],
+        lecture_embedding: np.ndarray,
+        tag_embeddings: Dict[str, np.ndarray],
+        lecturer_profile: Optional[str] = None,
+        catalog: Optional[LabelCatalog] = None,
+        candidate_tags: Optional[List[Dict]] = None,
+        prototype_scores: Optional[Dict[str, float]] = None,
+        reasoning_suggestions: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """Async variant of score_lecture; the reasoning call goes through AsyncOpenAI."""
+        if reasoning_suggestions is None:
+            reasoning_suggestions = await self.reasoning_scorer.ascore_lecture(
+                lecture,
+                all_tags,
+                lecturer_profile,
+                candidate_tags,
+                catalog=catalog
+            )
         
+        if prototype_scores is None:
+            prototype_scores = self.prototype_knn.score_lecture(
+                lecture_embedding,
+                tag_embeddings
+            )
+        
+        return self._combine(lecture.get('id'), reasoning_suggestions, prototype_scores)
+    
+    def _combine(
+        self,
+        lecture_id,
+        reasoning_suggestions: List[Dict],
+        prototype_scores: Dict[str, float]
+    ) -> List[Dict]:
         reasoning_map = {s['tag_id']: s for s in reasoning_suggestions}
         
         combined_suggestions = {}
@@ -0,0 +1,162 @@
+"""
+Incremental reader for large JSON request bodies.
+
+Reads a top-level JSON object from a binary stream in fixed-size chunks and
+yields its members one at a time. Members named in lazy_arrays are yielded as
+iterators over their elements, so an array of 50k lectures is decoded one
+element at a time and never held in memory as a whole (each element, and each
+other member, is decoded by the stdlib C scanner via JSONDecoder.raw_decode).
+"""
+
+import codecs
+import json
+from typing import Any, BinaryIO, Collection, Iterator, Tuple
+
+_WHITESPACE = ' \t\n\r'
+
+# A JSONDecodeError this close to the end of the buffer may just be a value cut off by the chunk boundary
+_TRUNCATION_MARGIN = 6
+
+
+class JSONStreamError(ValueError):
+    """The request body is not valid JSON or not a JSON object."""
+
+
+class _ChunkedReader:
+    """Decoded text buffer over a binary stream, refilled on demand."""
+    
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._json = json.JSONDecoder()
+    
+    def _fill(self) -> bool:
+        """Append the next chunk (dropping consumed text); False at end of stream."""
+        if self.eof:
+            return False
+        
+        # Read at least as much as is pending, so a large value is re-scanned O(log n) times, not O(n / chunk)
+        data = self.stream.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        try:
+            if data:
+                text = self._decoder.decode(data)
+            else:
+                self.eof = True
+                text = self._decoder.decode(b'', final=True)
+        except UnicodeDecodeError as e:
+            raise JSONStreamError(f"Request body is not valid UTF-8 ({e.reason})")
+        
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of stream), not consumed."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+    
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise JSONStreamError(f"Expecting '{char}', found {found!r}" if found else f"Expecting '{char}', found end of body")
+        self.pos += 1
+    
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                truncated = e.msg.startswith('Unterminated string') or e.pos >= len(self.buffer) - _TRUNCATION_MARGIN
+                if truncated and self._fill():
+                    continue
+                raise JSONStreamError(f"Invalid JSON: {e.msg}")
+            
+            # A number near the end of the buffer may continue in the next chunk: raw_decode
+            # accepts a prefix cut after '.', 'e' or a sign ('-12.' decodes as -12)
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if is_number and end >= len(self.buffer) - _TRUNCATION_MARGIN and self._fill():
+                continue
+            
+            self.pos = end
+            return value
+
+
+def iter_object_members(
+    stream: BinaryIO,
+    lazy_arrays: Collection[str] = (),
+    chunk_size: int = 64 * 1024
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Members of the top-level JSON object in a binary stream, in body order.
+    
+    Args:
+        stream: Binary file-like object (e.g. Flask's request.stream)
+        lazy_arrays: Member names whose array values are yielded as element
+            iterators instead of lists. Consume each before advancing; one
+            left unfinished is drained (and its elements discarded).
+        chunk_size: Bytes read per refill
+    
+    Yields:
+        (key, value) pairs; duplicate keys are yielded as they appear
+    
+    Raises:
+        JSONStreamError: on malformed JSON, a body that is not an object, or
+            trailing data after it
+    """
+    reader = _ChunkedReader(stream, chunk_size)
+    reader.expect('{')
+    
+    if reader.peek() == '}':
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise JSONStreamError("Expecting a property name")
+            reader.expect(':')
+            
+            if key in lazy_arrays and reader.peek() == '[':
+                elements = _iter_array(reader)
+                yield key, elements
+                for _ in elements:
+                    pass
+            else:
+                yield key, reader.value()
+            
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == '}':
+                break
+            if separator != ',':
+                raise JSONStreamError(f"Expecting ',' or '}}' after member {key!r}")
+    
+    if reader.peek():
+        raise JSONStreamError("Unexpected data after the JSON object")
+
+
+def _iter_array(reader: _ChunkedReader) -> Iterator[Any]:
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    
+    while True:
+        yield reader.value()
+        
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise JSONStreamError("Expecting ',' or ']' in array")
@@ -0,0 +1,159 @@
+"""
+Label catalog: per-label-set derived structures, built once and cached.
+
+Every /suggest-tags request carries the full labels list. The id/category
+indexes, scorer-format tags, name resolver and rendered prompt block derived
+from it are identical across requests with the same labels, so they are
+built once per content fingerprint and kept in an LRU.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from src.lru_cache import TTLLRUCache
+
+
+def fingerprint_labels(labels: List[Dict]) -> str:
+    """Content hash of a labels list (order-sensitive, since order shapes the prompt)."""
+    canonical = json.dumps(labels, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def build_name_to_tag(tags: List[Dict]) -> Dict[str, Dict]:
+    """Create name -> tag mapping for post-processing (names and synonyms)."""
+    name_to_tag = {}
+    for tag in tags:
+        name_he = tag.get('name_he', '').strip()
+        if name_he:
+            name_to_tag[name_he] = tag
+            
+            # Also add synonyms as aliases
+            synonyms = tag.get('synonyms_he', '').strip()
+            if synonyms:
+                for synonym in synonyms.split(','):
+                    synonym = synonym.strip()
+                    if synonym:
+                        name_to_tag[synonym] = tag
+    return name_to_tag
+
+
+def assign_tag_codes(tags: List[Dict]) -> Dict[str, Dict]:
+    """Short codes (T1, T2, ...) for a tag list, in list order: code -> tag."""
+    return {f"T{i}": tag for i, tag in enumerate(tags, start=1)}
+
+
+class LabelCatalog:
+    """Immutable view of one labels list with precomputed lookups."""
+    
+    def __init__(self, labels: List[Dict], fingerprint: Optional[str] = None):
+        self.labels = labels
+        self.fingerprint = fingerprint or fingerprint_labels(labels)
+        
+        # All labels by id (inactive included, for output conversion)
+        self.labels_by_id: Dict[str, Dict] = {label['id']: label for label in labels}
+        self.active_labels_by_id: Dict[str, Dict] = {
+            label['id']: label for label in labels if label.get('active', True)
+        }
+        
+        # Tag format expected by the reasoning/ensemble scorers
+        self.tags_for_scorer: List[Dict] = [
+            {
+                'tag_id': label['id'],
+                'name_he': label.get('name_he', ''),
+                'synonyms_he': label.get('synonyms_he', ''),
+                'category': label.get('category', 'Unknown')
+            }
+            for label in self.active_labels_by_id.values()
+        ]
+        
+        # tag_id -> tag info mapping used by EnsembleScorer
+        self.tags_data: Dict[str, Dict] = {
+            tag['tag_id']: {
+                'tag_id': tag['tag_id'],
+                'name_he': tag['name_he'],
+                'category': tag['category']
+            }
+            for tag in self.tags_for_scorer
+        }
+        
+        self.tags_by_category: Dict[str, List[Dict]] = {}
+        for tag in self.tags_for_scorer:
+            self.tags_by_category.setdefault(tag['category'], []).append(tag)
+        
+        self.name_to_tag: Dict[str, Dict] = build_name_to_tag(self.tags_for_scorer)
+        
+        # Compact codes for prompts/outputs, stable for this label set
+        self.code_to_tag: Dict[str, Dict] = assign_tag_codes(self.tags_for_scorer)
+        
+        self._memo: Dict[Any, Any] = {}
+        self._memo_lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.labels)
+    
+    def memo(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Compute a derived structure (e.g. a rendered prompt block) once per catalog."""
+        with self._memo_lock:
+            if key in self._memo:
+                return self._memo[key]
+        
+        value = build()
+        
+        with self._memo_lock:
+            return self._memo.setdefault(key, value)
+    
+    def prototype_mask(self, prototype_tag_ids: List[str]) -> np.ndarray:
+        """
+        Boolean mask over a prototype matrix's columns selecting this catalog's active labels.
+
+        Keyed on the identity of the tag id list, which PrototypeKNN rebuilds
+        whenever its prototypes change. The list is kept alongside the mask so
+        its id cannot be reused while the entry exists.
+        """
+        _, mask = self.memo(
+            ('prototype_mask', id(prototype_tag_ids)),
+            lambda: (
+                prototype_tag_ids,
+                np.array([tag_id in self.active_labels_by_id for tag_id in prototype_tag_ids], dtype=bool)
+            )
+        )
+        return mask
+
+
+# Process-wide: one catalog per distinct labels payload
+label_catalog_cache = TTLLRUCache(
+    max_entries=int(os.getenv('LABEL_CATALOG_CACHE_SIZE', '32')),
+    name='label_catalogs'
+)
+
+
+def get_label_catalog(labels: List[Dict]) -> LabelCatalog:
+    """Get the cached catalog for a labels list, building it on first use."""
+    fingerprint = fingerprint_labels(labels)
+    
+    hit, catalog = label_catalog_cache.get(fingerprint)
+    if not hit:
+        catalog = LabelCatalog(labels, fingerprint)
+        label_catalog_cache.set(fingerprint, catalog)
+    
+    return catalog
+
+
+def as_label_catalog(labels: Union[List[Dict], LabelCatalog]) -> LabelCatalog:
+    """Accept either a labels list or an already resolved catalog."""
+    if isinstance(labels, LabelCatalog):
+        return labels
+    return get_label_catalog(labels)
+
+
+# artifact_version -> catalog of the label set registered under it
+registered_catalog_cache = TTLLRUCache(
+    max_entries=int(os.getenv('LABEL_CATALOG_CACHE_SIZE', '32')),
+    ttl_seconds=float(os.getenv('LABEL_SET_CACHE_TTL_SECONDS', '300')),
+    name='registered_label_sets'
+)
@@ -5,16 +5,129 @@ Uses GPT-4o-mini to search for lecturer biographies and caches results
 in PostgreSQL for fast subsequent lookups.
 """
 
+import asyncio
 import logging
 import os
-from typing import Optional, Tuple
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import psycopg2
 from openai import OpenAI
 
+from src.circuit_breaker import CircuitOpenError, bio_search_breaker
+from src.lru_cache import TTLLRUCache
+
 logger = logging.getLogger(__name__)
 
 
+def normalize_lecturer_name(name: str) -> str:
+    """Normalize a (Hebrew) lecturer name for use as a lookup key."""
+    # Remove niqqud (Hebrew diacritics)
+    name = re.sub(r'[\u0591-\u05C7]', '', name or '')
+    # Normalize quotes and punctuation
+    name = re.sub(r'[״"\'`׳]', '', name)
+    # Collapse whitespace
+    return ' '.join(name.split()).lower()
+
+
+def lecturer_cache_key(lecturer_id: Optional[str], lecturer_name: Optional[str]) -> str:
+    """
+    Key identifying a lecturer in the bio caches.
+    
+    Lecturers without an ID are keyed by their normalized name; the same key is
+    stored as lecturer_id in lecturer_bios so name-only lookups persist too.
+    """
+    if lecturer_id:
+        return f"id:{lecturer_id}"
+    return f"name:{normalize_lecturer_name(lecturer_name)}"
+
+
+class _Flight:
+    """One in-progress call that concurrent callers can wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution.
+    
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait and receive the same result (or exception).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._num_executed = 0
+        self._num_shared = 0
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per key among concurrent callers.
+        
+        Returns:
+            (result, shared) - shared is True if this caller joined another
+                               caller's in-flight execution
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._num_shared += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._num_executed += 1
+                leader = True
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'executed': self._num_executed,
+                'shared': self._num_shared,
+                'in_flight': len(self._flights)
+            }
+
+
+# Process-wide: services are created per request, in-flight searches are shared across them
+bio_search_flight = SingleFlight()
+
+# In-process LRU in front of lecturer_bios. Negative entries ("searched, no bio")
+# get a shorter TTL so lecturers who later gain a bio are picked up again.
+bio_cache = TTLLRUCache(
+    max_entries=int(os.getenv('BIO_CACHE_MAX_ENTRIES', '5000')),
+    ttl_seconds=float(os.getenv('BIO_CACHE_TTL_SECONDS', '86400')),
+    name='lecturer_bios'
+)
+BIO_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv('BIO_CACHE_NEGATIVE_TTL_SECONDS', '3600'))
+
+
+def _remember_bio(cache_key: str, bio: Optional[str]) -> None:
+    bio_cache.set(cache_key, bio, ttl_seconds=None if bio else BIO_CACHE_NEGATIVE_TTL_SECONDS)
+
+
 class LecturerSearchService:
     """Service for fetching and caching lecturer biographies."""
     
@@ -51,17 +164,46 @@ class LecturerSearchService:
             logger.warning("No lecturer_id or lecturer_name provided")
             return None
         
-        # Try database cache first
+        cache_key = lecturer_cache_key(lecturer_id, lecturer_name)
+        
+        # In-process cache first, then the database cache
+        memory_hit, cached_bio = bio_cache.get(cache_key)
+        if memory_hit:
+            return cached_bio
+        
         cached_bio, cache_hit = self._get_from_cache(lecturer_id, lecturer_name)
         if cache_hit:
             logger.info(f"Lecturer bio cache hit: {lecturer_id or lecturer_name} (bio: {'found' if cached_bio else 'not found'})")
+            _remember_bio(cache_key, cached_bio)
             return cached_bio
         
         # Not in cache - search using LLM
         if not lecturer_name:
             logger.warning(f"Cannot search for bio without lecturer_name (ID: {lecturer_id})")
             return None
+        
+        # Bio search is down: go without a bio rather than wait (and don't cache the miss)
+        if not bio_search_breaker.available():
+            logger.info(f"Bio search circuit open, skipping search for {lecturer_name}")
+            return None
             
+        # Concurrent misses for the same lecturer share one search + validation
+        bio, shared = bio_search_flight.do(
+            cache_key,
+            lambda: self._search_validate_and_cache(lecturer_id, lecturer_name, lecture_description)
+        )
+        if shared:
+            logger.info(f"Joined in-flight bio search for {lecturer_name}")
+        
+        return bio
+    
+    def _search_validate_and_cache(
+        self,
+        lecturer_id: Optional[str],
+        lecturer_name: str,
+        lecture_description: Optional[str]
+    ) -> Optional[str]:
+        """Search for a bio with the LLM, validate it and save it to the cache."""
         logger.info(f"Searching for bio: {lecturer_name}")
         bio = self._search_with_llm(lecturer_name)
         
@@ -72,12 +214,33 @@ class LecturerSearchService:
                 logger.warning(f"Bio validation failed for {lecturer_name} - not caching")
                 return None  # Don't use or cache incorrect bio
         
-        # Save to cache (even if None - to avoid repeated searches)
-        if lecturer_id:
-            self._save_to_cache(lecturer_id, lecturer_name, bio)
+        # Save to cache (even if None - to avoid repeated searches).
+        # Name-only lecturers are stored under their normalized-name key.
+        cache_key = lecturer_cache_key(lecturer_id, lecturer_name)
+        self._save_to_cache(lecturer_id or cache_key, lecturer_name, bio)
+        _remember_bio(cache_key, bio)
         
         return bio
     
+    async def aget_lecturer_profile(
+        self,
+        lecturer_id: Optional[str] = None,
+        lecturer_name: Optional[str] = None,
+        lecture_description: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Async variant of get_lecturer_profile.
+        
+        The psycopg2 cache lookups and the OpenAI calls are blocking, so the
+        whole lookup runs in a worker thread to keep the event loop free.
+        """
+        return await asyncio.to_thread(
+            self.get_lecturer_profile,
+            lecturer_id,
+            lecturer_name,
+            lecture_description
+        )
+    
     def _get_from_cache(
         self,
         lecturer_id: Optional[str],
@@ -104,12 +267,19 @@ class LecturerSearchService:
                     (lecturer_id,)
                 )
             elif lecturer_name:
+                # Prefer the entry saved under the normalized-name key
+                name_key = lecturer_cache_key(None, lecturer_name)
                 cursor.execute(
-                    "SELECT bio_text FROM lecturer_bios WHERE lecturer_name = %s LIMIT 1",
-                    (lecturer_name,)
+                    """
+                    SELECT bio_text FROM lecturer_bios
+                    WHERE lecturer_id = %s OR lecturer_name = %s
+                    ORDER BY (lecturer_id = %s) DESC
+                    LIMIT 1
+                    """,
+                    (name_key, lecturer_name, name_key)
                 )
             else:
-                return None
+                return (None, False)
             
             result = cursor.fetchone()
             cursor.close()
@@ -124,6 +294,51 @@ class LecturerSearchService:
             logger.error(f"Error fetching from cache: {e}")
             return (None, False)
     
+    def get_many_from_cache(self, lecturers: List[Dict[str, Optional[str]]]) -> Dict[str, Optional[str]]:
+        """
+        Bulk-check the database cache with a single query.
+        
+        Args:
+            lecturers: Dicts with lecturer_id and/or lecturer_name
+            
+        Returns:
+            Dict mapping lecturer_cache_key -> bio (None = searched, no bio) for
+            every lecturer that has a cached entry; found entries also prime
+            the in-process cache
+        """
+        keys_by_db_id = {}
+        for lecturer in lecturers:
+            lecturer_id = lecturer.get('lecturer_id')
+            lecturer_name = lecturer.get('lecturer_name')
+            if not (lecturer_id or lecturer_name):
+                continue
+            cache_key = lecturer_cache_key(lecturer_id, lecturer_name)
+            keys_by_db_id[lecturer_id or cache_key] = cache_key
+        
+        if not self.database_url or not keys_by_db_id:
+            return {}
+        
+        try:
+            conn = psycopg2.connect(self.database_url)
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT lecturer_id, bio_text FROM lecturer_bios WHERE lecturer_id = ANY(%s)",
+                (list(keys_by_db_id.keys()),)
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error bulk fetching from cache: {e}")
+            return {}
+        
+        found = {}
+        for db_id, bio in rows:
+            cache_key = keys_by_db_id[db_id]
+            found[cache_key] = bio
+            _remember_bio(cache_key, bio)
+        return found
+    
     def _save_to_cache(
         self,
         lecturer_id: str,
@@ -171,7 +386,7 @@ class LecturerSearchService:
             Bio summary or None if not found
         """
         try:
-            response = self.client.chat.completions.create(
+            response = bio_search_breaker.call(lambda: self.client.chat.completions.create(
                 model=self.search_model,
                 messages=[
                     {
@@ -192,7 +407,7 @@ Write in Hebrew. If the person is well-known, provide relevant details. Make a r
                 ],
                 temperature=0.3,
                 max_tokens=200
-            )
+            ))
             
             bio = response.choices[0].message.content.strip()
             
@@ -204,6 +419,8 @@ Write in Hebrew. If the person is well-known, provide relevant details. Make a r
                 logger.info(f"No bio generated for: {lecturer_name}")
                 return None
             
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Error searching with LLM: {e}")
             return None
@@ -228,7 +445,7 @@ Write in Hebrew. If the person is well-known, provide relevant details. Make a r
             True if bio seems consistent with lecture, False otherwise
         """
         try:
-            response = self.client.chat.completions.create(
+            response = bio_search_breaker.call(lambda: self.client.chat.completions.create(
                 model=self.validation_model,
                 messages=[
                     {
@@ -252,7 +469,7 @@ Does this bio make sense for someone giving this lecture?"""
                 ],
                 temperature=0,
                 max_tokens=10
-            )
+            ))
             
             result = response.choices[0].message.content.strip().upper()
             is_valid = "TRUE" in result
@@ -260,6 +477,8 @@ Does this bio make sense for someone giving this lecture?"""
             logger.info(f"Bio validation for {lecturer_name}: {result} -> {is_valid}")
             return is_valid
             
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Error validating bio: {e}")
             # On error, assume valid (don't block valid bios due to validation failure)
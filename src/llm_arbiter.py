@@ -2,10 +2,58 @@ from openai import OpenAI
 from typing import List, Dict, Set
 import logging
 import json
-from src.logging_utils import StructuredLogger, track_operation
+from src.circuit_breaker import chat_breaker
+from src.deadline import llm_request_options
+from src.llm_hedging import arbiter_hedger
+from src.logging_utils import StructuredLogger, track_operation, record_llm_cost
 
 logger = StructuredLogger(__name__)
 
+ARBITER_SYSTEM_PROMPT = """אתה מומחה לתיוג הרצאות בעברית.
+תפקידך לבחור תגיות רלוונטיות מתוך רשימת מועמדים.
+
+## קטגוריות תגיות
+תגיות מחולקות ל-5 קטגוריות:
+- **נושא (Topic)**: על מה ההרצאה עוסקת - דוגמאות: פילוסופיה, הורות, זוגיות, כלכלה
+- **פרסונה (Persona)**: מי המרצה - דוגמאות: אושיות רשת, מוזיקאים, מקצוענים, גיבורים
+- **טון (Tone)**: אווירה ורגש - דוגמאות: סיפור אישי, מצחיק, מרגש, פרקטי
+- **פורמט (Format)**: מבנה ההרצאה - דוגמאות: פאנל, שיחה פתוחה, סיור, הכשרה מעשית
+- **קהל יעד (Audience)**: למי מיועד - דוגמאות: הרצאות למורים, הרצאות להייטק, דוברי אנגלית
+
+החזר רק את מזהי התגיות (tag_id) שמתאימים באמת להרצאה.
+העדף דיוק גבוה - אם אתה לא בטוח, אל תכלול תגית.
+אם אין תגיות מתאימות, החזר רשימה ריקה."""
+
+# Appended to the system prompt when several lectures are reviewed in one call
+BATCH_INSTRUCTIONS = """
+
+## כמה הרצאות
+תקבל כמה הרצאות, כל אחת עם מזהה (lecture_id) ורשימת מועמדים משלה.
+החזר עבור כל הרצאה את ה-lecture_id שלה ואת מזהי התגיות שנבחרו מתוך המועמדים שלה בלבד."""
+
+BATCH_SELECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "lectures": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "lecture_id": {"type": "string"},
+                    "selected_tag_ids": {
+                        "type": "array",
+                        "items": {"type": "string"}
+                    }
+                },
+                "required": ["lecture_id", "selected_tag_ids"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["lectures"],
+    "additionalProperties": False
+}
+
 
 class LLMArbiter:
     def __init__(self, api_key: str, config):
@@ -26,11 +74,44 @@ class LLMArbiter:
         candidate_tags: Dict[str, Dict],
         scores: Dict[str, float]
     ) -> Set[str]:
-        borderline_tags = self._filter_borderline_tags(candidate_tags, scores)
+        candidates_list = self._prepare_candidates(candidate_tags, scores)
         
-        if not borderline_tags:
+        if not candidates_list:
             return set()
         
+        selected_ids = self._call_llm(lecture_title, lecture_description, candidates_list)
+        
+        return set(selected_ids)
+    
+    def refine_suggestions_batch(self, items: List[Dict]) -> List[Set[str]]:
+        """
+        Review the borderline tags of several lectures in one LLM call.
+        
+        Args:
+            items: refine_suggestions() kwargs per lecture, plus 'lecture_id'
+        
+        Returns:
+            Approved tag ids per item, in the same order
+        """
+        entries = []
+        for index, item in enumerate(items):
+            candidates_list = self._prepare_candidates(item['candidate_tags'], item['scores'])
+            if candidates_list:
+                entries.append((index, item, candidates_list))
+        
+        results: List[Set[str]] = [set() for _ in items]
+        if len(entries) == 1:
+            index, item, candidates_list = entries[0]
+            results[index] = set(self._call_llm(item['lecture_title'], item['lecture_description'], candidates_list))
+        elif entries:
+            for index, selected_ids in self._call_llm_batch(entries).items():
+                results[index] = set(selected_ids)
+        return results
+    
+    def _prepare_candidates(self, candidate_tags: Dict[str, Dict], scores: Dict[str, float]) -> List[Dict]:
+        """Borderline candidates for one lecture, best first, capped at max_llm_candidates."""
+        borderline_tags = self._filter_borderline_tags(candidate_tags, scores)
+        
         candidates_list = [
             {
                 'tag_id': tag_id,
@@ -42,11 +123,7 @@ class LLMArbiter:
         ]
         
         candidates_list.sort(key=lambda x: x['score'], reverse=True)
-        candidates_list = candidates_list[:self.config.max_llm_candidates]
-        
-        selected_ids = self._call_llm(lecture_title, lecture_description, candidates_list)
-        
-        return set(selected_ids)
+        return candidates_list[:self.config.max_llm_candidates]
     
     def _filter_borderline_tags(
         self, 
@@ -67,20 +144,7 @@ class LLMArbiter:
         description: str, 
         candidates: List[Dict]
     ) -> List[str]:
-        system_prompt = """אתה מומחה לתיוג הרצאות בעברית.
-תפקידך לבחור תגיות רלוונטיות מתוך רשימת מועמדים.
-
-## קטגוריות תגיות
-תגיות מחולקות ל-5 קטגוריות:
-- **נושא (Topic)**: על מה ההרצאה עוסקת - דוגמאות: פילוסופיה, הורות, זוגיות, כלכלה
-- **פרסונה (Persona)**: מי המרצה - דוגמאות: אושיות רשת, מוזיקאים, מקצוענים, גיבורים
-- **טון (Tone)**: אווירה ורגש - דוגמאות: סיפור אישי, מצחיק, מרגש, פרקטי
-- **פורמט (Format)**: מבנה ההרצאה - דוגמאות: פאנל, שיחה פתוחה, סיור, הכשרה מעשית
-- **קהל יעד (Audience)**: למי מיועד - דוגמאות: הרצאות למורים, הרצאות להייטק, דוברי אנגלית
-
-החזר רק את מזהי התגיות (tag_id) שמתאימים באמת להרצאה.
-העדף דיוק גבוה - אם אתה לא בטוח, אל תכלול תגית.
-אם אין תגיות מתאימות, החזר רשימה ריקה."""
+        system_prompt = ARBITER_SYSTEM_PROMPT
 
         candidates_text = "\n".join([
             f"- {c['tag_id']}: {c['name_he']} [{c.get('category', 'Unknown')}] (ציון: {c['score']:.3f})"
@@ -103,55 +167,36 @@ class LLMArbiter:
 
         try:
             with track_operation("arbiter_llm_call", logger, num_candidates=len(candidates)):
-                response = self.client.chat.completions.create(
-                    model=self.config.llm_model,
-                    temperature=self.config.llm_temperature,
-                    max_tokens=self.config.llm_max_tokens,
-                    messages=messages,
-                    response_format={
-                        "type": "json_schema",
-                        "json_schema": {
-                            "name": "tag_selection",
-                            "strict": True,
-                            "schema": {
-                                "type": "object",
-                                "properties": {
-                                    "selected_tag_ids": {
-                                        "type": "array",
-                                        "items": {"type": "string"}
-                                    }
-                                },
-                                "required": ["selected_tag_ids"],
-                                "additionalProperties": False
+                response = chat_breaker.call(lambda: arbiter_hedger.call(
+                    lambda: self.client.chat.completions.create(
+                        model=self.config.llm_model,
+                        temperature=self.config.llm_temperature,
+                        max_tokens=self.config.llm_max_tokens,
+                        messages=messages,
+                        response_format={
+                            "type": "json_schema",
+                            "json_schema": {
+                                "name": "tag_selection",
+                                "strict": True,
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "selected_tag_ids": {
+                                            "type": "array",
+                                            "items": {"type": "string"}
+                                        }
+                                    },
+                                    "required": ["selected_tag_ids"],
+                                    "additionalProperties": False
+                                }
                             }
-                        }
-                    }
-                )
-                
-                # Track LLM usage (with fallback estimation)
-                usage = response.usage
-                if usage and hasattr(usage, 'prompt_tokens'):
-                    input_tokens = usage.prompt_tokens
-                    output_tokens = usage.completion_tokens
-                    total_tokens = usage.total_tokens
-                else:
-                    # Estimate when API doesn't provide usage
-                    input_tokens, output_tokens = self._estimate_llm_tokens(messages)
-                    total_tokens = input_tokens + output_tokens
-                
-                # Estimate cost (gpt-4o-mini: ~$0.15/1M input, ~$0.60/1M output)
-                cost = (input_tokens / 1_000_000 * 0.15) + (output_tokens / 1_000_000 * 0.60)
+                        },
+                        **llm_request_options()
+                    ),
+                    hedge=self.config.llm_hedging
+                ))
                 
-                logger.info(
-                    "LLM arbiter call completed",
-                    model=self.config.llm_model,
-                    num_candidates=len(candidates),
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    total_tokens=total_tokens,
-                    estimated_cost_usd=round(cost, 6),
-                    usage_source="api" if usage and hasattr(usage, 'prompt_tokens') else "estimated"
-                )
+                self._log_usage(response, messages, num_candidates=len(candidates))
             
             content = response.choices[0].message.content
             if not content:
@@ -177,3 +222,137 @@ class LLMArbiter:
                 error_message=str(e)
             )
             return []
+
+    def _log_usage(self, response, messages: List[Dict], **fields) -> None:
+        """Log token usage and estimated cost of one arbiter call."""
+        # Track LLM usage (with fallback estimation)
+        usage = response.usage
+        if usage and hasattr(usage, 'prompt_tokens'):
+            input_tokens = usage.prompt_tokens
+            output_tokens = usage.completion_tokens
+            total_tokens = usage.total_tokens
+        else:
+            # Estimate when API doesn't provide usage
+            input_tokens, output_tokens = self._estimate_llm_tokens(messages)
+            total_tokens = input_tokens + output_tokens
+        
+        # Estimate cost (gpt-4o-mini: ~$0.15/1M input, ~$0.60/1M output)
+        cost = (input_tokens / 1_000_000 * 0.15) + (output_tokens / 1_000_000 * 0.60)
+        record_llm_cost(cost)
+        
+        logger.info(
+            "LLM arbiter call completed",
+            model=self.config.llm_model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=total_tokens,
+            estimated_cost_usd=round(cost, 6),
+            usage_source="api" if usage and hasattr(usage, 'prompt_tokens') else "estimated",
+            **fields
+        )
+    
+    def _call_llm_batch(self, entries: List[tuple]) -> Dict[int, List[str]]:
+        """
+        One structured call for several lectures' borderline candidates.
+        
+        Args:
+            entries: (index, item, candidates) per lecture
+        
+        Returns:
+            index -> valid selected tag ids. Lectures missing from the reply (all
+            of them if the call fails) are reviewed one by one with _call_llm.
+        """
+        # Key by lecture id; repeated ids (same lecture in concurrent requests) get a suffix
+        keyed = {}
+        for index, item, candidates in entries:
+            key = str(item.get('lecture_id') or index)
+            if key in keyed:
+                key = f"{key}#{index}"
+            keyed[key] = (index, item, candidates)
+        
+        lecture_blocks = []
+        for key, (_, item, candidates) in keyed.items():
+            candidates_text = "\n".join([
+                f"- {c['tag_id']}: {c['name_he']} [{c.get('category', 'Unknown')}] (ציון: {c['score']:.3f})"
+                for c in candidates
+            ])
+            lecture_blocks.append(f"""lecture_id: {key}
+כותרת: {item['lecture_title']}
+תיאור: {item['lecture_description']}
+מועמדי תגיות:
+{candidates_text}""")
+        
+        user_prompt = "\n\n---\n\n".join(lecture_blocks) + "\n\nבחר עבור כל הרצאה את מזהי התגיות הרלוונטיים ביותר."
+        
+        messages = [
+            {"role": "system", "content": ARBITER_SYSTEM_PROMPT + BATCH_INSTRUCTIONS},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        num_candidates = sum(len(candidates) for _, _, candidates in entries)
+        selections = {}
+        
+        try:
+            with track_operation("arbiter_llm_batch_call", logger, num_lectures=len(entries), num_candidates=num_candidates):
+                response = chat_breaker.call(lambda: arbiter_hedger.call(
+                    lambda: self.client.chat.completions.create(
+                        model=self.config.llm_model,
+                        temperature=self.config.llm_temperature,
+                        max_tokens=max(self.config.llm_max_tokens, 150 * len(entries)),
+                        messages=messages,
+                        response_format={
+                            "type": "json_schema",
+                            "json_schema": {
+                                "name": "batch_tag_selection",
+                                "strict": True,
+                                "schema": BATCH_SELECTION_SCHEMA
+                            }
+                        },
+                        **llm_request_options()
+                    ),
+                    hedge=self.config.llm_hedging
+                ))
+                
+                self._log_usage(response, messages, num_lectures=len(entries), num_candidates=num_candidates)
+            
+            content = response.choices[0].message.content
+            if not content:
+                logger.warning("LLM returned empty content")
+                content = '{}'
+            result = json.loads(content)
+            
+            for lecture_result in result.get('lectures', []):
+                entry = keyed.get(str(lecture_result.get('lecture_id')))
+                if entry is None:
+                    continue
+                index, _, candidates = entry
+                candidate_ids = {c['tag_id'] for c in candidates}
+                selections[index] = [
+                    tag_id for tag_id in lecture_result.get('selected_tag_ids', [])
+                    if tag_id in candidate_ids
+                ]
+        
+        except Exception as e:
+            logger.error(
+                "Error calling LLM arbiter (batch)",
+                num_lectures=len(entries),
+                error_type=type(e).__name__,
+                error_message=str(e)
+            )
+        
+        num_answered = len(selections)
+        missing = [(index, item, candidates) for index, item, candidates in entries if index not in selections]
+        if missing:
+            logger.warning(f"{len(missing)}/{len(entries)} lectures missing from arbiter batch reply, reviewing individually")
+        for index, item, candidates in missing:
+            selections[index] = self._call_llm(item['lecture_title'], item['lecture_description'], candidates)
+        
+        logger.info(
+            "LLM arbiter batch selection completed",
+            num_lectures=len(entries),
+            num_answered=num_answered,
+            num_fallback=len(missing),
+            num_selected=sum(len(ids) for ids in selections.values()),
+            num_candidates=num_candidates
+        )
+        return selections
@@ -0,0 +1,219 @@
+"""
+Hedged LLM calls for tail-latency reduction.
+
+A HedgedCaller runs one LLM call and, if it has not returned by a latency
+percentile of recent calls of the same kind, sends a duplicate; the first
+successful response wins. Extra calls are capped by a hedge budget that earns
+a fraction of a hedge per call, so hedging adds at most that fraction of spend.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+from src.logging_utils import StructuredLogger
+
+logger = StructuredLogger(__name__)
+
+# Latency samples needed before the percentile is trusted (no hedging before that)
+MIN_LATENCY_SAMPLES = 20
+
+
+class HedgeBudget:
+    """Token bucket: each call earns max_ratio of a hedge, each hedge spends one."""
+    
+    def __init__(self, max_ratio: float, burst: float = 5.0):
+        self.max_ratio = max_ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+    
+    def earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.max_ratio)
+    
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class HedgedCaller:
+    """Hedges one kind of LLM call (e.g. reasoning, arbiter) based on its own latency history."""
+    
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 95.0,
+        min_delay_ms: float = 1000.0,
+        max_hedge_ratio: float = 0.1,
+        window: int = 200,
+        max_workers: int = 32
+    ):
+        """
+        Args:
+            name: Name used in logs and metrics
+            percentile: Send the hedge once the call is slower than this percentile
+            min_delay_ms: Never hedge earlier than this
+            max_hedge_ratio: Hedges allowed per call (extra spend cap, e.g. 0.1 = +10%)
+            window: Number of recent call latencies the percentile is computed over
+            max_workers: Threads for sync calls (primary + hedge each take one)
+        """
+        self.name = name
+        self.percentile = percentile
+        self.min_delay_s = min_delay_ms / 1000.0
+        self.budget = HedgeBudget(max_hedge_ratio)
+        
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hedge-{name}")
+        
+        self._calls = 0
+        self._hedges_fired = 0
+        self._hedge_wins = 0
+        self._budget_denied = 0
+    
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging (None until enough latency samples)."""
+        with self._lock:
+            if len(self._latencies) < MIN_LATENCY_SAMPLES:
+                return None
+            delay = float(np.percentile(self._latencies, self.percentile))
+        return max(delay, self.min_delay_s)
+    
+    def _record(self, duration_s: float) -> None:
+        with self._lock:
+            self._latencies.append(duration_s)
+    
+    def _count(self, **counts) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                setattr(self, key, getattr(self, key) + value)
+    
+    def _timed(self, fn: Callable[[], Any]) -> Any:
+        start = time.monotonic()
+        result = fn()
+        self._record(time.monotonic() - start)
+        return result
+    
+    def _start_call(self, hedge: bool) -> Optional[float]:
+        """Count a call and return its hedge delay (None = do not hedge)."""
+        self._count(_calls=1)
+        if not hedge:
+            return None
+        self.budget.earn()
+        return self.hedge_delay()
+    
+    def _try_hedge(self) -> bool:
+        if not self.budget.try_spend():
+            self._count(_budget_denied=1)
+            return False
+        self._count(_hedges_fired=1)
+        logger.info(f"{self.name}: hedging slow LLM call")
+        return True
+    
+    def call(self, fn: Callable[[], Any], hedge: bool = True) -> Any:
+        """
+        Run fn() (a blocking LLM call), hedging it if it is slow.
+
+        The losing call cannot be interrupted and completes in the background.
+        Latencies are recorded even when hedge=False, so the percentile is
+        warm once hedging is turned on.
+        """
+        delay = self._start_call(hedge)
+        if delay is None:
+            return self._timed(fn)
+        
+        primary = self._executor.submit(contextvars.copy_context().run, self._timed, fn)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._try_hedge():
+            return primary.result()
+        
+        hedged = self._executor.submit(contextvars.copy_context().run, self._timed, fn)
+        pending = {primary, hedged}
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedged:
+                        self._count(_hedge_wins=1)
+                    return future.result()
+                first_error = first_error or future.exception()
+        raise first_error
+    
+    async def acall(self, coro_fn: Callable[[], Awaitable[Any]], hedge: bool = True) -> Any:
+        """Async variant of call(); the losing call is cancelled."""
+        delay = self._start_call(hedge)
+        
+        async def timed() -> Any:
+            start = time.monotonic()
+            result = await coro_fn()
+            self._record(time.monotonic() - start)
+            return result
+        
+        if delay is None:
+            return await timed()
+        
+        primary = asyncio.ensure_future(timed())
+        hedged = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._try_hedge():
+                return await primary
+            
+            hedged = asyncio.ensure_future(timed())
+            pending = {primary, hedged}
+            first_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedged:
+                            self._count(_hedge_wins=1)
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in (primary, hedged):
+                if task is not None and not task.done():
+                    task.cancel()
+    
+    def stats(self) -> Dict[str, Any]:
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                'name': self.name,
+                'calls': self._calls,
+                'hedges_fired': self._hedges_fired,
+                'hedge_wins': self._hedge_wins,
+                'budget_denied': self._budget_denied,
+                'hedge_rate': round(self._hedges_fired / self._calls, 4) if self._calls else 0.0,
+                'hedge_win_rate': round(self._hedge_wins / self._hedges_fired, 4) if self._hedges_fired else 0.0,
+                'latency_samples': len(self._latencies),
+                'hedge_delay_ms': round(delay * 1000, 1) if delay is not None else None
+            }
+
+
+def _hedged_caller(name: str) -> HedgedCaller:
+    return HedgedCaller(
+        name=name,
+        percentile=float(os.getenv('LLM_HEDGE_PERCENTILE', '95')),
+        min_delay_ms=float(os.getenv('LLM_HEDGE_MIN_DELAY_MS', '1000')),
+        max_hedge_ratio=float(os.getenv('LLM_HEDGE_MAX_RATIO', '0.1')),
+        max_workers=int(os.getenv('LLM_HEDGE_WORKERS', '32'))
+    )
+
+
+# Process-wide, one per call kind (each has its own latency distribution)
+reasoning_hedger = _hedged_caller("reasoning")
+arbiter_hedger = _hedged_caller("arbiter")
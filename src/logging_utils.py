@@ -5,9 +5,27 @@ import uuid
 from typing import Dict, Any, Optional, Callable
 from functools import wraps
 from contextlib import contextmanager
-from threading import local
+from contextvars import ContextVar
 
-_request_context = local()
+# Request context lives in a ContextVar (not threading.local) so it follows the
+# request into asyncio tasks and asyncio.to_thread workers.
+_request_context_var: ContextVar[Dict[str, Any]] = ContextVar('request_context', default={})
+
+
+class _RequestContext:
+    """Attribute-style view of the current request context."""
+    
+    def __getattr__(self, name: str) -> Any:
+        context = _request_context_var.get()
+        if name in context:
+            return context[name]
+        raise AttributeError(name)
+
+
+_request_context = _RequestContext()
+
+# Estimated LLM spend of the current unit of work (see llm_cost_meter); None when nobody is metering
+_llm_cost_var: ContextVar[Optional[list]] = ContextVar('llm_cost', default=None)
 
 
 class StructuredLogger:
@@ -53,22 +71,20 @@ class StructuredLogger:
 
 def set_request_context(request_id: str, **kwargs):
     """Set context for the current request."""
-    _request_context.request_id = request_id
-    for key, value in kwargs.items():
-        setattr(_request_context, key, value)
+    context = dict(_request_context_var.get())
+    context['request_id'] = request_id
+    context.update(kwargs)
+    _request_context_var.set(context)
 
 
 def clear_request_context():
     """Clear request context."""
-    if hasattr(_request_context, 'request_id'):
-        delattr(_request_context, 'request_id')
-    if hasattr(_request_context, 'scoring_mode'):
-        delattr(_request_context, 'scoring_mode')
+    _request_context_var.set({})
 
 
 def get_request_id() -> Optional[str]:
     """Get current request_id from context."""
-    return getattr(_request_context, 'request_id', None)
+    return _request_context_var.get().get('request_id')
 
 
 def track_performance(operation_name: str):
@@ -160,6 +176,30 @@ def log_llm_call(provider: str, model: str, tokens: Optional[int] = None, cost:
     )
 
 
+def record_llm_cost(cost: float) -> None:
+    """Add an LLM call's estimated cost to the active llm_cost_meter, if any."""
+    meter = _llm_cost_var.get()
+    if meter is not None:
+        meter.append(cost)
+
+
+@contextmanager
+def llm_cost_meter():
+    """
+    Collect the estimated cost of LLM calls made inside the block.
+
+    Yields a list of per-call costs. Calls made in threads that copy this
+    context (deadline stages, hedged calls) are counted; calls made by a
+    shared micro-batcher thread are not.
+    """
+    meter = []
+    token = _llm_cost_var.set(meter)
+    try:
+        yield meter
+    finally:
+        _llm_cost_var.reset(token)
+
+
 def sanitize_for_logging(data: Any, max_length: int = 200) -> Any:
     """Sanitize data for safe logging (truncate long strings, remove sensitive info)."""
     # List of sensitive field names to redact
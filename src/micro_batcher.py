@@ -0,0 +1,153 @@
+"""
+Micro-batching of concurrent single-item calls.
+
+Callers submit one item and block; a background thread collects items that
+arrive within a short window (or until the batch is full) and processes them
+with a single batched call, then hands each caller its own result.
+"""
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.logging_utils import StructuredLogger
+
+logger = StructuredLogger(__name__)
+
+
+class _PendingItem:
+    """One submitted item waiting for its batch to be processed."""
+    
+    __slots__ = ('item', 'enqueued_at', 'done', 'result', 'error')
+    
+    def __init__(self, item: Any):
+        self.item = item
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """Coalesces concurrent submit() calls into batched process_batch() calls."""
+    
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0,
+        max_concurrent_batches: int = 4,
+        name: str = "micro_batcher"
+    ):
+        """
+        Args:
+            process_batch: Function taking a list of items and returning a list
+                of results in the same order
+            max_batch_size: Flush as soon as this many items are pending
+            max_wait_ms: Flush at most this long after the first pending item arrived
+            max_concurrent_batches: Batches processed in parallel
+            name: Name used in logs and metrics
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.name = name
+        
+        self._cond = threading.Condition()
+        self._queue: List[_PendingItem] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix=name)
+        
+        # Metrics
+        self._batch_size_counts: Counter = Counter()
+        self._num_items = 0
+        self._num_batches = 0
+        self._num_errors = 0
+        self._total_wait_s = 0.0
+        
+        self._worker = threading.Thread(target=self._collect_loop, name=f"{name}-collector", daemon=True)
+        self._worker.start()
+    
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submit one item and block until its batch has been processed."""
+        pending = _PendingItem(item)
+        
+        with self._cond:
+            self._queue.append(pending)
+            self._cond.notify()
+        
+        if not pending.done.wait(timeout):
+            raise TimeoutError(f"{self.name}: batch did not complete within {timeout}s")
+        
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+    
+    def _collect_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                
+                # Window starts when the oldest pending item arrived
+                deadline = self._queue[0].enqueued_at + self.max_wait_s
+                while len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                
+                batch = self._queue[:self.max_batch_size]
+                self._queue = self._queue[self.max_batch_size:]
+            
+            self._executor.submit(self._run_batch, batch)
+    
+    def _run_batch(self, batch: List[_PendingItem]) -> None:
+        started_at = time.monotonic()
+        
+        try:
+            results = self.process_batch([pending.item for pending in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name}: process_batch returned {len(results)} results for {len(batch)} items")
+            
+            for pending, result in zip(batch, results):
+                pending.result = result
+        
+        except BaseException as e:
+            logger.error(
+                f"{self.name} batch failed",
+                batch_size=len(batch),
+                error_type=type(e).__name__,
+                error_message=str(e)
+            )
+            for pending in batch:
+                pending.error = e
+            with self._cond:
+                self._num_errors += 1
+        
+        finally:
+            with self._cond:
+                self._num_batches += 1
+                self._num_items += len(batch)
+                self._batch_size_counts[len(batch)] += 1
+                self._total_wait_s += sum(started_at - pending.enqueued_at for pending in batch)
+            
+            for pending in batch:
+                pending.done.set()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Batch-size distribution and queueing metrics."""
+        with self._cond:
+            return {
+                'name': self.name,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_s * 1000,
+                'num_batches': self._num_batches,
+                'num_items': self._num_items,
+                'num_failed_batches': self._num_errors,
+                'avg_batch_size': round(self._num_items / self._num_batches, 2) if self._num_batches else 0.0,
+                'avg_queue_wait_ms': round(self._total_wait_s / self._num_items * 1000, 2) if self._num_items else 0.0,
+                'batch_size_distribution': {str(size): count for size, count in sorted(self._batch_size_counts.items())},
+                'pending': len(self._queue)
+            }
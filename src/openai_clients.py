@@ -0,0 +1,27 @@
+"""
+Process-wide AsyncOpenAI clients for the async pipeline.
+
+An AsyncOpenAI client owns an httpx connection pool that is bound to the
+event loop it is first used on. The scorers are built per request, so rather
+than each one constructing its own client (and pool), they share one client
+per API key, created on first use and reused for the life of the process.
+"""
+
+import threading
+from typing import Dict, Optional
+
+from openai import AsyncOpenAI
+
+_async_clients: Dict[Optional[str], AsyncOpenAI] = {}
+_async_clients_lock = threading.Lock()
+
+
+def get_async_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """Shared AsyncOpenAI client for api_key (None = OPENAI_API_KEY from the environment)."""
+    client = _async_clients.get(api_key)
+    if client is None:
+        with _async_clients_lock:
+            client = _async_clients.get(api_key)
+            if client is None:
+                client = _async_clients[api_key] = AsyncOpenAI(api_key=api_key)
+    return client
@@ -1,5 +1,5 @@
 import numpy as np
-from typing import List, Dict, Tuple, Set
+from typing import Iterable, List, Dict, Optional, Tuple, Set
 import logging
 from collections import defaultdict
 
@@ -44,12 +44,39 @@ class PrototypeKNN:
         for tag_id, vectors in tag_vectors.items():
             if len(vectors) >= 1:
                 centroid = np.mean(vectors, axis=0)
-                self.tag_prototypes[tag_id] = centroid
-                self.tag_stats[tag_id] = {
-                    'num_examples': len(vectors),
-                    'is_low_data': len(vectors) < self.config.low_data_tag_threshold
-                }
+                self._set_prototype(tag_id, centroid, len(vectors))
         
+        self._log_prototypes_built()
+    
+    def build_prototypes_from_sums(
+        self,
+        tag_sums: Dict[str, np.ndarray],
+        tag_counts: Dict[str, int],
+        tags_data: Dict[str, Dict]
+    ) -> None:
+        """
+        build_prototypes from per-tag embedding sums accumulated while streaming.
+        
+        Args:
+            tag_sums: tag_id -> sum of its tagged lectures' embeddings
+            tag_counts: tag_id -> number of embeddings in the sum
+            tags_data: Tags to build (others in the sums are ignored)
+        """
+        for tag_id, vector_sum in tag_sums.items():
+            count = tag_counts.get(tag_id, 0)
+            if tag_id in tags_data and count >= 1:
+                self._set_prototype(tag_id, (vector_sum / count).astype(np.float32), count)
+        
+        self._log_prototypes_built()
+    
+    def _set_prototype(self, tag_id: str, centroid: np.ndarray, num_examples: int) -> None:
+        self.tag_prototypes[tag_id] = centroid
+        self.tag_stats[tag_id] = {
+            'num_examples': num_examples,
+            'is_low_data': num_examples < self.config.low_data_tag_threshold
+        }
+        
+    def _log_prototypes_built(self) -> None:
         logger.info(f"Built {len(self.tag_prototypes)} tag prototypes")
         low_data_count = sum(1 for s in self.tag_stats.values() if s['is_low_data'])
         logger.info(f"Low-data tags (<{self.config.low_data_tag_threshold} examples): {low_data_count}")
@@ -73,24 +100,38 @@ class PrototypeKNN:
         
         logger.info(f"Calibrating thresholds on {len(holdout_lectures)} holdout lectures")
         
-        tag_scores_positive = defaultdict(list)
-        tag_scores_negative = defaultdict(list)
-        
-        for lecture in holdout_lectures:
-            lecture_id = lecture['id']
-            if lecture_id not in lecture_embeddings:
-                continue
+        def holdout_examples():
+            for lecture in holdout_lectures:
+                lecture_id = lecture['id']
+                if lecture_id not in lecture_embeddings:
+                    continue
             
-            embedding = lecture_embeddings[lecture_id]
-            tag_ids_raw = lecture.get('lecture_tag_ids', [])
+                tag_ids_raw = lecture.get('lecture_tag_ids', [])
             
-            if isinstance(tag_ids_raw, str):
-                tag_ids = {t.strip() for t in tag_ids_raw.split(',') if t.strip()}
-            else:
-                tag_ids = set(tag_ids_raw)
+                if isinstance(tag_ids_raw, str):
+                    tag_ids = {t.strip() for t in tag_ids_raw.split(',') if t.strip()}
+                else:
+                    tag_ids = set(tag_ids_raw)
             
-            tag_ids = {str(t) for t in tag_ids}
+                yield lecture_embeddings[lecture_id], {str(t) for t in tag_ids}
             
+        self.calibrate_thresholds_on(holdout_examples(), tag_embeddings)
+    
+    def calibrate_thresholds_on(
+        self,
+        holdout: Iterable[Tuple[np.ndarray, Set[str]]],
+        tag_embeddings: Dict[str, np.ndarray]
+    ) -> None:
+        """
+        Calibrate per-tag thresholds on (embedding, true tag ids) holdout examples.
+        
+        The examples are consumed one at a time, so they can be read lazily
+        (e.g. from a memory-mapped file by streamed training).
+        """
+        tag_scores_positive = defaultdict(list)
+        tag_scores_negative = defaultdict(list)
+        
+        for embedding, tag_ids in holdout:
             for tag_id in self.tag_prototypes.keys():
                 score = self._compute_score(embedding, tag_id, tag_embeddings)
                 
@@ -178,6 +219,102 @@ class PrototypeKNN:
         
         return scores
     
+    def score_lectures_batch(
+        self,
+        lecture_embeddings: np.ndarray,
+        tag_embeddings: Dict[str, np.ndarray],
+        tag_masks: Optional[List[Optional[np.ndarray]]] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Vectorized score_lecture for a (num_lectures, dim) embedding matrix.
+        
+        Computes all lecture x prototype similarities in one matrix product;
+        returns one {tag_id: score} dict per row, same semantics as score_lecture.
+        tag_masks optionally restricts each row to a boolean mask over
+        prototype_tag_ids() (e.g. LabelCatalog.prototype_mask).
+        """
+        tag_ids, proto_matrix, label_matrix, low_data_mask, thresholds = self._get_score_matrices(tag_embeddings)
+        
+        if not tag_ids:
+            return [{} for _ in range(len(lecture_embeddings))]
+        
+        lecture_matrix = np.asarray(lecture_embeddings, dtype=np.float32)
+        lecture_matrix = lecture_matrix / (np.linalg.norm(lecture_matrix, axis=1, keepdims=True) + 1e-10)
+        
+        scores = lecture_matrix @ proto_matrix.T
+        if low_data_mask.any():
+            label_sims = lecture_matrix @ label_matrix.T
+            blended = self.config.prototype_weight * scores + self.config.label_weight * label_sims
+            scores = np.where(low_data_mask, blended, scores)
+        
+        results = []
+        for i, row in enumerate(scores):
+            passing_mask = row >= thresholds
+            if tag_masks is not None and tag_masks[i] is not None:
+                passing_mask &= tag_masks[i]
+            passing = np.nonzero(passing_mask)[0]
+            results.append({tag_ids[j]: float(row[j]) for j in passing})
+        return results
+    
+    def raw_scores(self, lecture_embedding: np.ndarray, tag_embeddings: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """Scores for all prototype tags, before thresholding (see threshold_for)."""
+        tag_ids, proto_matrix, label_matrix, low_data_mask, _ = self._get_score_matrices(tag_embeddings)
+        if not tag_ids:
+            return {}
+        
+        lecture_vec = np.asarray(lecture_embedding, dtype=np.float32)
+        lecture_vec = lecture_vec / (np.linalg.norm(lecture_vec) + 1e-10)
+        
+        scores = proto_matrix @ lecture_vec
+        if low_data_mask.any():
+            blended = self.config.prototype_weight * scores + self.config.label_weight * (label_matrix @ lecture_vec)
+            scores = np.where(low_data_mask, blended, scores)
+        
+        return {tag_id: float(score) for tag_id, score in zip(tag_ids, scores)}
+    
+    def threshold_for(self, tag_id: str) -> float:
+        """Calibrated threshold of a tag (score_lecture keeps scores >= this)."""
+        return self.tag_thresholds.get(tag_id, self.config.min_confidence_threshold)
+    
+    def prototype_tag_ids(self, tag_embeddings: Dict[str, np.ndarray]) -> List[str]:
+        """Column order of the cached score matrices (stable until prototypes change)."""
+        return self._get_score_matrices(tag_embeddings)[0]
+    
+    def _get_score_matrices(self, tag_embeddings: Dict[str, np.ndarray]):
+        """Build (and cache) normalized prototype/label matrices for batch scoring."""
+        cache_key = (id(self.tag_prototypes), len(self.tag_prototypes), id(tag_embeddings), id(self.tag_thresholds))
+        cached = getattr(self, '_score_matrices', None)
+        if cached and cached[0] == cache_key:
+            return cached[1]
+        
+        tag_ids = list(self.tag_prototypes.keys())
+        
+        if tag_ids:
+            proto_matrix = np.stack([np.asarray(self.tag_prototypes[t], dtype=np.float32) for t in tag_ids])
+            proto_matrix = proto_matrix / (np.linalg.norm(proto_matrix, axis=1, keepdims=True) + 1e-10)
+            
+            low_data_mask = np.array([
+                bool(self.tag_stats.get(t, {}).get('is_low_data', False)) and t in tag_embeddings
+                for t in tag_ids
+            ])
+            label_matrix = np.stack([
+                np.asarray(tag_embeddings[t], dtype=np.float32) if low else np.zeros(proto_matrix.shape[1], dtype=np.float32)
+                for t, low in zip(tag_ids, low_data_mask)
+            ])
+            label_matrix = label_matrix / (np.linalg.norm(label_matrix, axis=1, keepdims=True) + 1e-10)
+            
+            thresholds = np.array([
+                self.tag_thresholds.get(t, self.config.min_confidence_threshold) for t in tag_ids
+            ], dtype=np.float32)
+        else:
+            proto_matrix = label_matrix = np.zeros((0, 0), dtype=np.float32)
+            low_data_mask = np.zeros(0, dtype=bool)
+            thresholds = np.zeros(0, dtype=np.float32)
+        
+        matrices = (tag_ids, proto_matrix, label_matrix, low_data_mask, thresholds)
+        self._score_matrices = (cache_key, matrices)
+        return matrices
+    
     def _extract_tagged_lectures(self, lectures: List[Dict]) -> List[Dict]:
         tagged = []
         for lecture in lectures:
@@ -8,7 +8,7 @@ import os
 import json
 import logging
 import numpy as np
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import psycopg2
 from psycopg2.extras import Json
@@ -76,6 +76,18 @@ class PrototypeStorage:
                     )
                 """)
                 
+                # Label sets registered once and referenced by artifact_version in requests
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS label_sets (
+                        artifact_version VARCHAR(255) PRIMARY KEY,
+                        version_id INTEGER REFERENCES prototype_versions(id) ON DELETE SET NULL,
+                        fingerprint VARCHAR(64) NOT NULL,
+                        labels JSONB NOT NULL,
+                        num_labels INTEGER,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
                 # AI calls tracking table
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS ai_calls (
@@ -97,6 +109,40 @@ class PrototypeStorage:
                     )
                 """)
                 
+                # Shadow scoring comparisons (one row per shadow mode run, see src/shadow_scoring.py)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS shadow_results (
+                        id SERIAL PRIMARY KEY,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        request_id VARCHAR(255),
+                        lecture_id VARCHAR(255),
+                        primary_mode VARCHAR(50) NOT NULL,
+                        shadow_mode VARCHAR(50) NOT NULL,
+                        primary_degraded BOOLEAN,
+                        num_primary INTEGER,
+                        num_shadow INTEGER,
+                        num_common INTEGER,
+                        jaccard FLOAT,
+                        top1_match BOOLEAN,
+                        mean_abs_delta FLOAT,
+                        max_abs_delta FLOAT,
+                        duration_ms FLOAT,
+                        estimated_cost_usd FLOAT,
+                        error_message TEXT
+                    )
+                """)
+                
+                # Validators of the last external dataset trained on (see src/training_data_fetcher.py)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS training_data_sync (
+                        source_url TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_modified TEXT,
+                        fingerprint VARCHAR(64),
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
                 # Create indexes for faster lookups
                 cur.execute("""
                     CREATE INDEX IF NOT EXISTS idx_tag_prototypes_version 
@@ -122,6 +168,14 @@ class PrototypeStorage:
                     CREATE INDEX IF NOT EXISTS idx_ai_calls_call_type 
                     ON ai_calls(call_type)
                 """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_shadow_results_created_at 
+                    ON shadow_results(created_at)
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_shadow_results_modes 
+                    ON shadow_results(primary_mode, shadow_mode)
+                """)
                 
                 conn.commit()
                 logger.info("Prototype storage schema ensured")
@@ -321,3 +375,111 @@ class PrototypeStorage:
                     'avg_similarity': row[4],
                     'vector_dimension': row[5]
                 }
+
+    def save_label_set(
+        self,
+        artifact_version: str,
+        labels: List[dict],
+        fingerprint: str,
+        version_name: str = 'default'
+    ) -> Optional[int]:
+        """
+        Register (or replace) the labels list for an artifact_version.
+        
+        The label set is linked to the currently active prototype version.
+        Returns that version_id (None if no version is active).
+        """
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO label_sets (artifact_version, version_id, fingerprint, labels, num_labels)
+                    VALUES (
+                        %s,
+                        (SELECT id FROM prototype_versions
+                         WHERE version_name = %s AND is_active = TRUE
+                         ORDER BY created_at DESC LIMIT 1),
+                        %s, %s, %s
+                    )
+                    ON CONFLICT (artifact_version)
+                    DO UPDATE SET
+                        version_id = EXCLUDED.version_id,
+                        fingerprint = EXCLUDED.fingerprint,
+                        labels = EXCLUDED.labels,
+                        num_labels = EXCLUDED.num_labels,
+                        created_at = CURRENT_TIMESTAMP
+                    RETURNING version_id
+                """, (artifact_version, version_name, fingerprint, Json(labels), len(labels)))
+                version_id = cur.fetchone()[0]
+                
+                conn.commit()
+                logger.info(f"Saved label set '{artifact_version}' ({len(labels)} labels, prototype version {version_id})")
+                return version_id
+    
+    def load_label_set(self, artifact_version: str) -> Optional[List[dict]]:
+        """Load the labels list registered for an artifact_version (None if unknown)."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT labels FROM label_sets WHERE artifact_version = %s
+                """, (artifact_version,))
+                
+                row = cur.fetchone()
+                return row[0] if row else None
+    
+    def list_label_sets(self) -> list:
+        """List registered label sets (without the labels themselves)."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT artifact_version, version_id, fingerprint, num_labels, created_at
+                    FROM label_sets
+                    ORDER BY created_at DESC
+                """)
+                
+                return [
+                    {
+                        'artifact_version': row[0],
+                        'version_id': row[1],
+                        'fingerprint': row[2],
+                        'num_labels': row[3],
+                        'created_at': row[4].isoformat() if row[4] else None
+                    }
+                    for row in cur.fetchall()
+                ]
+
+    def load_training_data_sync(self, source_url: str) -> Optional[dict]:
+        """Validators stored for a training data source (None if never trained from it)."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT etag, last_modified, fingerprint, updated_at
+                    FROM training_data_sync WHERE source_url = %s
+                """, (source_url,))
+                
+                row = cur.fetchone()
+                if not row:
+                    return None
+                return {
+                    'etag': row[0],
+                    'last_modified': row[1],
+                    'fingerprint': row[2],
+                    'updated_at': row[3].isoformat() if row[3] else None
+                }
+    
+    def save_training_data_sync(self, source_url: str, sync: dict) -> None:
+        """Record the validators of a dataset that was trained on successfully."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO training_data_sync (source_url, etag, last_modified, fingerprint)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (source_url)
+                    DO UPDATE SET
+                        etag = EXCLUDED.etag,
+                        last_modified = EXCLUDED.last_modified,
+                        fingerprint = EXCLUDED.fingerprint,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (source_url, sync.get('etag'), sync.get('last_modified'), sync.get('fingerprint')))
+                
+                conn.commit()
+                logger.info(f"Saved training data sync state for {source_url}")
@@ -1,15 +1,93 @@
+import asyncio
+import hashlib
 import logging
+import threading
 import time
 from typing import List, Dict, Optional, Literal, get_args
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import json
 from pydantic import BaseModel, Field, create_model
-from src.logging_utils import StructuredLogger, track_operation, _request_context
+from src.circuit_breaker import chat_breaker
+from src.deadline import llm_request_options
+from src.logging_utils import StructuredLogger, track_operation, record_llm_cost, _request_context
 from src.ai_call_logger import AICallLogger
+from src.label_catalog import LabelCatalog, assign_tag_codes, build_name_to_tag
+from src.llm_hedging import reasoning_hedger
+from src.lru_cache import TTLLRUCache
+from src.openai_clients import get_async_client
 
 logger = StructuredLogger(__name__)
 ai_call_logger = AICallLogger()
 
+SYSTEM_PROMPT = """אתה מומחה בתיוג הרצאות בעברית. תפקידך לקרוא את תוכן ההרצאה ולהציע תגיות רלוונטיות.
+
+## קטגוריות תגיות
+תגיות מחולקות ל-5 קטגוריות, כל אחת משרתת מטרה שונה:
+
+1. **נושא (Topic)**: התוכן המרכזי של ההרצאה - על מה היא עוסקת?
+   - דוגמאות: פילוסופיה, הורות, הייטק, זוגיות, גיאופוליטיקה, כלכלה, חיים בריאים
+
+2. **פרסונה (Persona)**: מי המרצה או איזה סוג דמות מדבר?
+   - דוגמאות: אושיות רשת, מוזיקאים, מקצוענים, גיבורים, מנחי קבוצות
+
+3. **טון (Tone)**: האווירה והגישה הרגשית של ההרצאה
+   - דוגמאות: סיפור אישי, מצחיק, מרגש, פרקטי, מניע לפעולה
+
+4. **פורמט (Format)**: המבנה והסגנון של ההרצאה
+   - דוגמאות: פאנל, שיחה פתוחה, הכשרה מעשית, סיור, הנחיית אירועים
+
+5. **קהל יעד (Audience)**: למי ההרצאה מיועדת?
+   - דוגמאות: הרצאות למורים, הרצאות לנשים, הרצאות להייטק, דוברי אנגלית, הרצאות לגיל השלישי
+
+## כללים חשובים
+1. היה **שמרן** ברמת הביטחון - הצע רק תגיות שהן ממש רלוונטיות
+2. השתמש ברמות ביטחון שונות: 0.60-0.70 לרלוונטיות בסיסית, 0.70-0.80 לרלוונטיות טובה, 0.80-0.95 רק לרלוונטיות מצוינת ומובהקת
+3. התמקד בנושא המרכזי של ההרצאה - אל תציע יותר מדי תגיות
+4. **שים לב לקטגוריה** של כל תגית - זה עוזר להבין את ההקשר והשימוש שלה
+5. השתמש במידע על המרצה כדי להבין טוב יותר את תוכן ההרצאה
+6. תן נימוק ברור בעברית למה התגית מתאימה
+7. אם אין תגיות מתאימות - אל תציע כלום
+8. העדף דיוק (precision) על פני כיסוי (recall) - עדיף פחות תגיות נכונות מאשר תגיות שגויות
+
+## ⚠️ אזהרה קריטית: שימוש מדויק בשמות תגיות
+**חובה להשתמש בשמות התגיות בדיוק כפי שהן מופיעות ברשימה!**
+
+דוגמאות לטעויות נפוצות (אל תעשה כך):
+- ❌ שגוי: "חברה ישראלית" במקום "החברה הישראלית" (חסר ה' הידיעה)
+- ❌ שגוי: "עיתונאות" במקום "מדיה ותקשורת" (המצאת תגית חדשה)
+- ❌ שגוי: "גזענות" במקום התגית הקיימת שמכסה את הנושא
+- ✅ נכון: העתק את השם **תו-תו** מהרשימה למעלה
+
+כל תו משנה - כולל ה' הידיעה, רווחים, ו' החיבור. אם אתה חושב שנושא רלוונטי אבל אין תגית מדויקת - אל תציע כלום.
+
+## הנחיות לפי קטגוריה
+(מקום להנחיות ספציפיות לכל קטגוריה בעתיד)"""
+
+# Extra system instructions for packed (multi-lecture) calls
+PACKED_SYSTEM_SUFFIX = """
+
+## תיוג מספר הרצאות בבקשה אחת
+ייתכן שתקבל מספר הרצאות, כל אחת עם מזהה (lecture_id) משלה.
+- תייג כל הרצאה **בנפרד** ובאופן עצמאי - אל תערבב מידע בין הרצאות
+- החזר תוצאה אחת לכל הרצאה, עם ה-lecture_id **בדיוק** כפי שהופיע"""
+
+# Extra system instructions for the compact (tag code) output format
+COMPACT_SYSTEM_SUFFIX = """
+
+## פורמט קודים מקוצר
+כל תגית ברשימה מסומנת בקוד קצר (למשל T12).
+- החזר רק את קוד התגית ורמת הביטחון - ללא שם התגית וללא נימוק
+- השתמש אך ורק בקודים שמופיעים ברשימה"""
+
+# Extra system instructions when rationales are limited or skipped (explain != "full")
+LEAN_SYSTEM_SUFFIX = """
+
+## פלט מקוצר
+אין צורך בנימוק לכל תגית ואין צורך בסיכום - החזר נימוקים רק אם הם נדרשים במפורש בפורמט הפלט."""
+
+# Per-request explanation levels: no rationales, rationales for the top suggestions only, or all
+EXPLAIN_LEVELS = ("none", "top_k", "full")
+
 class TagSuggestion(BaseModel):
     """Single tag suggestion with confidence and rationale."""
     tag_name_he: str = Field(description="Exact tag name from the provided list")
@@ -21,12 +99,280 @@ class TaggingResponse(BaseModel):
     suggestions: List[TagSuggestion] = Field(description="List of tag suggestions")
     reasoning_summary: str = Field(description="Hebrew summary of reasoning process")
 
+class LectureTagging(BaseModel):
+    """Tag suggestions for one lecture inside a packed response."""
+    lecture_id: str = Field(description="Lecture id exactly as given in the prompt")
+    suggestions: List[TagSuggestion] = Field(description="List of tag suggestions")
+
+class PackedTaggingResponse(BaseModel):
+    """Response model for multi-lecture (packed) tag suggestions."""
+    results: List[LectureTagging] = Field(description="One entry per lecture, keyed by lecture_id")
+
+class LeanTagSuggestion(BaseModel):
+    """Tag suggestion without rationale (explain levels "none" and "top_k")."""
+    tag_name_he: str = Field(description="Exact tag name from the provided list")
+    confidence: float = Field(description="Confidence score 0.0-1.0")
+
+class TagRationale(BaseModel):
+    """Rationale for one of the top suggestions."""
+    tag_name_he: str = Field(description="Exact tag name from the provided list")
+    rationale_he: str = Field(description="Short Hebrew rationale for why this tag fits")
+
+class LeanTaggingResponse(BaseModel):
+    """Response model for explain="none"."""
+    suggestions: List[LeanTagSuggestion] = Field(description="List of tag suggestions")
+
+class TopKTaggingResponse(BaseModel):
+    """Response model for explain="top_k"."""
+    suggestions: List[LeanTagSuggestion] = Field(description="List of tag suggestions")
+    top_rationales: List[TagRationale] = Field(description="Hebrew rationales for the highest-confidence suggestions only")
+
+class LeanLectureTagging(BaseModel):
+    """Lean tag suggestions for one lecture inside a packed response (explain="none")."""
+    lecture_id: str = Field(description="Lecture id exactly as given in the prompt")
+    suggestions: List[LeanTagSuggestion] = Field(description="List of tag suggestions")
+
+class TopKLectureTagging(LeanLectureTagging):
+    """Lean tag suggestions for one lecture inside a packed response (explain="top_k")."""
+    top_rationales: List[TagRationale] = Field(description="Hebrew rationales for the highest-confidence suggestions only")
+
+class PackedLeanTaggingResponse(BaseModel):
+    """Response model for packed tag suggestions with explain="none"."""
+    results: List[LeanLectureTagging] = Field(description="One entry per lecture, keyed by lecture_id")
+
+class PackedTopKTaggingResponse(BaseModel):
+    """Response model for packed tag suggestions with explain="top_k"."""
+    results: List[TopKLectureTagging] = Field(description="One entry per lecture, keyed by lecture_id")
+
+# Unconstrained response models by explain level ("packed*" = multi-lecture)
+FREE_RESPONSE_MODELS = {
+    'full': TaggingResponse,
+    'top_k': TopKTaggingResponse,
+    'none': LeanTaggingResponse,
+    'packed': PackedTaggingResponse,
+    'packed_top_k': PackedTopKTaggingResponse,
+    'packed_none': PackedLeanTaggingResponse
+}
+
+class CompactTagSuggestion(BaseModel):
+    """Tag suggestion in compact format: tag code and confidence only."""
+    code: str = Field(description="Tag code from the provided list, e.g. T12")
+    confidence: float = Field(description="Confidence score 0.0-1.0")
+
+class CompactTaggingResponse(BaseModel):
+    """Response model for compact tag suggestions."""
+    suggestions: List[CompactTagSuggestion] = Field(description="List of tag suggestions")
+
+# Enum-constrained response models, one set per distinct list of tag names
+response_model_cache = TTLLRUCache(max_entries=64, name='reasoning_response_models')
+
+def constrained_response_models(tag_names: List[str]) -> Dict[str, type]:
+    """
+    Build variants of the response models (keyed like FREE_RESPONSE_MODELS)
+    whose tag_name_he is an enum of the given names, so structured output can
+    only return existing tags. Cached by a hash of the names.
+    """
+    key = hashlib.sha256('\n'.join(tag_names).encode('utf-8')).hexdigest()[:16]
+    hit, models = response_model_cache.get(key)
+    if hit:
+        return models
+    
+    TagName = Literal[tuple(tag_names)]
+    suggestion_model = create_model(
+        'ConstrainedTagSuggestion',
+        __base__=TagSuggestion,
+        tag_name_he=(TagName, Field(description="Exact tag name from the provided list"))
+    )
+    response_model = create_model(
+        'ConstrainedTaggingResponse',
+        __base__=TaggingResponse,
+        suggestions=(List[suggestion_model], Field(description="List of tag suggestions"))
+    )
+    lecture_model = create_model(
+        'ConstrainedLectureTagging',
+        __base__=LectureTagging,
+        suggestions=(List[suggestion_model], Field(description="List of tag suggestions"))
+    )
+    packed_model = create_model(
+        'ConstrainedPackedTaggingResponse',
+        __base__=PackedTaggingResponse,
+        results=(List[lecture_model], Field(description="One entry per lecture, keyed by lecture_id"))
+    )
+    
+    lean_suggestion_model = create_model(
+        'ConstrainedLeanTagSuggestion',
+        __base__=LeanTagSuggestion,
+        tag_name_he=(TagName, Field(description="Exact tag name from the provided list"))
+    )
+    rationale_model = create_model(
+        'ConstrainedTagRationale',
+        __base__=TagRationale,
+        tag_name_he=(TagName, Field(description="Exact tag name from the provided list"))
+    )
+    lean_model = create_model(
+        'ConstrainedLeanTaggingResponse',
+        __base__=LeanTaggingResponse,
+        suggestions=(List[lean_suggestion_model], Field(description="List of tag suggestions"))
+    )
+    top_k_model = create_model(
+        'ConstrainedTopKTaggingResponse',
+        __base__=TopKTaggingResponse,
+        suggestions=(List[lean_suggestion_model], Field(description="List of tag suggestions")),
+        top_rationales=(List[rationale_model], Field(description="Hebrew rationales for the highest-confidence suggestions only"))
+    )
+    lean_lecture_model = create_model(
+        'ConstrainedLeanLectureTagging',
+        __base__=LeanLectureTagging,
+        suggestions=(List[lean_suggestion_model], Field(description="List of tag suggestions"))
+    )
+    top_k_lecture_model = create_model(
+        'ConstrainedTopKLectureTagging',
+        __base__=TopKLectureTagging,
+        suggestions=(List[lean_suggestion_model], Field(description="List of tag suggestions")),
+        top_rationales=(List[rationale_model], Field(description="Hebrew rationales for the highest-confidence suggestions only"))
+    )
+    packed_lean_model = create_model(
+        'ConstrainedPackedLeanTaggingResponse',
+        __base__=PackedLeanTaggingResponse,
+        results=(List[lean_lecture_model], Field(description="One entry per lecture, keyed by lecture_id"))
+    )
+    packed_top_k_model = create_model(
+        'ConstrainedPackedTopKTaggingResponse',
+        __base__=PackedTopKTaggingResponse,
+        results=(List[top_k_lecture_model], Field(description="One entry per lecture, keyed by lecture_id"))
+    )
+    
+    models = {
+        'full': response_model,
+        'top_k': top_k_model,
+        'none': lean_model,
+        'packed': packed_model,
+        'packed_top_k': packed_top_k_model,
+        'packed_none': packed_lean_model
+    }
+    response_model_cache.set(key, models)
+    return models
+
+def constrained_compact_model(codes: List[str]):
+    """CompactTaggingResponse variant whose code is an enum of the given codes (cached)."""
+    key = 'compact:' + hashlib.sha256('\n'.join(codes).encode('utf-8')).hexdigest()[:16]
+    hit, model = response_model_cache.get(key)
+    if hit:
+        return model
+    
+    suggestion_model = create_model(
+        'ConstrainedCompactTagSuggestion',
+        __base__=CompactTagSuggestion,
+        code=(Literal[tuple(codes)], Field(description="Tag code from the provided list, e.g. T12"))
+    )
+    model = create_model(
+        'ConstrainedCompactTaggingResponse',
+        __base__=CompactTaggingResponse,
+        suggestions=(List[suggestion_model], Field(description="List of tag suggestions"))
+    )
+    
+    response_model_cache.set(key, model)
+    return model
+
+class ReasoningOutputStats:
+    """
+    Output tokens, latency and discarded (unknown) tags per output format
+    variant ("free", "constrained", "compact", ...).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict] = {}
+    
+    def record(self, variant: str, output_tokens: int, duration_ms: float, num_suggestions: int, num_discarded: int) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                variant,
+                {'calls': 0, 'output_tokens': 0, 'duration_ms': 0.0, 'suggestions': 0, 'discarded': 0}
+            )
+            counts['calls'] += 1
+            counts['output_tokens'] += output_tokens
+            counts['duration_ms'] += duration_ms
+            counts['suggestions'] += num_suggestions
+            counts['discarded'] += num_discarded
+    
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                variant: {
+                    'calls': counts['calls'],
+                    'suggestions': counts['suggestions'],
+                    'discarded': counts['discarded'],
+                    'avg_output_tokens': round(counts['output_tokens'] / counts['calls'], 1) if counts['calls'] else 0.0,
+                    'avg_latency_ms': round(counts['duration_ms'] / counts['calls'], 1) if counts['calls'] else 0.0,
+                    'discard_rate': round(counts['discarded'] / counts['suggestions'], 4) if counts['suggestions'] else 0.0
+                }
+                for variant, counts in self._counts.items()
+            }
+
+reasoning_output_stats = ReasoningOutputStats()
+
 class ReasoningScorer:
-    def __init__(self, model: str = "gpt-4o", min_confidence: float = 0.80, confidence_scale: float = 0.85):
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        min_confidence: float = 0.80,
+        confidence_scale: float = 0.85,
+        pack_size: int = 1,
+        constrained_output: bool = True,
+        compact_codes: bool = False,
+        explain: str = "full",
+        explain_top_k: int = 3,
+        hedging: bool = False
+    ):
         self.client = OpenAI()
         self.model = model
         self.min_confidence = min_confidence
         self.confidence_scale = confidence_scale  # Calibration factor for over-confident LLMs
+        self.pack_size = pack_size  # Lectures per LLM call in score_batch
+        self.constrained_output = constrained_output  # Enum of exact tag names in the response schema
+        self.compact_codes = compact_codes  # Tags as short codes (T12) in prompt and output, no rationales
+        self.explain = explain if explain in EXPLAIN_LEVELS else "full"  # Rationales: none / top_k / full
+        self.explain_top_k = explain_top_k
+        self.hedging = hedging  # Duplicate single-lecture calls slower than the latency percentile
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Process-wide AsyncOpenAI client (created on first async call, not per scorer)."""
+        return get_async_client()
+    
+    @property
+    def output_variant(self) -> str:
+        """Output format label used in metrics."""
+        if self.compact_codes:
+            return "compact"
+        variant = "constrained" if self.constrained_output else "free"
+        return variant if self.explain == "full" else f"{variant}:{self.explain}"
+    
+    def _code_to_tag(self, tags: List[Dict], catalog: Optional[LabelCatalog]) -> Dict[str, Dict]:
+        if catalog is not None and tags is catalog.tags_for_scorer:
+            return catalog.code_to_tag
+        return assign_tag_codes(tags)
+    
+    def _single_response_model(self, tags: List[Dict], catalog: Optional[LabelCatalog]):
+        """Response model for a single-lecture call in the configured output format."""
+        if self.compact_codes:
+            if not self.constrained_output or not tags:
+                return CompactTaggingResponse
+            return constrained_compact_model(list(self._code_to_tag(tags, catalog).keys()))
+        return self._response_models(tags)[self.explain]
+    
+    def _response_models(self, tags: List[Dict]) -> Dict[str, type]:
+        """Response models for a tag list by explain level - enum-constrained unless disabled."""
+        if not self.constrained_output:
+            return FREE_RESPONSE_MODELS
+        
+        tag_names = list(dict.fromkeys(
+            tag.get('name_he', '').strip() for tag in tags if tag.get('name_he', '').strip()
+        ))
+        if not tag_names:
+            return FREE_RESPONSE_MODELS
+        return constrained_response_models(tag_names)
     
     def _estimate_llm_tokens(self, messages: List[Dict]) -> tuple[int, int]:
         """Estimate input/output tokens (rough: 1 token ~ 4 chars)."""
@@ -35,68 +381,318 @@ class ReasoningScorer:
         output_tokens = 200  # Conservative estimate for structured output
         return input_tokens, output_tokens
     
+    def _extract_usage(self, response, messages: List[Dict]) -> tuple[int, int, int, str]:
+        """Return (input_tokens, output_tokens, total_tokens, usage_source) for a completion."""
+        usage = response.usage
+        if usage and hasattr(usage, 'prompt_tokens'):
+            return usage.prompt_tokens, usage.completion_tokens, usage.total_tokens, "api"
+        
+        # Estimate when API doesn't provide usage
+        input_tokens, output_tokens = self._estimate_llm_tokens(messages)
+        return input_tokens, output_tokens, input_tokens + output_tokens, "estimated"
+    
+    @staticmethod
+    def _estimate_cost(input_tokens: int, output_tokens: int) -> float:
+        """Estimate cost (gpt-4o: $5.00/1M input, $15.00/1M output)."""
+        return (input_tokens / 1_000_000 * 5.00) + (output_tokens / 1_000_000 * 15.00)
+    
+    def estimate_call_cost(
+        self,
+        lecture: Dict,
+        tags: List[Dict],
+        lecturer_profile: Optional[str] = None,
+        catalog: Optional[LabelCatalog] = None
+    ) -> float:
+        """Estimated USD cost of score_lecture for these tags, before making the call."""
+        messages = self._build_messages(lecture, tags, lecturer_profile, catalog)
+        return self._estimate_cost(*self._estimate_llm_tokens(messages))
+    
     def score_lecture(
         self,
         lecture: Dict,
         all_tags: List[Dict],
         lecturer_profile: Optional[str] = None,
-        candidate_tags: Optional[List[Dict]] = None
+        candidate_tags: Optional[List[Dict]] = None,
+        catalog: Optional[LabelCatalog] = None
+    ) -> List[Dict]:
+        tags_to_consider = candidate_tags if candidate_tags and len(candidate_tags) > 0 else all_tags
+        messages = self._build_messages(lecture, tags_to_consider, lecturer_profile, catalog)
+        
+        # Get request_id from context for correlation
+        request_id = getattr(_request_context, 'request_id', None)
+        
+        # Track call timing
+        call_start_time = time.time()
+        
+        try:
+            with track_operation("reasoning_llm_call", logger, lecture_id=lecture.get('id'), num_tags=len(tags_to_consider)):
+                response_format = self._single_response_model(tags_to_consider, catalog)
+                response = chat_breaker.call(lambda: reasoning_hedger.call(
+                    lambda: self.client.beta.chat.completions.parse(
+                        model=self.model,
+                        messages=messages,
+                        temperature=0.2,
+                        response_format=response_format,
+                        **llm_request_options()
+                    ),
+                    hedge=self.hedging
+                ))
+            
+            return self._handle_response(response, messages, lecture, all_tags, tags_to_consider, call_start_time, request_id, catalog)
+        
+        except Exception as e:
+            return self._handle_error(e, messages, lecture, call_start_time, request_id)
+    
+    async def ascore_lecture(
+        self,
+        lecture: Dict,
+        all_tags: List[Dict],
+        lecturer_profile: Optional[str] = None,
+        candidate_tags: Optional[List[Dict]] = None,
+        catalog: Optional[LabelCatalog] = None
     ) -> List[Dict]:
+        """Async variant of score_lecture using AsyncOpenAI (same prompt, parsing and logging)."""
         tags_to_consider = candidate_tags if candidate_tags and len(candidate_tags) > 0 else all_tags
+        messages = self._build_messages(lecture, tags_to_consider, lecturer_profile, catalog)
         
+        request_id = getattr(_request_context, 'request_id', None)
+        call_start_time = time.time()
+        
+        try:
+            with track_operation("reasoning_llm_call_async", logger, lecture_id=lecture.get('id'), num_tags=len(tags_to_consider)):
+                response_format = self._single_response_model(tags_to_consider, catalog)
+                response = await chat_breaker.acall(lambda: reasoning_hedger.acall(
+                    lambda: self.async_client.beta.chat.completions.parse(
+                        model=self.model,
+                        messages=messages,
+                        temperature=0.2,
+                        response_format=response_format,
+                        **llm_request_options()
+                    ),
+                    hedge=self.hedging
+                ))
+            
+            # DB audit logging is blocking - keep it off the event loop
+            return await asyncio.to_thread(
+                self._handle_response, response, messages, lecture, all_tags, tags_to_consider, call_start_time, request_id, catalog
+            )
+        
+        except Exception as e:
+            return await asyncio.to_thread(self._handle_error, e, messages, lecture, call_start_time, request_id)
+    
+    def _build_messages(
+        self,
+        lecture: Dict,
+        tags_to_consider: List[Dict],
+        lecturer_profile: Optional[str],
+        catalog: Optional[LabelCatalog] = None
+    ) -> List[Dict]:
         logger.info(f"Considering {len(tags_to_consider)} tags for lecture {lecture.get('id')}")
         if tags_to_consider and len(tags_to_consider) > 0:
             sample_tag = tags_to_consider[0]
             logger.info(f"Sample tag structure: {sample_tag}")
         
-        prompt = self._build_prompt(lecture, tags_to_consider, lecturer_profile)
+        code_by_tag_id = None
+        if self.compact_codes:
+            code_by_tag_id = {tag['tag_id']: code for code, tag in self._code_to_tag(tags_to_consider, catalog).items()}
         
-        messages = [
+        # The tag block only depends on the label set - render it once per catalog
+        tags_block = None
+        if catalog is not None and tags_to_consider is catalog.tags_for_scorer:
+            tags_block = catalog.memo(
+                'reasoning_compact_tags_block' if self.compact_codes else 'reasoning_tags_block',
+                lambda: self._build_tags_block(tags_to_consider, catalog.tags_by_category, code_by_tag_id)
+            )
+        
+        if self.compact_codes:
+            prompt = self._build_compact_prompt(lecture, tags_to_consider, lecturer_profile, code_by_tag_id, tags_block)
+        else:
+            prompt = self._build_prompt(lecture, tags_to_consider, lecturer_profile, tags_block)
+        
+        return [
             {
                 "role": "system",
-                "content": """אתה מומחה בתיוג הרצאות בעברית. תפקידך לקרוא את תוכן ההרצאה ולהציע תגיות רלוונטיות.
-
-## קטגוריות תגיות
-תגיות מחולקות ל-5 קטגוריות, כל אחת משרתת מטרה שונה:
-
-1. **נושא (Topic)**: התוכן המרכזי של ההרצאה - על מה היא עוסקת?
-   - דוגמאות: פילוסופיה, הורות, הייטק, זוגיות, גיאופוליטיקה, כלכלה, חיים בריאים
-
-2. **פרסונה (Persona)**: מי המרצה או איזה סוג דמות מדבר?
-   - דוגמאות: אושיות רשת, מוזיקאים, מקצוענים, גיבורים, מנחי קבוצות
-
-3. **טון (Tone)**: האווירה והגישה הרגשית של ההרצאה
-   - דוגמאות: סיפור אישי, מצחיק, מרגש, פרקטי, מניע לפעולה
-
-4. **פורמט (Format)**: המבנה והסגנון של ההרצאה
-   - דוגמאות: פאנל, שיחה פתוחה, הכשרה מעשית, סיור, הנחיית אירועים
-
-5. **קהל יעד (Audience)**: למי ההרצאה מיועדת?
-   - דוגמאות: הרצאות למורים, הרצאות לנשים, הרצאות להייטק, דוברי אנגלית, הרצאות לגיל השלישי
-
-## כללים חשובים
-1. היה **שמרן** ברמת הביטחון - הצע רק תגיות שהן ממש רלוונטיות
-2. השתמש ברמות ביטחון שונות: 0.60-0.70 לרלוונטיות בסיסית, 0.70-0.80 לרלוונטיות טובה, 0.80-0.95 רק לרלוונטיות מצוינת ומובהקת
-3. התמקד בנושא המרכזי של ההרצאה - אל תציע יותר מדי תגיות
-4. **שים לב לקטגוריה** של כל תגית - זה עוזר להבין את ההקשר והשימוש שלה
-5. השתמש במידע על המרצה כדי להבין טוב יותר את תוכן ההרצאה
-6. תן נימוק ברור בעברית למה התגית מתאימה
-7. אם אין תגיות מתאימות - אל תציע כלום
-8. העדף דיוק (precision) על פני כיסוי (recall) - עדיף פחות תגיות נכונות מאשר תגיות שגויות
-
-## ⚠️ אזהרה קריטית: שימוש מדויק בשמות תגיות
-**חובה להשתמש בשמות התגיות בדיוק כפי שהן מופיעות ברשימה!**
+                "content": self._system_prompt()
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _system_prompt(self) -> str:
+        if self.compact_codes:
+            return SYSTEM_PROMPT + COMPACT_SYSTEM_SUFFIX
+        if self.explain != "full":
+            return SYSTEM_PROMPT + LEAN_SYSTEM_SUFFIX
+        return SYSTEM_PROMPT
+        
+    def _packed_system_prompt(self) -> str:
+        """System prompt for packed calls (tag names, rationales per the explain level)."""
+        if self.explain != "full":
+            return SYSTEM_PROMPT + LEAN_SYSTEM_SUFFIX + PACKED_SYSTEM_SUFFIX
+        return SYSTEM_PROMPT + PACKED_SYSTEM_SUFFIX
+    
+    def _handle_response(
+        self,
+        response,
+        messages: List[Dict],
+        lecture: Dict,
+        all_tags: List[Dict],
+        tags_to_consider: List[Dict],
+        call_start_time: float,
+        request_id: Optional[str],
+        catalog: Optional[LabelCatalog] = None
+    ) -> List[Dict]:
+        # Calculate call duration
+        call_duration_ms = (time.time() - call_start_time) * 1000
+                
+        # Track LLM usage (with fallback estimation)
+        input_tokens, output_tokens, total_tokens, usage_source = self._extract_usage(response, messages)
+        cost = self._estimate_cost(input_tokens, output_tokens)
+        record_llm_cost(cost)
+                
+        logger.info(
+            "LLM reasoning call completed",
+            model=self.model,
+            lecture_id=lecture.get('id'),
+            num_candidate_tags=len(tags_to_consider),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=total_tokens,
+            estimated_cost_usd=round(cost, 6),
+            usage_source=usage_source
+        )
+            
+        result = response.choices[0].message.parsed
+            
+        # Prepare response content for database logging
+        response_content = None
+        if result and self.compact_codes:
+            response_content = {
+                'suggestions': [{'code': str(sugg.code), 'confidence': sugg.confidence} for sugg in result.suggestions]
+            }
+        elif result:
+            response_content = {
+                'suggestions': self._suggestions_for_log(result.suggestions),
+                'reasoning_summary': getattr(result, 'reasoning_summary', None)
+            }
+            if hasattr(result, 'top_rationales'):
+                response_content['top_rationales'] = [
+                    {'tag_name_he': str(r.tag_name_he), 'rationale_he': r.rationale_he} for r in result.top_rationales
+                ]
+            
+        # Log AI call to database
+        ai_call_logger.log_call(
+            call_type="reasoning_scorer",
+            model=self.model,
+            prompt_messages=messages,
+            response_content=response_content,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=total_tokens,
+            estimated_cost_usd=cost,
+            duration_ms=call_duration_ms,
+            status="success",
+            request_id=request_id,
+            lecture_id=lecture.get('id')
+        )
+            
+        if result is None:
+            logger.warning(f"No parsed result for lecture {lecture.get('id')}")
+            return []
+            
+        if self.compact_codes:
+            code_to_tag = self._code_to_tag(tags_to_consider, catalog)
+            formatted_suggestions = self._format_compact_suggestions(result.suggestions, code_to_tag)
+            num_discarded = sum(1 for sugg in result.suggestions if str(sugg.code).strip() not in code_to_tag)
+        else:
+            name_to_tag = catalog.name_to_tag if catalog is not None else self._build_name_to_tag(all_tags)
+            rationales = {
+                str(r.tag_name_he).strip(): r.rationale_he for r in getattr(result, 'top_rationales', [])
+            }
+            formatted_suggestions = self._format_suggestions(result.suggestions, name_to_tag, rationales)
+            num_discarded = self._count_unknown(result.suggestions, name_to_tag)
+        reasoning_output_stats.record(
+            self.output_variant, output_tokens, call_duration_ms, len(result.suggestions), num_discarded
+        )
+            
+        logger.info(
+            "Reasoning scoring completed",
+            lecture_id=lecture.get('id'),
+            num_suggestions=len(formatted_suggestions),
+            filtered_from=len(result.suggestions),
+            discarded_unknown_tags=num_discarded,
+            output_variant=self.output_variant
+        )
+            
+        return formatted_suggestions
+        
+    def _handle_error(
+        self,
+        error: Exception,
+        messages: List[Dict],
+        lecture: Dict,
+        call_start_time: float,
+        request_id: Optional[str]
+    ) -> List[Dict]:
+        # Log failed AI call to database
+        call_duration_ms = (time.time() - call_start_time) * 1000
+            
+        ai_call_logger.log_call(
+            call_type="reasoning_scorer",
+            model=self.model,
+            prompt_messages=messages,
+            response_content=None,
+            input_tokens=0,
+            output_tokens=0,
+            total_tokens=0,
+            estimated_cost_usd=0.0,
+            duration_ms=call_duration_ms,
+            status="error",
+            error_message=str(error),
+            request_id=request_id,
+            lecture_id=lecture.get('id')
+        )
+            
+        logger.error(
+            "Error in reasoning scorer",
+            lecture_id=lecture.get('id'),
+            error_type=type(error).__name__,
+            error_message=str(error)
+        )
+        return []
+    
+    def score_lectures_packed(
+        self,
+        lectures: List[Dict],
+        all_tags: List[Dict],
+        lecturer_profiles: Optional[Dict[str, Optional[str]]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Score several lectures in a single structured-output call.
 
-דוגמאות לטעויות נפוצות (אל תעשה כך):
-- ❌ שגוי: "חברה ישראלית" במקום "החברה הישראלית" (חסר ה' הידיעה)
-- ❌ שגוי: "עיתונאות" במקום "מדיה ותקשורת" (המצאת תגית חדשה)
-- ❌ שגוי: "גזענות" במקום התגית הקיימת שמכסה את הנושא
-- ✅ נכון: העתק את השם **תו-תו** מהרשימה למעלה
+        The system prompt and the tag list are sent once for the whole pack,
+        so input tokens per lecture drop roughly by the pack size.
 
-כל תו משנה - כולל ה' הידיעה, רווחים, ו' החיבור. אם אתה חושב שנושא רלוונטי אבל אין תגית מדויקת - אל תציע כלום.
+        Args:
+            lectures: Lectures in scorer format (id, lecture_title, lecture_description, lecturer_name)
+            all_tags: Tags in scorer format (tag_id, name_he, synonyms_he, category)
+            lecturer_profiles: Optional lecture id -> lecturer bio mapping
 
-## הנחיות לפי קטגוריה
-(מקום להנחיות ספציפיות לכל קטגוריה בעתיד)"""
+        Returns:
+            Dict of str(lecture_id) -> formatted suggestions. Lectures the model
+            did not return are absent from the dict.
+        """
+        lecturer_profiles = lecturer_profiles or {}
+        lecture_ids = [str(lecture['id']) for lecture in lectures]
+        
+        prompt = self._build_packed_prompt(lectures, all_tags, lecturer_profiles)
+        
+        messages = [
+            {
+                "role": "system",
+                "content": self._packed_system_prompt()
             },
             {
                 "role": "user",
@@ -104,71 +700,59 @@ class ReasoningScorer:
             }
         ]
         
-        # Get request_id from context for correlation
         request_id = getattr(_request_context, 'request_id', None)
-        
-        # Track call timing
         call_start_time = time.time()
         
         try:
-            
-            with track_operation("reasoning_llm_call", logger, lecture_id=lecture.get('id'), num_tags=len(tags_to_consider)):
-                response = self.client.beta.chat.completions.parse(
+            with track_operation("reasoning_packed_llm_call", logger, num_lectures=len(lectures), num_tags=len(all_tags)):
+                response = chat_breaker.call(lambda: self.client.beta.chat.completions.parse(
                     model=self.model,
                     messages=messages,
                     temperature=0.2,
-                    response_format=TaggingResponse
-                )
+                    response_format=self._response_models(all_tags)[self._packed_model_key()],
+                    **llm_request_options()
+                ))
                 
-                # Calculate call duration
                 call_duration_ms = (time.time() - call_start_time) * 1000
                 
-                # Track LLM usage (with fallback estimation)
-                usage = response.usage
-                if usage and hasattr(usage, 'prompt_tokens'):
-                    input_tokens = usage.prompt_tokens
-                    output_tokens = usage.completion_tokens
-                    total_tokens = usage.total_tokens
-                else:
-                    # Estimate when API doesn't provide usage
-                    input_tokens, output_tokens = self._estimate_llm_tokens(messages)
-                    total_tokens = input_tokens + output_tokens
-                
-                # Estimate cost (gpt-4o: $5.00/1M input, $15.00/1M output)
-                cost = (input_tokens / 1_000_000 * 5.00) + (output_tokens / 1_000_000 * 15.00)
+                input_tokens, output_tokens, total_tokens, usage_source = self._extract_usage(response, messages)
+                cost = self._estimate_cost(input_tokens, output_tokens)
+                record_llm_cost(cost)
                 
                 logger.info(
-                    "LLM reasoning call completed",
+                    "LLM packed reasoning call completed",
                     model=self.model,
-                    lecture_id=lecture.get('id'),
-                    num_candidate_tags=len(tags_to_consider),
+                    num_lectures=len(lectures),
+                    num_candidate_tags=len(all_tags),
                     input_tokens=input_tokens,
                     output_tokens=output_tokens,
                     total_tokens=total_tokens,
+                    input_tokens_per_lecture=input_tokens // max(len(lectures), 1),
                     estimated_cost_usd=round(cost, 6),
-                    usage_source="api" if usage and hasattr(usage, 'prompt_tokens') else "estimated"
+                    usage_source=usage_source
                 )
             
             result = response.choices[0].message.parsed
             
-            # Prepare response content for database logging
             response_content = None
             if result:
                 response_content = {
-                    'suggestions': [
+                    'lecture_ids': lecture_ids,
+                    'results': [
                         {
-                            'tag_name_he': str(sugg.tag_name_he),
-                            'confidence': sugg.confidence,
-                            'rationale_he': sugg.rationale_he
+                            'lecture_id': item.lecture_id,
+                            'suggestions': self._suggestions_for_log(item.suggestions),
+                            'top_rationales': [
+                                {'tag_name_he': str(r.tag_name_he), 'rationale_he': r.rationale_he}
+                                for r in getattr(item, 'top_rationales', [])
+                            ]
                         }
-                        for sugg in result.suggestions
-                    ],
-                    'reasoning_summary': result.reasoning_summary
+                        for item in result.results
+                    ]
                 }
             
-            # Log AI call to database
             ai_call_logger.log_call(
-                call_type="reasoning_scorer",
+                call_type="reasoning_scorer_packed",
                 model=self.model,
                 prompt_messages=messages,
                 response_content=response_content,
@@ -178,72 +762,54 @@ class ReasoningScorer:
                 estimated_cost_usd=cost,
                 duration_ms=call_duration_ms,
                 status="success",
-                request_id=request_id,
-                lecture_id=lecture.get('id')
+                request_id=request_id
             )
             
             if result is None:
-                logger.warning(f"No parsed result for lecture {lecture.get('id')}")
-                return []
-            
-            # Create name -> tag_id mapping for post-processing
-            name_to_tag = {}
-            for tag in all_tags:
-                name_he = tag.get('name_he', '').strip()
-                if name_he:
-                    name_to_tag[name_he] = tag
-                    
-                    # Also add synonyms as aliases
-                    synonyms = tag.get('synonyms_he', '').strip()
-                    if synonyms:
-                        for synonym in synonyms.split(','):
-                            synonym = synonym.strip()
-                            if synonym:
-                                name_to_tag[synonym] = tag
-            
-            formatted_suggestions = []
-            for sugg in result.suggestions:
-                # Extract tag name (Literal type returns string directly)
-                tag_name = str(sugg.tag_name_he).strip()
-                
-                if tag_name not in name_to_tag:
+                logger.warning(f"No parsed result for packed lectures {lecture_ids}")
+                return {}
+            
+            name_to_tag = self._build_name_to_tag(all_tags)
+            known_ids = set(lecture_ids)
+            
+            # Packed calls always use tag names (compact codes apply to single-lecture calls)
+            variant = "packed_constrained" if self.constrained_output else "packed_free"
+            reasoning_output_stats.record(
+                variant if self.explain == "full" else f"{variant}:{self.explain}",
+                output_tokens,
+                call_duration_ms,
+                sum(len(item.suggestions) for item in result.results),
+                sum(self._count_unknown(item.suggestions, name_to_tag) for item in result.results)
+            )
+            
+            packed_suggestions = {}
+            for item in result.results:
+                lecture_id = str(item.lecture_id).strip()
+                if lecture_id not in known_ids:
                     logger.warning(
-                        f"LLM returned tag name '{tag_name}' which doesn't match any known tag - skipping",
-                        request_id=getattr(_request_context, 'request_id', None)
+                        f"LLM returned unknown lecture_id '{lecture_id}' in packed response - skipping",
+                        request_id=request_id
                     )
                     continue
-                
-                matched_tag = name_to_tag[tag_name]
-                tag_id = matched_tag['tag_id']
-                
-                # Apply confidence calibration (LLMs tend to be over-confident)
-                calibrated_confidence = sugg.confidence * self.confidence_scale
-                
-                # Only include if calibrated confidence meets threshold
-                if calibrated_confidence >= self.min_confidence:
-                    formatted_suggestions.append({
-                        'tag_id': tag_id,
-                        'tag_name_he': tag_name,
-                        'score': calibrated_confidence,
-                        'rationale': sugg.rationale_he,
-                        'model': f'reasoning:{self.model}'
-                    })
+                rationales = {
+                    str(r.tag_name_he).strip(): r.rationale_he for r in getattr(item, 'top_rationales', [])
+                }
+                packed_suggestions[lecture_id] = self._format_suggestions(item.suggestions, name_to_tag, rationales)
             
             logger.info(
-                "Reasoning scoring completed",
-                lecture_id=lecture.get('id'),
-                num_suggestions=len(formatted_suggestions),
-                filtered_from=len(result.suggestions)
+                "Packed reasoning scoring completed",
+                num_lectures=len(lectures),
+                num_returned=len(packed_suggestions),
+                num_suggestions=sum(len(s) for s in packed_suggestions.values())
             )
             
-            return formatted_suggestions
-            
+            return packed_suggestions
+        
         except Exception as e:
-            # Log failed AI call to database
-            call_duration_ms = (time.time() - call_start_time) * 1000 if 'call_start_time' in locals() else 0
+            call_duration_ms = (time.time() - call_start_time) * 1000
             
             ai_call_logger.log_call(
-                call_type="reasoning_scorer",
+                call_type="reasoning_scorer_packed",
                 model=self.model,
                 prompt_messages=messages,
                 response_content=None,
@@ -254,27 +820,119 @@ class ReasoningScorer:
                 duration_ms=call_duration_ms,
                 status="error",
                 error_message=str(e),
-                request_id=request_id,
-                lecture_id=lecture.get('id')
+                request_id=request_id
             )
             
             logger.error(
-                "Error in reasoning scorer",
-                lecture_id=lecture.get('id'),
+                "Error in packed reasoning scorer",
+                lecture_ids=lecture_ids,
                 error_type=type(e).__name__,
                 error_message=str(e)
             )
-            return []
+            return {}
     
-    def _build_prompt(
+    def _packed_model_key(self) -> str:
+        """Key of the packed response model for the explain level ('packed' = full rationales)."""
+        return 'packed' if self.explain == "full" else f'packed_{self.explain}'
+    
+    @staticmethod
+    def _suggestions_for_log(suggestions: List[TagSuggestion]) -> List[Dict]:
+        return [
+            {
+                'tag_name_he': str(sugg.tag_name_he),
+                'confidence': sugg.confidence,
+                'rationale_he': getattr(sugg, 'rationale_he', None)
+            }
+            for sugg in suggestions
+        ]
+    
+    @staticmethod
+    def _build_name_to_tag(all_tags: List[Dict]) -> Dict[str, Dict]:
+        """Create name -> tag mapping for post-processing (names and synonyms)."""
+        return build_name_to_tag(all_tags)
+    
+    @staticmethod
+    def _count_unknown(suggestions: List[TagSuggestion], name_to_tag: Dict[str, Dict]) -> int:
+        """Suggestions whose tag name matches no known tag (discarded by _format_suggestions)."""
+        return sum(1 for sugg in suggestions if str(sugg.tag_name_he).strip() not in name_to_tag)
+    
+    def _format_suggestions(
+        self,
+        suggestions: List[TagSuggestion],
+        name_to_tag: Dict[str, Dict],
+        rationales: Optional[Dict[str, str]] = None
+    ) -> List[Dict]:
+        """
+        Map suggestions to tags, calibrate and threshold them. Lean suggestions
+        (explain != "full") take their rationale from `rationales`, if any.
+        """
+        rationales = rationales or {}
+        formatted_suggestions = []
+        for sugg in suggestions:
+            # Extract tag name (Literal type returns string directly)
+            tag_name = str(sugg.tag_name_he).strip()
+            
+            if tag_name not in name_to_tag:
+                logger.warning(
+                    f"LLM returned tag name '{tag_name}' which doesn't match any known tag - skipping",
+                    request_id=getattr(_request_context, 'request_id', None)
+                )
+                continue
+            
+            matched_tag = name_to_tag[tag_name]
+            tag_id = matched_tag['tag_id']
+            
+            # Apply confidence calibration (LLMs tend to be over-confident)
+            calibrated_confidence = sugg.confidence * self.confidence_scale
+            
+            # Only include if calibrated confidence meets threshold
+            if calibrated_confidence >= self.min_confidence:
+                formatted_suggestions.append({
+                    'tag_id': tag_id,
+                    'tag_name_he': tag_name,
+                    'score': calibrated_confidence,
+                    'rationale': getattr(sugg, 'rationale_he', None) or rationales.get(tag_name, ''),
+                    'model': f'reasoning:{self.model}'
+                })
+        return formatted_suggestions
+    
+    def _format_compact_suggestions(
+        self,
+        suggestions: List[CompactTagSuggestion],
+        code_to_tag: Dict[str, Dict]
+    ) -> List[Dict]:
+        """Map compact (code, confidence) suggestions back to tags."""
+        formatted_suggestions = []
+        for sugg in suggestions:
+            code = str(sugg.code).strip()
+            
+            if code not in code_to_tag:
+                logger.warning(
+                    f"LLM returned tag code '{code}' which doesn't match any known tag - skipping",
+                    request_id=getattr(_request_context, 'request_id', None)
+                )
+                continue
+            
+            matched_tag = code_to_tag[code]
+            calibrated_confidence = sugg.confidence * self.confidence_scale
+            
+            if calibrated_confidence >= self.min_confidence:
+                formatted_suggestions.append({
+                    'tag_id': matched_tag['tag_id'],
+                    'tag_name_he': matched_tag.get('name_he', ''),
+                    'score': calibrated_confidence,
+                    'rationale': '',
+                    'model': f'reasoning:{self.model}'
+                })
+        return formatted_suggestions
+    
+    def _build_lecture_block(
         self,
         lecture: Dict,
-        tags: List[Dict],
         lecturer_profile: Optional[str]
     ) -> str:
         prompt_parts = []
         
-        prompt_parts.append("# הרצאה לתיוג\n")
         prompt_parts.append(f"**כותרת:** {lecture.get('lecture_title', 'לא צוין')}\n")
         
         if lecture.get('lecture_description'):
@@ -283,18 +941,30 @@ class ReasoningScorer:
         if lecture.get('lecturer_name'):
             prompt_parts.append(f"**מרצה:** {lecture['lecturer_name']}\n")
             
-            if lecturer_profile:
-                prompt_parts.append(f"**רקע על המרצה:** {lecturer_profile}\n")
+        # Bios may be found by lecturer id alone, without a name
+        if lecturer_profile:
+            prompt_parts.append(f"**רקע על המרצה:** {lecturer_profile}\n")
+        
+        return "".join(prompt_parts)
+    
+    def _build_tags_block(
+        self,
+        tags: List[Dict],
+        tags_by_category: Optional[Dict[str, List[Dict]]] = None,
+        code_by_tag_id: Optional[Dict[str, str]] = None
+    ) -> str:
+        prompt_parts = []
         
         prompt_parts.append(f"\n# תגיות זמינות ({len(tags)} אופציות)\n")
         prompt_parts.append("התגיות מקובצות לפי קטגוריה:\n\n")
         
-        tags_by_category = {}
-        for tag in tags:
-            category = tag.get('category', 'Unknown')
-            if category not in tags_by_category:
-                tags_by_category[category] = []
-            tags_by_category[category].append(tag)
+        if tags_by_category is None:
+            tags_by_category = {}
+            for tag in tags:
+                category = tag.get('category', 'Unknown')
+                if category not in tags_by_category:
+                    tags_by_category[category] = []
+                tags_by_category[category].append(tag)
         
         # Debug logging to see what categories were found
         logger.info(f"Tags by category: {list(tags_by_category.keys())}, total tags: {len(tags)}")
@@ -322,16 +992,51 @@ class ReasoningScorer:
             prompt_parts.append(f"### {display_name}\n")
             
             for tag in category_tags:
-                # Show tag name first since that's what LLM will use
+                # Show tag name first since that's what LLM will use (or its code in compact mode)
                 tag_line = f"- **{tag.get('name_he', '')}**"
+                if code_by_tag_id is not None:
+                    tag_line = f"- {code_by_tag_id[tag['tag_id']]}: {tag.get('name_he', '')}"
                 if tag.get('synonyms_he'):
                     tag_line += f" (שמות נוספים: {tag['synonyms_he']})"
                 prompt_parts.append(tag_line + "\n")
             
             prompt_parts.append("\n")
         
+        return "".join(prompt_parts)
+    
+    def _build_exact_names_reminder(self) -> str:
+        prompt_parts = []
+        prompt_parts.append("## ⚠️ לפני שליחת התשובה - בדוק שנית!\n")
+        prompt_parts.append("**חובה:** ודא שכל שם תגית מועתק **תו-תו** מהרשימה למעלה.\n\n")
+        prompt_parts.append("טעויות נפוצות שצריך להימנע מהן:\n")
+        prompt_parts.append("- ❌ אל תשמיט את ה' הידיעה (דוגמה: \"חברה ישראלית\" במקום \"החברה הישראלית\")\n")
+        prompt_parts.append("- ❌ אל תמציא תגיות חדשות (דוגמה: \"עיתונאות\" כשיש \"מדיה ותקשורת\")\n")
+        prompt_parts.append("- ❌ אל תשנה רווחים או סימנים (דוגמה: \"בריאות-הנפש\" במקום \"בריאות הנפש\")\n")
+        prompt_parts.append("- ✅ העתק **בדיוק** כמו שמופיע ברשימה\n\n")
+        prompt_parts.append("המערכת תשייך את ה-ID אוטומטית לפי השם שתציין.\n")
+        return "".join(prompt_parts)
+    
+    def _build_prompt(
+        self,
+        lecture: Dict,
+        tags: List[Dict],
+        lecturer_profile: Optional[str],
+        tags_block: Optional[str] = None
+    ) -> str:
+        prompt_parts = []
+        
+        prompt_parts.append("# הרצאה לתיוג\n")
+        prompt_parts.append(self._build_lecture_block(lecture, lecturer_profile))
+        prompt_parts.append(tags_block if tags_block is not None else self._build_tags_block(tags))
+        
         prompt_parts.append("\n# משימה\n")
         prompt_parts.append("על בסיס תוכן ההרצאה והרקע על המרצה, הצע תגיות מתאימות **מתוך רשימת התגיות שסופקה בלבד**.\n\n")
+        
+        if self.explain != "full":
+            prompt_parts.append(self._build_lean_output_instructions())
+            prompt_parts.append(self._build_exact_names_reminder())
+            return "".join(prompt_parts)
+        
         prompt_parts.append("לכל תגית ציין:\n")
         prompt_parts.append("1. שם התגית בעברית (**העתק בדיוק** מהרשימה למעלה)\n")
         prompt_parts.append("2. רמת ביטחון (0.0-1.0)\n")
@@ -350,14 +1055,120 @@ class ReasoningScorer:
         prompt_parts.append('  "reasoning_summary": "בהתבסס על התוכן, נבחרו תגיות עם קשר ברור לנושא המרכזי."\n')
         prompt_parts.append('}\n')
         prompt_parts.append('```\n\n')
-        prompt_parts.append("## ⚠️ לפני שליחת התשובה - בדוק שנית!\n")
-        prompt_parts.append("**חובה:** ודא שכל שם תגית מועתק **תו-תו** מהרשימה למעלה.\n\n")
-        prompt_parts.append("טעויות נפוצות שצריך להימנע מהן:\n")
-        prompt_parts.append("- ❌ אל תשמיט את ה' הידיעה (דוגמה: \"חברה ישראלית\" במקום \"החברה הישראלית\")\n")
-        prompt_parts.append("- ❌ אל תמציא תגיות חדשות (דוגמה: \"עיתונאות\" כשיש \"מדיה ותקשורת\")\n")
-        prompt_parts.append("- ❌ אל תשנה רווחים או סימנים (דוגמה: \"בריאות-הנפש\" במקום \"בריאות הנפש\")\n")
-        prompt_parts.append("- ✅ העתק **בדיוק** כמו שמופיע ברשימה\n\n")
-        prompt_parts.append("המערכת תשייך את ה-ID אוטומטית לפי השם שתציין.\n")
+        prompt_parts.append(self._build_exact_names_reminder())
+        
+        return "".join(prompt_parts)
+    
+    def _build_lean_output_instructions(self) -> str:
+        """Task/output section for explain levels "none" and "top_k"."""
+        prompt_parts = []
+        prompt_parts.append("לכל תגית ציין:\n")
+        prompt_parts.append("1. שם התגית בעברית (**העתק בדיוק** מהרשימה למעלה)\n")
+        prompt_parts.append("2. רמת ביטחון (0.0-1.0)\n\n")
+        
+        if self.explain == "top_k":
+            prompt_parts.append(
+                f"בנוסף, ב-top_rationales תן נימוק קצר בעברית **רק** ל-{self.explain_top_k} "
+                "התגיות עם רמת הביטחון הגבוהה ביותר.\n\n"
+            )
+        else:
+            prompt_parts.append("אין צורך בנימוקים.\n\n")
+        
+        prompt_parts.append("## פורמט פלט נדרש (דוגמה)\n")
+        prompt_parts.append('```json\n')
+        prompt_parts.append('{\n')
+        prompt_parts.append('  "suggestions": [\n')
+        prompt_parts.append('    {"tag_name_he": "בריאות הנפש", "confidence": 0.88}\n')
+        if self.explain == "top_k":
+            prompt_parts.append('  ],\n')
+            prompt_parts.append('  "top_rationales": [\n')
+            prompt_parts.append('    {"tag_name_he": "בריאות הנפש", "rationale_he": "נימוק קצר בעברית"}\n')
+        prompt_parts.append('  ]\n')
+        prompt_parts.append('}\n')
+        prompt_parts.append('```\n\n')
+        return "".join(prompt_parts)
+    
+    def _build_compact_prompt(
+        self,
+        lecture: Dict,
+        tags: List[Dict],
+        lecturer_profile: Optional[str],
+        code_by_tag_id: Dict[str, str],
+        tags_block: Optional[str] = None
+    ) -> str:
+        prompt_parts = []
+        
+        prompt_parts.append("# הרצאה לתיוג\n")
+        prompt_parts.append(self._build_lecture_block(lecture, lecturer_profile))
+        prompt_parts.append(tags_block if tags_block is not None else self._build_tags_block(tags, code_by_tag_id=code_by_tag_id))
+        
+        prompt_parts.append("\n# משימה\n")
+        prompt_parts.append("על בסיס תוכן ההרצאה והרקע על המרצה, הצע תגיות מתאימות **מתוך רשימת התגיות שסופקה בלבד**.\n\n")
+        prompt_parts.append("לכל תגית החזר רק את הקוד שלה (למשל T12) ורמת ביטחון (0.0-1.0).\n\n")
+        
+        prompt_parts.append("## פורמט פלט נדרש (דוגמה)\n")
+        prompt_parts.append('```json\n')
+        prompt_parts.append('{"suggestions": [{"code": "T12", "confidence": 0.88}]}\n')
+        prompt_parts.append('```\n')
+        
+        return "".join(prompt_parts)
+    
+    def _build_packed_prompt(
+        self,
+        lectures: List[Dict],
+        tags: List[Dict],
+        lecturer_profiles: Dict[str, Optional[str]]
+    ) -> str:
+        prompt_parts = []
+        
+        # Shared tag block first, then one section per lecture
+        prompt_parts.append(self._build_tags_block(tags))
+        
+        prompt_parts.append(f"\n# הרצאות לתיוג ({len(lectures)} הרצאות)\n\n")
+        for lecture in lectures:
+            prompt_parts.append(f"## הרצאה lecture_id={lecture['id']}\n")
+            prompt_parts.append(self._build_lecture_block(lecture, lecturer_profiles.get(lecture['id'])))
+            prompt_parts.append("\n")
+        
+        prompt_parts.append("\n# משימה\n")
+        prompt_parts.append("לכל הרצאה בנפרד, הצע תגיות מתאימות **מתוך רשימת התגיות שסופקה בלבד**.\n\n")
+        prompt_parts.append("לכל הרצאה החזר את ה-lecture_id שלה, ולכל תגית ציין:\n")
+        prompt_parts.append("1. שם התגית בעברית (**העתק בדיוק** מהרשימה למעלה)\n")
+        if self.explain == "full":
+            prompt_parts.append("2. רמת ביטחון (0.0-1.0)\n")
+            prompt_parts.append("3. נימוק קצר בעברית למה התגית מתאימה\n\n")
+        else:
+            prompt_parts.append("2. רמת ביטחון (0.0-1.0)\n\n")
+            if self.explain == "top_k":
+                prompt_parts.append(
+                    f"בנוסף, לכל הרצאה, ב-top_rationales שלה תן נימוק קצר בעברית **רק** ל-{self.explain_top_k} "
+                    "התגיות עם רמת הביטחון הגבוהה ביותר.\n\n"
+                )
+            else:
+                prompt_parts.append("אין צורך בנימוקים.\n\n")
+        
+        prompt_parts.append("## פורמט פלט נדרש (דוגמה)\n")
+        prompt_parts.append('```json\n')
+        prompt_parts.append('{\n')
+        prompt_parts.append('  "results": [\n')
+        prompt_parts.append('    {\n')
+        prompt_parts.append(f'      "lecture_id": "{lectures[0]["id"] if lectures else "rec123"}",\n')
+        prompt_parts.append('      "suggestions": [\n')
+        if self.explain == "full":
+            prompt_parts.append('        {"tag_name_he": "בריאות הנפש", "confidence": 0.88, "rationale_he": "נימוק קצר בעברית"}\n')
+            prompt_parts.append('      ]\n')
+        else:
+            prompt_parts.append('        {"tag_name_he": "בריאות הנפש", "confidence": 0.88}\n')
+            if self.explain == "top_k":
+                prompt_parts.append('      ],\n')
+                prompt_parts.append('      "top_rationales": [\n')
+                prompt_parts.append('        {"tag_name_he": "בריאות הנפש", "rationale_he": "נימוק קצר בעברית"}\n')
+            prompt_parts.append('      ]\n')
+        prompt_parts.append('    }\n')
+        prompt_parts.append('  ]\n')
+        prompt_parts.append('}\n')
+        prompt_parts.append('```\n\n')
+        prompt_parts.append(self._build_exact_names_reminder())
         
         return "".join(prompt_parts)
     
@@ -365,35 +1176,72 @@ class ReasoningScorer:
         self,
         lectures: List[Dict],
         all_tags: List[Dict],
-        lecturer_profiles: Dict[str, Optional[str]]
+        lecturer_profiles: Dict[str, Optional[str]],
+        pack_size: Optional[int] = None,
+        catalog: Optional[LabelCatalog] = None
     ) -> Dict[int, List[Dict]]:
+        """
+        Score many lectures with the reasoning model (lecturer_profiles maps
+        lecture id -> lecturer bio).
+
+        With pack_size > 1, lectures are sent to the LLM in packs sharing one
+        system prompt and tag list (see score_lectures_packed). Lectures the
+        model drops from a packed response are re-scored individually
+        (with `catalog`, as in score_lecture).
+        """
+        pack_size = pack_size or self.pack_size
         all_suggestions = {}
         
-        for i, lecture in enumerate(lectures):
-            lecture_id = lecture['id']
-            
+        to_score = []
+        for lecture in lectures:
             existing_tags = lecture.get('lecture_tag_ids') or []
             if existing_tags and len(existing_tags) > 0:
-                logger.debug(f"Skipping lecture {lecture_id} - already has {len(existing_tags)} tags")
+                logger.debug(f"Skipping lecture {lecture['id']} - already has {len(existing_tags)} tags")
                 continue
-            
-            lecturer_profile = None
-            if lecture.get('lecturer_name'):
-                lecturer_profile = lecturer_profiles.get(lecture['lecturer_name'])
-            
-            suggestions = self.score_lecture(
-                lecture,
-                all_tags,
-                lecturer_profile,
-                None
-            )
-            
-            if suggestions:
-                all_suggestions[lecture_id] = suggestions
-            
-            if (i + 1) % 10 == 0:
-                logger.info(f"Scored {i + 1}/{len(lectures)} lectures with reasoning model")
+            to_score.append(lecture)
+        
+        if pack_size > 1:
+            for start in range(0, len(to_score), pack_size):
+                pack = to_score[start:start + pack_size]
+                packed = self.score_lectures_packed(pack, all_tags, lecturer_profiles)
+                
+                for lecture in pack:
+                    lecture_id = lecture['id']
+                    if str(lecture_id) in packed:
+                        suggestions = packed[str(lecture_id)]
+                    else:
+                        logger.warning(f"Lecture {lecture_id} missing from packed response, scoring individually")
+                        suggestions = self._score_single(lecture, all_tags, lecturer_profiles, catalog)
+                    
+                    if suggestions:
+                        all_suggestions[lecture_id] = suggestions
+                
+                logger.info(f"Scored {min(start + pack_size, len(to_score))}/{len(to_score)} lectures with reasoning model (pack_size={pack_size})")
+        else:
+            for i, lecture in enumerate(to_score):
+                suggestions = self._score_single(lecture, all_tags, lecturer_profiles, catalog)
+                
+                if suggestions:
+                    all_suggestions[lecture['id']] = suggestions
+                
+                if (i + 1) % 10 == 0:
+                    logger.info(f"Scored {i + 1}/{len(to_score)} lectures with reasoning model")
         
         logger.info(f"Generated {sum(len(s) for s in all_suggestions.values())} suggestions for {len(all_suggestions)} lectures using reasoning model")
         
         return all_suggestions
+    
+    def _score_single(
+        self,
+        lecture: Dict,
+        all_tags: List[Dict],
+        lecturer_profiles: Dict[str, Optional[str]],
+        catalog: Optional[LabelCatalog] = None
+    ) -> List[Dict]:
+        return self.score_lecture(
+            lecture,
+            all_tags,
+            lecturer_profiles.get(lecture['id']),
+            None,
+            catalog
+        )
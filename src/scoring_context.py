@@ -0,0 +1,209 @@
+"""
+Per-lecture scoring context shared by the scoring modes of one request.
+
+The lecture embedding, the prototype score vector, the lecturer profile and
+the full-label reasoning call are computed on first use and memoized, so a
+mode that builds on another (the arbiter on fast scores, auto on ensemble, the
+deadline fallback on whatever already ran, several modes of one comparison
+request) never embeds or scores the same lecture twice.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+from src.circuit_breaker import embeddings_breaker
+from src.embeddings import EmbeddingsGenerator
+from src.label_catalog import LabelCatalog
+
+
+class ScoringContext:
+    """Lazily computed, memoized scoring inputs for one lecture and label set."""
+    
+    def __init__(
+        self,
+        lecture: Dict,
+        catalog: LabelCatalog,
+        prototype_knn,
+        tag_embeddings: Dict[str, np.ndarray],
+        config,
+        fetch_lecturer_profile: Optional[Callable[[Dict, str], Optional[str]]] = None
+    ):
+        """
+        Args:
+            lecture: v2 lecture dict (id, title, description, lecturer fields)
+            catalog: LabelCatalog of the request's labels
+            prototype_knn: Loaded PrototypeKNN (None when prototypes are not loaded)
+            tag_embeddings: Label embeddings the prototypes were trained with
+            config: Config
+            fetch_lecturer_profile: (lecture, purpose) -> bio or None
+        """
+        self.lecture = lecture
+        self.catalog = catalog
+        self.prototype_knn = prototype_knn
+        self.tag_embeddings = tag_embeddings
+        self.config = config
+        self._fetch_lecturer_profile = fetch_lecturer_profile
+        
+        self._values: Dict[Any, Any] = {}
+        self._inflight: Dict[Any, Future] = {}  # Builds in progress, awaited by concurrent callers
+        self._lock = threading.Lock()
+    
+    @property
+    def lecture_id(self):
+        return self.lecture.get('id')
+    
+    def has(self, key: Any) -> bool:
+        with self._lock:
+            return key in self._values
+    
+    def memo(self, key: Any, build: Callable[[], Any]) -> Any:
+        """
+        Compute a value once per context.
+
+        Concurrent callers of the same key (sync or async) wait for the first
+        build; a failed build is raised to its waiters and not memoized.
+        """
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        
+        if not owner:
+            return inflight.result()
+        
+        try:
+            value = build()
+        except BaseException as e:
+            self._finish(key, inflight, error=e)
+            raise
+        self._finish(key, inflight, value=value)
+        return value
+    
+    async def amemo(self, key: Any, build: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of memo().
+
+        The build runs as its own task and waiters are shielded from it, so
+        one waiter being cancelled (e.g. its mode ran out of deadline) does
+        not cancel the build for the others.
+        """
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        
+        if owner:
+            def done(task: asyncio.Future) -> None:
+                if task.cancelled():
+                    self._finish(key, inflight, error=asyncio.CancelledError())
+                elif task.exception() is not None:
+                    self._finish(key, inflight, error=task.exception())
+                else:
+                    self._finish(key, inflight, value=task.result())
+            
+            asyncio.ensure_future(build()).add_done_callback(done)
+        
+        waiter = asyncio.wrap_future(inflight)
+        # Retrieve the outcome even if this awaiter was cancelled (no "never retrieved" warnings)
+        waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return await asyncio.shield(waiter)
+    
+    def _finish(self, key: Any, inflight: Future, value: Any = None, error: Optional[BaseException] = None) -> None:
+        """Publish a build's outcome to the memo and its waiters."""
+        with self._lock:
+            if error is None:
+                value = self._values.setdefault(key, value)
+            if self._inflight.get(key) is inflight:
+                del self._inflight[key]
+    
+        if error is None:
+            inflight.set_result(value)
+        else:
+            inflight.set_exception(error)
+    
+    def seed(self, key: Any, value: Any) -> None:
+        """Store a value computed elsewhere (e.g. by a micro-batch); first write wins."""
+        with self._lock:
+            self._values.setdefault(key, value)
+    
+    def lecture_for_embedding(self) -> Dict:
+        """Lecture in the format expected by EmbeddingsGenerator."""
+        return {
+            'id': self.lecture_id,
+            'lecture_title': self.lecture.get('title', ''),
+            'lecture_description': self.lecture.get('description', '')
+        }
+    
+    def lecture_for_scorer(self) -> Dict:
+        """Lecture in the format expected by the reasoning/ensemble scorers."""
+        return {
+            'id': self.lecture_id,
+            'lecture_title': self.lecture.get('title', ''),
+            'lecture_description': self.lecture.get('description', ''),
+            'lecturer_name': self.lecture.get('lecturer_name') or ''
+        }
+    
+    def _embeddings_generator(self) -> EmbeddingsGenerator:
+        return EmbeddingsGenerator(
+            api_key=self.config.openai_api_key,
+            model=self.config.embedding_model,
+            circuit_breaker=embeddings_breaker
+        )
+    
+    def embedding(self) -> Optional[np.ndarray]:
+        """Lecture embedding (None if the embeddings call returned nothing for it)."""
+        def build():
+            lecture_embeddings = self._embeddings_generator().generate_lecture_embeddings([self.lecture_for_embedding()])
+            return lecture_embeddings.get(self.lecture_id)
+        
+        return self.memo('embedding', build)
+    
+    async def aembedding(self) -> Optional[np.ndarray]:
+        """Async variant of embedding() (AsyncOpenAI)."""
+        async def build():
+            lecture_embeddings = await self._embeddings_generator().agenerate_lecture_embeddings([self.lecture_for_embedding()])
+            return lecture_embeddings.get(self.lecture_id)
+        
+        return await self.amemo('embedding', build)
+    
+    def raw_scores(self) -> Dict[str, float]:
+        """Unthresholded prototype scores for every prototype tag."""
+        def build():
+            embedding = self.embedding()
+            if embedding is None:
+                return {}
+            return self.prototype_knn.raw_scores(embedding, self.tag_embeddings)
+        
+        return self.memo('raw_scores', build)
+    
+    def prototype_scores(self) -> Dict[str, float]:
+        """Scores at or above each tag's calibrated threshold (PrototypeKNN.score_lecture semantics)."""
+        return self.memo('prototype_scores', lambda: {
+            tag_id: score
+            for tag_id, score in self.raw_scores().items()
+            if score >= self.prototype_knn.threshold_for(tag_id)
+        })
+    
+    def lecturer_profile(self, purpose: str) -> Optional[str]:
+        """Lecturer bio (None without lecturer fields, a fetcher, or on failure)."""
+        if self._fetch_lecturer_profile is None:
+            return None
+        return self.memo('lecturer_profile', lambda: self._fetch_lecturer_profile(self.lecture, purpose))
+    
+    async def alecturer_profile(self, purpose: str) -> Optional[str]:
+        """Async variant of lecturer_profile() (the bio search runs in a worker thread)."""
+        return await asyncio.to_thread(self.lecturer_profile, purpose)
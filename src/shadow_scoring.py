@@ -0,0 +1,312 @@
+"""
+Shadow scoring: extra scoring modes run off the request path for comparison.
+
+For a sampled share of /suggest-tags requests, the configured shadow modes
+score the same lecture on a background worker after the response has been
+sent. They reuse the request's ScoringContext, so the lecture is not embedded
+again (and work the primary mode already did, e.g. the reasoning call of an
+ensemble request, is not paid for twice). Each shadow run writes one compact
+row to shadow_results: agreement with the primary suggestions, confidence
+deltas on shared labels, duration and estimated LLM cost.
+"""
+
+import contextvars
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import psycopg2
+
+from src.logging_utils import StructuredLogger, llm_cost_meter
+from src.scoring_context import ScoringContext
+
+logger = StructuredLogger(__name__)
+
+
+def compare_suggestions(primary: List[Dict], shadow: List[Dict]) -> Dict[str, Any]:
+    """
+    Agreement between two v2 suggestion lists.
+
+    Returns:
+        Dict with num_primary, num_shadow, num_common, jaccard (label sets),
+        top1_match (same highest-confidence label) and mean_abs_delta /
+        max_abs_delta of confidences on the common labels (None without any)
+    """
+    primary_scores = {s['label_id']: s['confidence'] for s in primary}
+    shadow_scores = {s['label_id']: s['confidence'] for s in shadow}
+    
+    common = primary_scores.keys() & shadow_scores.keys()
+    union = primary_scores.keys() | shadow_scores.keys()
+    deltas = [abs(primary_scores[label_id] - shadow_scores[label_id]) for label_id in common]
+    
+    def top1(scores: Dict[str, float]) -> Optional[str]:
+        return max(scores, key=scores.get) if scores else None
+    
+    return {
+        'num_primary': len(primary_scores),
+        'num_shadow': len(shadow_scores),
+        'num_common': len(common),
+        'jaccard': len(common) / len(union) if union else 1.0,
+        'top1_match': top1(primary_scores) == top1(shadow_scores),
+        'mean_abs_delta': sum(deltas) / len(deltas) if deltas else None,
+        'max_abs_delta': max(deltas) if deltas else None
+    }
+
+
+class ShadowResultsLogger:
+    """Writes shadow comparisons to the shadow_results table (created by PrototypeStorage)."""
+    
+    def __init__(self):
+        self.db_url = os.getenv('DATABASE_URL')
+        if not self.db_url:
+            logger.warning("DATABASE_URL not set - shadow results are only kept in /metrics")
+            self.enabled = False
+        else:
+            self.enabled = True
+    
+    def log_result(
+        self,
+        request_id: Optional[str],
+        lecture_id: Optional[str],
+        primary_mode: str,
+        shadow_mode: str,
+        primary_degraded: bool,
+        comparison: Dict[str, Any],
+        duration_ms: float,
+        estimated_cost_usd: float,
+        error_message: Optional[str] = None
+    ) -> None:
+        if not self.enabled:
+            return
+        
+        try:
+            with psycopg2.connect(self.db_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        INSERT INTO shadow_results (
+                            created_at, request_id, lecture_id, primary_mode, shadow_mode,
+                            primary_degraded, num_primary, num_shadow, num_common,
+                            jaccard, top1_match, mean_abs_delta, max_abs_delta,
+                            duration_ms, estimated_cost_usd, error_message
+                        ) VALUES (
+                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                        )
+                    """, (
+                        datetime.now(),
+                        request_id,
+                        lecture_id,
+                        primary_mode,
+                        shadow_mode,
+                        primary_degraded,
+                        comparison['num_primary'],
+                        comparison['num_shadow'],
+                        comparison['num_common'],
+                        comparison['jaccard'],
+                        comparison['top1_match'],
+                        comparison['mean_abs_delta'],
+                        comparison['max_abs_delta'],
+                        duration_ms,
+                        estimated_cost_usd,
+                        error_message
+                    ))
+                    conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to log shadow result to database: {e}")
+
+
+class _ModeStats:
+    """Running totals of one shadow mode's comparisons."""
+    
+    __slots__ = ('runs', 'errors', 'jaccard', 'top1_matches', 'deltas', 'num_deltas', 'duration_ms', 'cost_usd')
+    
+    def __init__(self):
+        self.runs = 0
+        self.errors = 0
+        self.jaccard = 0.0
+        self.top1_matches = 0
+        self.deltas = 0.0
+        self.num_deltas = 0
+        self.duration_ms = 0.0
+        self.cost_usd = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        compared = self.runs - self.errors
+        return {
+            'runs': self.runs,
+            'errors': self.errors,
+            'avg_jaccard': round(self.jaccard / compared, 4) if compared else None,
+            'top1_agreement': round(self.top1_matches / compared, 4) if compared else None,
+            'avg_mean_abs_delta': round(self.deltas / self.num_deltas, 4) if self.num_deltas else None,
+            'avg_duration_ms': round(self.duration_ms / self.runs, 1) if self.runs else None,
+            'estimated_cost_usd': round(self.cost_usd, 4)
+        }
+
+
+class ShadowScorer:
+    """Bounded background queue of shadow scoring jobs."""
+    
+    def __init__(
+        self,
+        score_mode: Callable[[ScoringContext, str, Optional[str]], List[Dict]],
+        modes: List[str],
+        sample_rate: float,
+        workers: int = 1,
+        max_queue_size: int = 100,
+        results_logger: Optional[ShadowResultsLogger] = None
+    ):
+        """
+        Args:
+            score_mode: (ctx, mode, explain) -> v2 suggestions, run without a deadline
+            modes: Shadow modes (a request's own mode is never shadowed)
+            sample_rate: Share of eligible requests that get shadow runs (0-1)
+            workers: Background worker threads
+            max_queue_size: Jobs waiting beyond this are dropped, so shadow
+                load can never build up behind a traffic spike
+            results_logger: Where comparisons are written (default: shadow_results table)
+        """
+        self.score_mode = score_mode
+        self.modes = list(modes)
+        self.sample_rate = sample_rate
+        self.results_logger = results_logger or ShadowResultsLogger()
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue_size))
+        self._lock = threading.Lock()
+        self._sampled = 0
+        self._dropped = 0
+        self._mode_stats: Dict[str, _ModeStats] = {}
+        
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._worker_loop, name=f"shadow-scoring-{i}", daemon=True).start()
+    
+    def modes_for(self, primary_mode: str) -> List[str]:
+        """Shadow modes to run for a request served by primary_mode."""
+        return [mode for mode in self.modes if mode != primary_mode]
+    
+    def sample(self) -> bool:
+        """Decide whether this request is shadowed."""
+        return random.random() < self.sample_rate
+    
+    def submit(
+        self,
+        ctx: ScoringContext,
+        modes: List[str],
+        primary_mode: str,
+        primary_suggestions: List[Dict],
+        primary_degraded: bool = False,
+        explain: Optional[str] = None,
+        request_id: Optional[str] = None
+    ) -> bool:
+        """
+        Queue shadow runs of modes for a scored lecture (never blocks).
+
+        The caller's context (request id for logs) is carried to the worker.
+
+        Returns:
+            False if the queue was full and the job was dropped
+        """
+        job = {
+            'ctx': ctx,
+            'modes': modes,
+            'primary_mode': primary_mode,
+            'primary_suggestions': primary_suggestions,
+            'primary_degraded': primary_degraded,
+            'explain': explain,
+            'request_id': request_id,
+            'context': contextvars.copy_context()
+        }
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.warning("Shadow scoring queue full - dropping job", request_id=request_id, lecture_id=ctx.lecture_id)
+            return False
+        
+        with self._lock:
+            self._sampled += 1
+        return True
+    
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                for mode in job['modes']:
+                    job['context'].run(self._run_mode, job, mode)
+            finally:
+                self._queue.task_done()
+    
+    def _run_mode(self, job: Dict[str, Any], mode: str) -> None:
+        ctx = job['ctx']
+        started_at = time.time()
+        error_message = None
+        
+        with llm_cost_meter() as costs:
+            try:
+                suggestions = self.score_mode(ctx, mode, job['explain'])
+            except Exception as e:
+                suggestions = []
+                error_message = f"{type(e).__name__}: {e}"
+                logger.warning(
+                    "Shadow scoring failed",
+                    request_id=job['request_id'],
+                    lecture_id=ctx.lecture_id,
+                    shadow_mode=mode,
+                    error_message=str(e)
+                )
+        
+        duration_ms = (time.time() - started_at) * 1000
+        cost = sum(costs)
+        comparison = compare_suggestions(job['primary_suggestions'], suggestions)
+        
+        with self._lock:
+            stats = self._mode_stats.setdefault(mode, _ModeStats())
+            stats.runs += 1
+            stats.duration_ms += duration_ms
+            stats.cost_usd += cost
+            if error_message:
+                stats.errors += 1
+            else:
+                stats.jaccard += comparison['jaccard']
+                stats.top1_matches += int(comparison['top1_match'])
+                if comparison['mean_abs_delta'] is not None:
+                    stats.deltas += comparison['mean_abs_delta']
+                    stats.num_deltas += 1
+        
+        logger.info(
+            "Shadow scoring completed",
+            request_id=job['request_id'],
+            lecture_id=ctx.lecture_id,
+            primary_mode=job['primary_mode'],
+            shadow_mode=mode,
+            jaccard=round(comparison['jaccard'], 3),
+            top1_match=comparison['top1_match'],
+            duration_ms=round(duration_ms, 1),
+            estimated_cost_usd=round(cost, 6)
+        )
+        
+        self.results_logger.log_result(
+            request_id=job['request_id'],
+            lecture_id=ctx.lecture_id,
+            primary_mode=job['primary_mode'],
+            shadow_mode=mode,
+            primary_degraded=job['primary_degraded'],
+            comparison=comparison,
+            duration_ms=duration_ms,
+            estimated_cost_usd=cost,
+            error_message=error_message
+        )
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'modes': self.modes,
+                'sample_rate': self.sample_rate,
+                'sampled_requests': self._sampled,
+                'dropped_requests': self._dropped,
+                'queue_depth': self._queue.qsize(),
+                'by_mode': {mode: stats.to_dict() for mode, stats in self._mode_stats.items()}
+            }
@@ -0,0 +1,164 @@
+"""
+Streamed prototype training for large /train payloads.
+
+Lectures are added one at a time while the request body is still being
+parsed, embedded in batches and reduced right away: each tagged lecture's
+embedding is added to its tags' running sums (the prototype centroids) and
+appended to a temporary file that threshold calibration later reads back
+memory-mapped. Only the text and embeddings of the current batch are held in
+memory, plus a few label codes per lecture. Untagged lectures are counted but
+never embedded, since neither prototypes nor calibration use them.
+"""
+
+import logging
+import tempfile
+from array import array
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.embeddings import EmbeddingsGenerator
+from src.prototype_knn import PrototypeKNN
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingTrainer:
+    """Incremental equivalent of generate_lecture_embeddings + build_prototypes + calibrate_thresholds."""
+    
+    def __init__(self, embeddings_gen: EmbeddingsGenerator, batch_size: int):
+        self.embeddings_gen = embeddings_gen
+        self.batch_size = max(1, batch_size)
+        
+        self.num_lectures = 0
+        self.num_embedded = 0
+        # Occurrences of every tag id across all lectures (validate_training_data counts)
+        self.tag_example_counts: Dict[str, int] = {}
+        
+        self._batch_texts: List[str] = []
+        self._batch_tag_ids: List[List[str]] = []
+        
+        self._tag_sums: Dict[str, np.ndarray] = {}
+        self._tag_counts: Dict[str, int] = {}
+        
+        # Tags of each embedded lecture as codes into _label_ids, CSR-style (row i is codes[offsets[i]:offsets[i+1]])
+        self._label_ids: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+        self._codes = array('I')
+        self._offsets = array('Q', [0])
+        
+        self._embeddings_file = tempfile.TemporaryFile(prefix='train-embeddings-')
+        self._dimensions: Optional[int] = None
+    
+    def __enter__(self) -> "StreamingTrainer":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        self._embeddings_file.close()
+    
+    def add_lecture(self, lecture: Dict) -> None:
+        """
+        Add one lecture in train_from_data's format.
+        
+        Raises:
+            ValueError: if the lecture has no id
+        """
+        if lecture.get('id') is None:
+            raise ValueError(f"Lecture #{self.num_lectures + 1} has no id")
+        
+        self.num_lectures += 1
+        tag_ids = _normalize_tag_ids(lecture.get('lecture_tag_ids'))
+        
+        for tag_id in tag_ids:
+            self.tag_example_counts[tag_id] = self.tag_example_counts.get(tag_id, 0) + 1
+        
+        if not tag_ids:
+            return
+        
+        self._batch_texts.append(self.embeddings_gen.create_lecture_text(
+            lecture.get('lecture_title', ''),
+            lecture.get('lecture_description', '')
+        ))
+        self._batch_tag_ids.append(tag_ids)
+        
+        if len(self._batch_texts) >= self.batch_size:
+            self._flush()
+    
+    def _flush(self) -> None:
+        """Embed the pending batch and fold it into the sums and the embeddings file."""
+        if not self._batch_texts:
+            return
+        
+        embeddings = self.embeddings_gen.generate_embeddings(self._batch_texts, "lectures")
+        self._dimensions = embeddings.shape[1]
+        
+        for embedding, tag_ids in zip(embeddings, self._batch_tag_ids):
+            for tag_id in tag_ids:
+                vector_sum = self._tag_sums.get(tag_id)
+                if vector_sum is None:
+                    self._tag_sums[tag_id] = embedding.astype(np.float64)
+                else:
+                    vector_sum += embedding
+                self._tag_counts[tag_id] = self._tag_counts.get(tag_id, 0) + 1
+                
+                code = self._label_codes.get(tag_id)
+                if code is None:
+                    code = self._label_codes[tag_id] = len(self._label_ids)
+                    self._label_ids.append(tag_id)
+                self._codes.append(code)
+            self._offsets.append(len(self._codes))
+        
+        self._embeddings_file.write(np.ascontiguousarray(embeddings, dtype=np.float32).tobytes())
+        self.num_embedded += len(embeddings)
+        
+        self._batch_texts = []
+        self._batch_tag_ids = []
+    
+    def build(self, train_config, tags_data: Dict[str, Dict], tag_embeddings: Dict[str, np.ndarray]) -> PrototypeKNN:
+        """
+        Embed the last partial batch, build prototypes and calibrate thresholds.
+        
+        Calibration uses the same holdout as calibrate_thresholds: the last
+        (1 - train_holdout_split) of the tagged lectures, in input order.
+        """
+        self._flush()
+        logger.info(f"Building prototypes from {self.num_embedded} tagged lectures (streamed)")
+        
+        train_prototype_knn = PrototypeKNN(train_config)
+        train_prototype_knn.build_prototypes_from_sums(self._tag_sums, self._tag_counts, tags_data)
+        
+        if not self.num_embedded:
+            train_prototype_knn.calibrate_thresholds([], {}, tag_embeddings)
+            return train_prototype_knn
+        
+        split_idx = int(self.num_embedded * train_config.train_holdout_split)
+        logger.info(f"Calibrating thresholds on {self.num_embedded - split_idx} holdout lectures")
+        
+        self._embeddings_file.flush()
+        embeddings = np.memmap(
+            self._embeddings_file,
+            dtype=np.float32,
+            mode='r',
+            shape=(self.num_embedded, self._dimensions)
+        )
+        train_prototype_knn.calibrate_thresholds_on(self._holdout(embeddings, split_idx), tag_embeddings)
+        del embeddings
+        
+        return train_prototype_knn
+    
+    def _holdout(self, embeddings: np.ndarray, start: int) -> Iterator[Tuple[np.ndarray, Set[str]]]:
+        for i in range(start, self.num_embedded):
+            codes = self._codes[self._offsets[i]:self._offsets[i + 1]]
+            yield np.asarray(embeddings[i]), {self._label_ids[code] for code in codes}
+
+
+def _normalize_tag_ids(tag_ids) -> List[str]:
+    """lecture_tag_ids as a list of strings (v1 payloads may send a comma-separated string)."""
+    if not tag_ids:
+        return []
+    if isinstance(tag_ids, str):
+        return [t.strip() for t in tag_ids.split(',') if t.strip()]
+    return [str(t).strip() for t in tag_ids]
@@ -0,0 +1,193 @@
+"""
+Conditional, paginated fetching of the external training dataset.
+
+/get-data-and-train downloads labels, lectures and lecture_labels from the
+tags manager API. The fetcher sends the validators of the last dataset that
+was trained on (If-None-Match / If-Modified-Since) with the first page, so an
+unchanged dataset costs a single 304 instead of a full download and a retrain.
+For servers without validators, a fingerprint of the page bodies is compared
+as a fallback (still one download, but no retrain).
+
+Pages are followed via an RFC 8288 Link: <...>; rel="next" header or a
+next_cursor field in the body (sent back as ?cursor=); a server that does
+neither returns everything as one page. Each page is retried with
+exponential backoff on connection errors, timeouts, 429 and 5xx.
+"""
+
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from src.logging_utils import StructuredLogger
+
+logger = StructuredLogger(__name__)
+
+DATASET_KEYS = ('labels', 'lectures', 'lecture_labels')
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Retry-After values above this are not honoured as-is (backoff is capped instead)
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+class TrainingDataFetcher:
+    """Fetches the training dataset page by page, skipping it when unchanged."""
+    
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        page_size: int = 0,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        timeout: float = 30,
+        verify: bool = True,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Args:
+            api_url: Dataset endpoint (first page)
+            api_key: Sent as X-API-KEY
+            page_size: Sent as ?limit= on the first page (0 = server default)
+            max_retries: Retries per page after the first attempt
+            backoff_seconds: First retry delay, doubled on each further retry
+            timeout: Per-request timeout in seconds
+            verify: TLS certificate verification
+            session: requests.Session to use (default: a new one)
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.page_size = page_size
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.verify = verify
+        self.session = session or requests.Session()
+    
+    def fetch(self, sync_state: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the dataset unless it is unchanged since sync_state.
+        
+        Args:
+            sync_state: Validators of the last dataset trained on ({'etag',
+                'last_modified', 'fingerprint'}), or None to always fetch
+        
+        Returns:
+            None if unchanged, else {'data': {'labels', 'lectures',
+            'lecture_labels'}, 'sync': validators to store once training on
+            this data has succeeded, 'num_pages': int}
+        
+        Raises:
+            requests.RequestException: when a page still fails after retries
+            ValueError: on a malformed page or a pagination cycle
+        """
+        sync_state = sync_state or {}
+        conditional_headers = {}
+        if sync_state.get('etag'):
+            conditional_headers['If-None-Match'] = sync_state['etag']
+        if sync_state.get('last_modified'):
+            conditional_headers['If-Modified-Since'] = sync_state['last_modified']
+        
+        data = {key: [] for key in DATASET_KEYS}
+        fingerprint = hashlib.sha256()
+        
+        url = self.api_url
+        params = {'limit': self.page_size} if self.page_size > 0 else None
+        seen_pages = set()
+        validators = {}
+        num_pages = 0
+        
+        while True:
+            page_key = (url, tuple(sorted((params or {}).items())))
+            if page_key in seen_pages:
+                raise ValueError(f"Pagination cycle: page {url} {params or ''} requested twice")
+            seen_pages.add(page_key)
+            
+            response = self._get_page(url, params, conditional_headers if num_pages == 0 else {})
+            
+            if response.status_code == 304:
+                logger.info("Training data not modified (304)", api_url=self.api_url)
+                return None
+            
+            if num_pages == 0:
+                validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
+            
+            fingerprint.update(response.content)
+            page = response.json()
+            if not isinstance(page, dict):
+                raise ValueError(f"Training data page {num_pages + 1} is not a JSON object")
+            
+            for key in DATASET_KEYS:
+                data[key].extend(page.get(key) or [])
+            num_pages += 1
+            
+            next_url = response.links.get('next', {}).get('url')
+            next_cursor = page.get('next_cursor')
+            if next_url:
+                url, params = requests.compat.urljoin(url, next_url), None
+            elif next_cursor:
+                params = {**(params or {}), 'cursor': next_cursor}
+            else:
+                break
+        
+        validators['fingerprint'] = fingerprint.hexdigest()
+        
+        if sync_state.get('fingerprint') == validators['fingerprint']:
+            logger.info("Training data unchanged (same fingerprint)", api_url=self.api_url, num_pages=num_pages)
+            return None
+        
+        logger.info(
+            "Fetched training data",
+            num_pages=num_pages,
+            num_labels=len(data['labels']),
+            num_lectures=len(data['lectures']),
+            num_lecture_labels=len(data['lecture_labels'])
+        )
+        
+        return {'data': data, 'sync': validators, 'num_pages': num_pages}
+    
+    def _get_page(self, url: str, params: Optional[Dict], extra_headers: Dict[str, str]) -> requests.Response:
+        """GET one page, retrying transient failures (returns 2xx or 304 responses)."""
+        headers = {'X-API-KEY': self.api_key, **extra_headers}
+        
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout, verify=self.verify)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                
+                error = requests.HTTPError(f"{response.status_code} error for url: {response.url}", response=response)
+                retry_after = _retry_after_seconds(response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            
+            if attempt == self.max_retries:
+                raise error
+            
+            delay = retry_after if retry_after is not None else self.backoff_seconds * (2 ** attempt)
+            logger.warning(
+                "Training data page failed - retrying",
+                url=url,
+                attempt=attempt + 1,
+                max_retries=self.max_retries,
+                delay_seconds=round(delay, 2),
+                error_message=str(error)
+            )
+            time.sleep(delay)
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Retry-After in seconds (delta-seconds form only), capped."""
+    value = response.headers.get('Retry-After')
+    try:
+        return min(max(0.0, float(value)), MAX_RETRY_AFTER_SECONDS) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Offline check of the "auto" scoring mode against full ensemble.
+
+Scores every lecture of an offline set in both modes and reports:
+- the fraction of LLM calls auto mode avoided (from /metrics auto_routing)
+- agreement with ensemble (Jaccard, top-1 match, top-3 overlap,
+  precision / recall of auto labels against ensemble labels)
+
+Usage: python test_auto_routing.py [lectures.json]
+(JSON file with {"lectures": [...], "labels": [...]} in /train format;
+ defaults to the set in test_scoring_modes.py, trained first)
+"""
+
+import json
+import sys
+import time
+
+import requests
+
+from test_scoring_modes import TRAINING_DATA, train_prototypes
+
+API_URL = "http://localhost:5000"
+
+
+def suggest(lecture, labels, mode):
+    payload = {
+        "request_id": f"auto-eval-{mode}-{lecture['id']}",
+        "model_version": "v1",
+        "artifact_version": "auto-eval",
+        "scoring_mode": mode,
+        "lecture": {
+            "id": lecture["id"],
+            "title": lecture.get("title", ""),
+            "description": lecture.get("description", "")
+        },
+        "labels": labels
+    }
+    
+    start_time = time.time()
+    response = requests.post(f"{API_URL}/suggest-tags", json=payload)
+    elapsed = time.time() - start_time
+    
+    if response.status_code != 200:
+        print(f"❌ {mode} failed for {lecture['id']}: {response.text}")
+        return None, elapsed
+    
+    suggestions = sorted(response.json().get("suggestions", []), key=lambda s: -s["confidence"])
+    return [s["label_id"] for s in suggestions], elapsed
+
+
+def auto_routing_metrics():
+    response = requests.get(f"{API_URL}/metrics")
+    return response.json().get("auto_routing", {}) if response.status_code == 200 else {}
+
+
+def agreement(auto_ids, ensemble_ids):
+    auto_set, ensemble_set = set(auto_ids), set(ensemble_ids)
+    union = auto_set | ensemble_set
+    common = auto_set & ensemble_set
+    return {
+        "jaccard": len(common) / len(union) if union else 1.0,
+        "top1": 1.0 if auto_ids[:1] == ensemble_ids[:1] else 0.0,
+        "top3_overlap": len(set(auto_ids[:3]) & set(ensemble_ids[:3])) / max(1, min(3, len(ensemble_ids))),
+        "precision": len(common) / len(auto_set) if auto_set else (1.0 if not ensemble_set else 0.0),
+        "recall": len(common) / len(ensemble_set) if ensemble_set else 1.0
+    }
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            dataset = json.load(f)
+    else:
+        dataset = TRAINING_DATA
+        if not train_prototypes():
+            return
+    
+    lectures, labels = dataset["lectures"], dataset["labels"]
+    
+    print("\n" + "="*60)
+    print(f"AUTO vs ENSEMBLE on {len(lectures)} lectures")
+    print("="*60)
+    
+    before = auto_routing_metrics()
+    
+    rows = []
+    auto_time = ensemble_time = 0.0
+    for lecture in lectures:
+        auto_ids, auto_elapsed = suggest(lecture, labels, "auto")
+        ensemble_ids, ensemble_elapsed = suggest(lecture, labels, "ensemble")
+        if auto_ids is None or ensemble_ids is None:
+            continue
+        
+        auto_time += auto_elapsed
+        ensemble_time += ensemble_elapsed
+        row = agreement(auto_ids, ensemble_ids)
+        rows.append(row)
+        print(f"  {lecture['id']:<12} jaccard={row['jaccard']:.2f} top1={row['top1']:.0f} "
+              f"auto={auto_elapsed:.2f}s ensemble={ensemble_elapsed:.2f}s")
+    
+    after = auto_routing_metrics()
+    
+    if not rows:
+        print("⚠️  No lectures scored")
+        return
+    
+    requests_made = after.get("requests", 0) - before.get("requests", 0)
+    llm_calls = after.get("llm_calls", 0) - before.get("llm_calls", 0)
+    
+    print(f"\n{'Metric':<25} {'Value'}")
+    print("-" * 40)
+    for key in ("jaccard", "top1", "top3_overlap", "precision", "recall"):
+        print(f"{key:<25} {sum(r[key] for r in rows) / len(rows):.3f}")
+    if requests_made:
+        print(f"{'llm_avoided_rate':<25} {(requests_made - llm_calls) / requests_made:.3f}")
+    print(f"{'auto avg time (s)':<25} {auto_time / len(rows):.2f}")
+    print(f"{'ensemble avg time (s)':<25} {ensemble_time / len(rows):.2f}")
+    print(f"\nRoutes (process totals): {after.get('routes', {})}")
+
+
+if __name__ == "__main__":
+    main()
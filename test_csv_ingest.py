@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Memory/time benchmark for /train-csv ingestion on a synthetic catalog export.
+
+Generates lectures.csv, labels.csv and lecture_labels.csv (100k lectures by
+default, ~4 labels each) and compares peak Python heap (tracemalloc) and
+wall time of:
+- in-memory: whole uploads read as bytes, decoded, parsed via StringIO into
+  dicts of lists and converted to the training format (how /train-csv used
+  to ingest)
+- streaming: src.csv_parser.parse_csv_training_stream on the open files
+
+Runs offline (no server, no API calls).
+
+Usage: python test_csv_ingest.py [num_lectures]
+"""
+
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.csv_parser import parse_csv_training_stream
+
+NUM_LABELS = 120
+CATEGORIES = ["נושא", "קהל יעד", "פרסונה", "טון", "פורמט"]
+WORDS = ["הרצאה", "על", "חרדה", "והתמודדות", "בריאות", "הנפש", "מנהיגות", "חינוך", "היסטוריה", "טכנולוגיה",
+         "משפחה", "קהילה", "השראה", "סיפור", "אישי", "מדע", "אמנות", "ספורט", "ישראל", "עתיד"]
+
+
+def write_dataset(directory: str, num_lectures: int) -> dict:
+    rng = random.Random(42)
+    paths = {name: os.path.join(directory, f"{name}.csv") for name in ("lectures", "labels", "lecture_labels")}
+
+    with open(paths["labels"], "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["airtable_id", "name", "category"])
+        for i in range(NUM_LABELS):
+            writer.writerow([f"recLabel{i:05d}", f"תגית {i}", CATEGORIES[i % len(CATEGORIES)]])
+
+    with open(paths["lectures"], "w", encoding="utf-8", newline="") as f, \
+            open(paths["lecture_labels"], "w", encoding="utf-8", newline="") as junction:
+        writer = csv.writer(f)
+        junction_writer = csv.writer(junction)
+        writer.writerow(["airtable_id", "title", "description", "lecturer_id"])
+        junction_writer.writerow(["lecture_id", "label_id"])
+        for i in range(num_lectures):
+            lecture_id = f"recLecture{i:08d}"
+            title = " ".join(rng.choices(WORDS, k=6))
+            description = " ".join(rng.choices(WORDS, k=rng.randint(40, 120)))
+            writer.writerow([lecture_id, title, description, f"recLecturer{i % 5000:05d}"])
+            for label in rng.sample(range(NUM_LABELS), rng.randint(1, 7)):
+                junction_writer.writerow([lecture_id, f"recLabel{label:05d}"])
+
+    return paths
+
+
+def ingest_in_memory(paths: dict) -> dict:
+    """The pre-streaming ingestion path (bytes -> str -> StringIO -> dicts -> two lecture lists)."""
+    contents = {name: open(path, "rb").read() for name, path in paths.items()}
+
+    labels = {}
+    for row in csv.DictReader(io.StringIO(contents["labels"].decode("utf-8"))):
+        labels[row["airtable_id"]] = {"id": row["airtable_id"], "name_he": row["name"], "category": row["category"]}
+
+    lecture_labels = {}
+    for row in csv.DictReader(io.StringIO(contents["lecture_labels"].decode("utf-8"))):
+        lecture_labels.setdefault(row["lecture_id"], []).append(row["label_id"])
+
+    lectures = []
+    for row in csv.DictReader(io.StringIO(contents["lectures"].decode("utf-8"))):
+        label_ids = lecture_labels.get(row["airtable_id"], [])
+        if label_ids:
+            lectures.append({"id": row["airtable_id"], "title": row["title"], "description": row["description"],
+                             "lecturer_id": row["lecturer_id"], "label_ids": label_ids})
+
+    converted = [
+        {"id": l["id"], "lecture_title": l["title"], "lecture_description": l["description"], "lecture_tag_ids": l["label_ids"]}
+        for l in lectures
+    ]
+    tags = {label_id: {"tag_id": label_id, "name_he": l["name_he"], "synonyms_he": "", "category": l["category"]}
+            for label_id, l in labels.items()}
+    return {"lectures": converted, "tags": tags}
+
+
+def ingest_streaming(paths: dict) -> dict:
+    with open(paths["lectures"], "rb") as lectures, open(paths["labels"], "rb") as labels, \
+            open(paths["lecture_labels"], "rb") as lecture_labels:
+        return parse_csv_training_stream(lectures, labels, lecture_labels)
+
+
+def measure(name: str, ingest, paths: dict) -> dict:
+    tracemalloc.start()
+    start_time = time.time()
+    training_data = ingest(paths)
+    elapsed = time.time() - start_time
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {name:<12} peak={peak / 2**20:8.1f} MiB  retained={retained / 2**20:8.1f} MiB  "
+          f"time={elapsed:6.2f}s  lectures={len(training_data['lectures'])}")
+    return {"peak": peak, "lectures": len(training_data["lectures"])}
+
+
+def main():
+    num_lectures = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Generating {num_lectures} synthetic lectures...")
+        paths = write_dataset(directory, num_lectures)
+        total_mb = sum(os.path.getsize(p) for p in paths.values()) / 2**20
+        print(f"  {total_mb:.1f} MiB of CSV\n")
+
+        in_memory = measure("in-memory", ingest_in_memory, paths)
+        streaming = measure("streaming", ingest_streaming, paths)
+
+    if in_memory["lectures"] != streaming["lectures"]:
+        print(f"❌ Lecture counts differ: {in_memory['lectures']} vs {streaming['lectures']}")
+        sys.exit(1)
+
+    print(f"\n✅ Streaming peak is {in_memory['peak'] / streaming['peak']:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Load test for /suggest-tags: throughput and latency vs. concurrency.
+
+Sends the same lecture at increasing concurrency levels and prints
+requests/second and latency percentiles per level. Run it once against
+`python api_server.py` (Flask, a thread per request) and once against
+`uvicorn asgi:app --port 5000` (async /suggest-tags) to compare the two
+serving paths.
+
+Usage:
+    python test_load.py [scoring_mode] [requests_per_level]
+"""
+
+import sys
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+API_URL = "http://localhost:5000"
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32]
+
+PAYLOAD = {
+    "model_version": "v1",
+    "artifact_version": "labels-emb-2025-10-29",
+    "lecture": {
+        "id": "rec17SffStTL231k8",
+        "title": "על חרדה והתמודדות",
+        "description": "אסי עזר ומיכל עזר סטיין הם אחים המתמחים בבריאות הנפש והתמודדות עם חרדות. בהרצאה זו הם מציגים כלים יומיומיים להתמודדות עם חרדה ומתח.",
+        "lecturer_id": "recasCfleyvOlrhkf",
+        "lecturer_name": "אסי עזר ומיכל עזר סטיין"
+    },
+    "labels": [
+        {"id": "lab_persona_celebs", "name_he": "סלבס", "category": "Persona", "active": True},
+        {"id": "lab_topic_mental_health", "name_he": "בריאות הנפש", "category": "Topic", "active": True},
+        {"id": "lab_tone_personal", "name_he": "אישי", "category": "Tone", "active": True},
+        {"id": "lab_format_talk", "name_he": "הרצאה", "category": "Format", "active": True},
+        {"id": "lab_audience_general", "name_he": "קהל רחב", "category": "Audience", "active": True}
+    ]
+}
+
+
+def send_request(i: int, scoring_mode: str) -> tuple:
+    """Send one request; returns (ok, latency_seconds)."""
+    payload = dict(PAYLOAD, request_id=f"load-{i}", scoring_mode=scoring_mode)
+    start = time.time()
+    try:
+        response = requests.post(f"{API_URL}/suggest-tags", json=payload, timeout=120)
+        return response.status_code == 200, time.time() - start
+    except Exception:
+        return False, time.time() - start
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_level(concurrency: int, num_requests: int, scoring_mode: str) -> dict:
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda i: send_request(i, scoring_mode), range(num_requests)))
+    elapsed = time.time() - start
+    
+    latencies = [latency for ok, latency in results if ok]
+    return {
+        'concurrency': concurrency,
+        'ok': len(latencies),
+        'errors': num_requests - len(latencies),
+        'throughput_rps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_s': percentile(latencies, 50),
+        'p95_s': percentile(latencies, 95),
+        'p99_s': percentile(latencies, 99)
+    }
+
+
+if __name__ == "__main__":
+    scoring_mode = sys.argv[1] if len(sys.argv) > 1 else "ensemble"
+    per_level = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    
+    health = requests.get(f"{API_URL}/health", timeout=5).json()
+    if not health.get('prototypes_loaded'):
+        print("⚠ No prototypes loaded. Please train first (python test_api.py).")
+        sys.exit(1)
+    
+    print(f"Load test: mode={scoring_mode}, {per_level} requests per level")
+    print(f"{'conc':>5} {'ok':>5} {'err':>5} {'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>7}")
+    
+    for concurrency in CONCURRENCY_LEVELS:
+        r = run_level(concurrency, max(per_level, concurrency), scoring_mode)
+        print(
+            f"{r['concurrency']:>5} {r['ok']:>5} {r['errors']:>5} {r['throughput_rps']:>8.2f} "
+            f"{r['p50_s']:>6.2f}s {r['p95_s']:>6.2f}s {r['p99_s']:>6.2f}s"
+        )
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compare reasoning output formats: output tokens, latency and discard rate.
+
+Runs ReasoningScorer directly (needs OPENAI_API_KEY) on sample lectures with
+each output format:
+- free:        free-string tag names + rationales (original format)
+- constrained: enum of exact tag names + rationales (CONSTRAINED_TAG_OUTPUT)
+- compact:     tag codes + confidences only (COMPACT_TAG_CODES)
+- top_k:       exact tag names, rationales for the top suggestions only (explain=top_k)
+- none:        exact tag names + confidences, no rationales (explain=none)
+
+Usage:
+    python test_output_formats.py [repetitions]
+"""
+
+import sys
+from src.label_catalog import get_label_catalog
+from src.reasoning_scorer import ReasoningScorer, reasoning_output_stats
+
+LABELS = [
+    {"id": "lab_topic_mental_health", "name_he": "בריאות הנפש", "category": "Topic"},
+    {"id": "lab_topic_parenting", "name_he": "הורות", "category": "Topic"},
+    {"id": "lab_topic_relationships", "name_he": "זוגיות", "category": "Topic"},
+    {"id": "lab_topic_hitech", "name_he": "הייטק", "category": "Topic"},
+    {"id": "lab_topic_philosophy", "name_he": "פילוסופיה", "category": "Topic"},
+    {"id": "lab_topic_economy", "name_he": "כלכלה", "category": "Topic"},
+    {"id": "lab_persona_celebs", "name_he": "סלבס", "category": "Persona"},
+    {"id": "lab_persona_pros", "name_he": "מקצוענים", "category": "Persona"},
+    {"id": "lab_tone_personal", "name_he": "סיפור אישי", "category": "Tone"},
+    {"id": "lab_tone_funny", "name_he": "מצחיק", "category": "Tone"},
+    {"id": "lab_tone_practical", "name_he": "פרקטי", "category": "Tone"},
+    {"id": "lab_format_panel", "name_he": "פאנל", "category": "Format"},
+    {"id": "lab_format_workshop", "name_he": "הכשרה מעשית", "category": "Format"},
+    {"id": "lab_audience_teachers", "name_he": "הרצאות למורים", "category": "Audience"},
+    {"id": "lab_audience_women", "name_he": "הרצאות לנשים", "category": "Audience"}
+]
+
+LECTURES = [
+    {
+        "id": "fmt_1",
+        "lecture_title": "על חרדה והתמודדות",
+        "lecture_description": "כלים יומיומיים להתמודדות עם חרדה ומתח, מתוך סיפור אישי של המרצה.",
+        "lecturer_name": ""
+    },
+    {
+        "id": "fmt_2",
+        "lecture_title": "הורות בעידן המסכים",
+        "lecture_description": "סדנה מעשית להורים ולמורים: איך מציבים גבולות לשימוש בטלפונים ובמחשבים.",
+        "lecturer_name": ""
+    }
+]
+
+FORMATS = {
+    "free": {"constrained_output": False, "compact_codes": False},
+    "constrained": {"constrained_output": True, "compact_codes": False},
+    "compact": {"constrained_output": True, "compact_codes": True},
+    "top_k": {"constrained_output": True, "compact_codes": False, "explain": "top_k"},
+    "none": {"constrained_output": True, "compact_codes": False, "explain": "none"}
+}
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    catalog = get_label_catalog(LABELS)
+    variants = {}
+
+    for name, options in FORMATS.items():
+        scorer = ReasoningScorer(min_confidence=0.0, **options)
+        variants[name] = scorer.output_variant
+        print(f"Running format '{name}' ({repetitions} x {len(LECTURES)} lectures)...")
+        for _ in range(repetitions):
+            for lecture in LECTURES:
+                scorer.score_lecture(lecture, catalog.tags_for_scorer, catalog=catalog)
+
+    stats = reasoning_output_stats.stats()
+    print()
+    print(f"{'format':<12} {'calls':>6} {'out tok':>8} {'latency':>10} {'discard':>8}")
+    for name in FORMATS:
+        s = stats.get(variants[name])
+        if not s:
+            continue
+        print(
+            f"{name:<12} {s['calls']:>6} {s['avg_output_tokens']:>8.1f} "
+            f"{s['avg_latency_ms']:>8.0f}ms {s['discard_rate']:>8.2%}"
+        )
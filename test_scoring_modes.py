@@ -210,6 +210,45 @@ def compare_modes(results):
         print(f"  {label_name:<30} → {', '.join(modes_with_label)}")
 
 
+def test_multi_mode(modes):
+    """Score the lecture with several modes in one request (shared embedding, bio and reasoning call)."""
+    print(f"\n" + "="*60)
+    print(f"TESTING: MULTI-MODE REQUEST ({', '.join(modes)})")
+    print("="*60)
+    
+    payload = {
+        "request_id": "test-multi-mode-001",
+        "model_version": "v1",
+        "artifact_version": "test-2025-10-29",
+        "scoring_mode": modes,
+        "lecture": TEST_LECTURE,
+        "labels": TRAINING_DATA["labels"]
+    }
+    
+    start_time = time.time()
+    response = requests.post(f"{API_URL}/suggest-tags", json=payload)
+    elapsed = time.time() - start_time
+    
+    if response.status_code != 200:
+        print(f"❌ Request failed: {response.text}")
+        return None
+    
+    mode_results = response.json().get('results', {})
+    missing = [mode for mode in modes if mode not in mode_results]
+    if missing:
+        print(f"❌ Missing results for: {', '.join(missing)}")
+        return None
+    
+    print(f"⏱️  Total time: {elapsed:.2f}s (slowest mode: {max(r['duration_ms'] for r in mode_results.values()) / 1000:.2f}s)")
+    print(f"\n{'Mode':<15} {'Time (ms)':<12} {'# Suggestions':<15} {'Degraded'}")
+    print("-" * 60)
+    for mode, result in mode_results.items():
+        status = result.get('error') or result.get('degraded_reason') or 'no'
+        print(f"{mode:<15} {result['duration_ms']:<12.1f} {len(result['suggestions']):<15} {status}")
+    
+    return mode_results
+
+
 if __name__ == "__main__":
     try:
         # Train
@@ -235,6 +274,9 @@ if __name__ == "__main__":
         # Compare
         compare_modes(results)
         
+        # Same comparison in a single request
+        test_multi_mode(["fast", "full_quality", "reasoning", "ensemble"])
+        
         print("\n" + "="*60)
         print("✅ ALL TESTS COMPLETE!")
         print("="*60)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Offline check that the modes of one request embed the lecture once.
+
+Runs fast mode, with micro-batching on (the default), while an LLM mode's
+embedding of the same ScoringContext is in flight, and a score_lecture_modes
+comparison of "fast" and "ensemble", and counts the lecture texts sent to
+the embeddings API. The embeddings call and the
+reasoning call are deterministic stand-ins, so this runs offline (no
+server, no API calls).
+
+Usage: python test_shared_embedding.py
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # Clients are built, never called
+
+import api_server
+from src.config import Config
+from src.embeddings import EmbeddingsGenerator
+from src.prototype_knn import PrototypeKNN
+from src.reasoning_scorer import ReasoningScorer
+
+DIMENSIONS = 16
+# api_server globals set up by setup_server (restored afterwards)
+SERVER_STATE = ("config", "prototype_knn", "tag_embeddings_cache", "prototypes_loaded")
+LABELS = [{"id": f"lab_{i}", "name_he": f"תגית {i}", "category": "Topic", "active": True} for i in range(4)]
+
+embedded_texts = []
+_embedded_lock = threading.Lock()
+
+
+def stand_in_embeddings(self, texts, desc="items"):
+    time.sleep(0.05)  # Long enough for the modes to overlap
+    with _embedded_lock:
+        embedded_texts.extend(texts)
+    return np.array([
+        np.random.default_rng(int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")).normal(size=DIMENSIONS)
+        for text in texts
+    ])
+
+
+def stand_in_reasoning(self, lecture, all_tags, lecturer_profile=None, candidate_tags=None, catalog=None):
+    return [{'tag_id': "lab_0", 'tag_name_he': "תגית 0", 'score': 0.9, 'rationale': "", 'model': "stand-in"}]
+
+
+def setup_server():
+    config = Config(fast_batching=True, request_deadline_ms=0)
+    api_server.config = config
+    
+    rng = np.random.default_rng(0)
+    api_server.tag_embeddings_cache = {label["id"]: rng.normal(size=DIMENSIONS) for label in LABELS}
+    knn = PrototypeKNN(config)
+    for label in LABELS:
+        knn.tag_prototypes[label["id"]] = rng.normal(size=DIMENSIONS)
+        knn.tag_thresholds[label["id"]] = 0.0
+        knn.tag_stats[label["id"]] = {"num_examples": 10}
+    api_server.prototype_knn = knn
+    api_server.prototypes_loaded = True
+
+
+@contextmanager
+def stand_in_server():
+    server_state = {name: getattr(api_server, name) for name in SERVER_STATE}
+    setup_server()
+    original_embeddings, original_reasoning = EmbeddingsGenerator.generate_embeddings, ReasoningScorer.score_lecture
+    EmbeddingsGenerator.generate_embeddings = stand_in_embeddings
+    ReasoningScorer.score_lecture = stand_in_reasoning
+    try:
+        yield
+    finally:
+        EmbeddingsGenerator.generate_embeddings = original_embeddings
+        ReasoningScorer.score_lecture = original_reasoning
+        for name, value in server_state.items():
+            setattr(api_server, name, value)
+
+
+def test_fast_mode_waits_for_an_embedding_in_flight():
+    with stand_in_server():
+        for i in range(5):
+            lecture = {"id": f"rec{i}", "title": f"הרצאה {i}", "description": "תיאור"}
+            ctx = api_server._scoring_context(lecture, api_server.as_label_catalog(LABELS))
+            embedded_texts.clear()
+            
+            # An LLM mode's embedding build starts first; fast mode must not batch-embed again
+            llm_mode = threading.Thread(target=ctx.embedding)
+            llm_mode.start()
+            time.sleep(0.01)
+            api_server.score_lecture_fast(ctx)
+            llm_mode.join()
+
+            assert ctx.has('fast_scores') and ctx.has('embedding')
+            assert len(embedded_texts) == 1, f"lecture embedded {len(embedded_texts)} times"
+    
+    print("✅ fast mode reuses an embedding another mode is still building")
+
+
+def test_mode_comparison_embeds_once():
+    with stand_in_server():
+        for i in range(5):
+            lecture = {"id": f"rec{i}", "title": f"הרצאה {i}", "description": "תיאור"}
+            embedded_texts.clear()
+            
+            results = api_server.score_lecture_modes(lecture, LABELS, ["fast", "ensemble"])
+            
+            for mode, result in results.items():
+                assert "error" not in result, (mode, result)
+            assert len(embedded_texts) == 1, f"lecture embedded {len(embedded_texts)} times"
+    
+    print("✅ fast + ensemble in one comparison request embed the lecture once")
+
+
+if __name__ == "__main__":
+    tests = [test_fast_mode_waits_for_an_embedding_in_flight, test_mode_comparison_embeds_once]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {type(e).__name__}: {e}")
+    sys.exit(1 if failed else 0)
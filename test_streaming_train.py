@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Offline checks of streamed /train ingestion.
+
+- iter_object_members decodes the same members as json.loads at every chunk
+  size, including numbers, literals and strings cut by a chunk boundary
+- StreamingTrainer builds the same prototypes and thresholds as the
+  in-memory path (build_prototypes + calibrate_thresholds)
+
+Embeddings come from a deterministic stand-in for the OpenAI call, so this
+runs offline (no server, no API calls).
+
+Usage: python test_streaming_train.py
+"""
+
+import hashlib
+import io
+import json
+import sys
+
+import numpy as np
+
+from src.config import Config
+from src.embeddings import EmbeddingsGenerator
+from src.json_stream import JSONStreamError, iter_object_members
+from src.prototype_knn import PrototypeKNN
+from src.streaming_training import StreamingTrainer
+
+BODIES = [
+    {"a": 1.5e3, "lectures": [{"id": 1}], "b": -12.25},
+    {"n": [0, -0.5, 12345678901234567890, 3E-7, -1e+10], "t": True, "f": False, "z": None},
+    {"lectures": [{"id": "rec1", "lecture_title": "על \"חרדה\" והתמודדות", "score": 0.125},
+                  {"id": 2, "lecture_tag_ids": ["a", "b"], "w": 1e2}], "tags": {"x": {"y": [1.0, 2.5]}}},
+    {"lectures": [], "empty": {}, "s": "\\u05d0\\n", "last": 7},
+    {}
+]
+
+DIMENSIONS = 16
+
+
+def decode_members(body: bytes, chunk_size: int) -> dict:
+    members = {}
+    for key, value in iter_object_members(io.BytesIO(body), lazy_arrays=("lectures",), chunk_size=chunk_size):
+        members[key] = list(value) if key == "lectures" and not isinstance(value, list) else value
+    return members
+
+
+def test_matches_json_loads_at_every_chunk_size():
+    for document in BODIES:
+        for body in (json.dumps(document).encode(), json.dumps(document, ensure_ascii=False, indent=1).encode()):
+            expected = json.loads(body)
+            for chunk_size in range(1, len(body) + 2):
+                assert decode_members(body, chunk_size) == expected, (body, chunk_size)
+    print(f"✅ iter_object_members matches json.loads for {len(BODIES)} bodies at every chunk size")
+
+
+def test_rejects_malformed_bodies():
+    for body in (b'[1, 2]', b'{"a": 1,}', b'{"a": 1} x', b'{"a": 1.5e}', b'{"lectures": [1 2]}'):
+        for chunk_size in (1, 3, 64):
+            try:
+                decode_members(body, chunk_size)
+                raise AssertionError(f"expected JSONStreamError for {body!r} at chunk_size={chunk_size}")
+            except JSONStreamError:
+                pass
+    print("✅ Malformed bodies are rejected at every chunk size")
+
+
+class StandInEmbeddings(EmbeddingsGenerator):
+    """Deterministic embeddings derived from the text (no OpenAI calls)."""
+    
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.calls = 0
+    
+    def generate_embeddings(self, texts, desc="items"):
+        self.calls += 1
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            vectors.append(np.random.default_rng(seed).normal(size=DIMENSIONS))
+        return np.array(vectors)
+
+
+def make_training_data(num_lectures: int = 120, num_tags: int = 6):
+    tags_data = {f"tag{i}": {"tag_id": f"tag{i}", "name_he": f"תגית {i}", "synonyms_he": "", "category": "Topic"}
+                 for i in range(num_tags)}
+    lectures = []
+    for i in range(num_lectures):
+        tag_ids = [f"tag{(i + k) % num_tags}" for k in range(i % 3)]  # every third lecture is untagged
+        if i % 10 == 1:
+            tag_ids = ",".join(tag_ids)  # v1 payloads may send a comma-separated string
+        lectures.append({"id": i, "lecture_title": f"הרצאה {i}", "lecture_description": f"תיאור {i % 17}",
+                         "lecture_tag_ids": tag_ids})
+    return lectures, tags_data
+
+
+def test_streaming_trainer_matches_in_memory():
+    lectures, tags_data = make_training_data()
+    train_config = Config()
+    train_config.min_confidence_threshold = 0.0  # Keep calibrated thresholds from being clamped to one value
+    embeddings_gen = StandInEmbeddings()
+    tag_embeddings = embeddings_gen.generate_tag_embeddings({tag_id: t["name_he"] for tag_id, t in tags_data.items()})
+    
+    in_memory = PrototypeKNN(train_config)
+    lecture_embeddings = embeddings_gen.generate_lecture_embeddings(lectures)
+    in_memory.build_prototypes(lectures, lecture_embeddings, tags_data)
+    in_memory.calibrate_thresholds(lectures, lecture_embeddings, tag_embeddings)
+    
+    streaming_gen = StandInEmbeddings()
+    with StreamingTrainer(streaming_gen, batch_size=7) as trainer:
+        for lecture in lectures:
+            trainer.add_lecture(lecture)
+        streamed = trainer.build(train_config, tags_data, tag_embeddings)
+    
+    assert trainer.num_lectures == len(lectures)
+    assert trainer.num_embedded == sum(1 for i in range(len(lectures)) if i % 3), trainer.num_embedded
+    assert streaming_gen.calls == -(-trainer.num_embedded // 7), "lectures should be embedded in batches"
+    
+    assert set(streamed.tag_prototypes) == set(in_memory.tag_prototypes)
+    for tag_id, prototype in in_memory.tag_prototypes.items():
+        assert np.allclose(streamed.tag_prototypes[tag_id], prototype, atol=1e-6), tag_id
+    assert set(streamed.tag_thresholds) == set(in_memory.tag_thresholds)
+    assert len(set(in_memory.tag_thresholds.values())) > 1, "thresholds should be calibrated, not defaults"
+    for tag_id, threshold in in_memory.tag_thresholds.items():
+        assert abs(streamed.tag_thresholds[tag_id] - threshold) < 1e-5, (tag_id, streamed.tag_thresholds[tag_id], threshold)
+    print(f"✅ StreamingTrainer matches build_prototypes/calibrate_thresholds for {len(in_memory.tag_prototypes)} tags")
+
+
+if __name__ == "__main__":
+    tests = [
+        test_matches_json_loads_at_every_chunk_size,
+        test_rejects_malformed_bodies,
+        test_streaming_trainer_matches_in_memory
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {type(e).__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Offline check of conditional, paginated training data fetching.
+
+Runs TrainingDataFetcher (used by /get-data-and-train) against a local
+stand-in for the tags manager /v2/train-data API and verifies:
+- pages are followed via Link rel="next" and next_cursor and merged
+- a failing page (503, then a dropped connection) is retried on its own
+- an unchanged dataset is skipped: 304 via If-None-Match / If-Modified-Since,
+  or the same body fingerprint when the server sends no validators
+- a changed dataset is fetched again; retries give up after max_retries and
+  4xx errors are not retried
+- POST /prewarm-bios without a lecturers list collects the lecturers of the
+  fetched dataset (the bio searches themselves are not run)
+
+Runs offline (no server, no API calls).
+
+Usage: python test_training_data_fetch.py
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from src.training_data_fetcher import TrainingDataFetcher
+
+API_KEY = "test-key"
+LAST_MODIFIED = "Sun, 18 Oct 2026 10:00:00 GMT"
+
+
+def make_dataset(num_lectures: int, version: int = 1) -> dict:
+    labels = [{"airtable_id": f"recLabel{i}", "name": f"תגית {i}", "category": "נושא"} for i in range(5)]
+    lectures = [{"airtable_id": f"recLecture{i}", "title": f"הרצאה {i} v{version}", "description": "תיאור",
+                 "lecturer_id": f"recLecturer{i % 7}"}
+                for i in range(num_lectures)]
+    lecture_labels = [{"lecture_id": f"recLecture{i}", "label_id": f"recLabel{i % 5}"} for i in range(num_lectures)]
+    return {"labels": labels, "lectures": lectures, "lecture_labels": lecture_labels}
+
+
+class StandInAPI:
+    """Paginated /v2/train-data stand-in with ETag support and injectable failures."""
+    
+    def __init__(self, dataset: dict, page_size: int = 10, pagination: str = "link", validators: bool = True):
+        self.dataset = dataset
+        self.version = 1
+        self.page_size = page_size
+        self.pagination = pagination
+        self.validators = validators
+        self.failures = {}  # page number -> list of 'status:<code>' / 'drop' still to inject
+        self.requests = []  # (page, status, request headers)
+        
+        api = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                api.handle(self)
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v2/train-data"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def etag(self) -> str:
+        return f'"dataset-v{self.version}"'
+    
+    def last_modified(self) -> str:
+        return LAST_MODIFIED if self.version == 1 else "Mon, 19 Oct 2026 10:00:00 GMT"
+    
+    def handle(self, handler: BaseHTTPRequestHandler):
+        query = parse_qs(urlparse(handler.path).query)
+        page = int((query.get("page") or query.get("cursor") or ["1"])[0])
+        headers = dict(handler.headers)
+        
+        if headers.get("X-API-KEY") != API_KEY:
+            return self.reply(handler, page, headers, 401, {"error": "unauthorized"})
+        
+        pending = self.failures.get(page) or []
+        if pending:
+            failure = pending.pop(0)
+            if failure == "drop":
+                self.requests.append((page, "drop", headers))
+                handler.close_connection = True
+                handler.wfile.flush()
+                handler.connection.close()
+                return
+            return self.reply(handler, page, headers, int(failure.split(":")[1]), {"error": "unavailable"},
+                              {"Retry-After": "0"})
+        
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        if "If-None-Match" in headers:
+            not_modified = headers["If-None-Match"] == self.etag()
+        else:
+            not_modified = headers.get("If-Modified-Since") == self.last_modified()
+        if self.validators and page == 1 and not_modified:
+            return self.reply(handler, page, headers, 304, None)
+        
+        limit = int(query.get("limit", [self.page_size])[0])
+        total = len(self.dataset["lectures"])
+        num_pages = max(1, -(-total // limit))
+        start, end = (page - 1) * limit, page * limit
+        body = {
+            "labels": self.dataset["labels"] if page == 1 else [],
+            "lectures": self.dataset["lectures"][start:end],
+            "lecture_labels": self.dataset["lecture_labels"][start:end]
+        }
+        
+        extra_headers = {}
+        if self.validators:
+            extra_headers["ETag"] = self.etag()
+            extra_headers["Last-Modified"] = self.last_modified()
+        if page < num_pages:
+            if self.pagination == "link":
+                extra_headers["Link"] = f'<{urlparse(self.url).path}?page={page + 1}&limit={limit}>; rel="next"'
+            else:
+                body["next_cursor"] = str(page + 1)
+        
+        self.reply(handler, page, headers, 200, body, extra_headers)
+    
+    def reply(self, handler, page, request_headers, status, body, extra_headers=None):
+        self.requests.append((page, status, request_headers))
+        payload = json.dumps(body, ensure_ascii=False).encode() if body is not None else b""
+        handler.send_response(status)
+        if payload:
+            handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        for name, value in (extra_headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+
+def make_fetcher(url: str, **kwargs) -> TrainingDataFetcher:
+    return TrainingDataFetcher(url, API_KEY, backoff_seconds=0.01, timeout=5, **kwargs)
+
+
+def test_paginated_fetch_with_retries():
+    dataset = make_dataset(45)
+    api = StandInAPI(dataset, page_size=10)
+    api.failures = {3: ["status:503", "drop"]}
+    try:
+        result = make_fetcher(api.url, page_size=10).fetch()
+    finally:
+        api.close()
+    
+    assert result is not None
+    assert result["num_pages"] == 5, result["num_pages"]
+    assert result["data"] == dataset, "merged pages differ from the dataset"
+    assert result["sync"]["etag"] == '"dataset-v1"' and result["sync"]["last_modified"] == LAST_MODIFIED
+    
+    page3 = [status for page, status, _ in api.requests if page == 3]
+    assert page3 == [503, "drop", 200], page3
+    assert [page for page, status, _ in api.requests if status == 200] == [1, 2, 3, 4, 5]
+    print(f"✅ 5 pages merged, page 3 retried twice ({len(api.requests)} requests)")
+
+
+def test_conditional_fetch_skips_unchanged():
+    api = StandInAPI(make_dataset(25), page_size=10)
+    try:
+        fetcher = make_fetcher(api.url)
+        first = fetcher.fetch()
+        api.requests.clear()
+        
+        assert fetcher.fetch(first["sync"]) is None
+        assert len(api.requests) == 1, "unchanged dataset should cost one request"
+        _, status, headers = api.requests[0]
+        assert status == 304 and headers.get("If-None-Match") == '"dataset-v1"'
+        
+        # Last-Modified alone is enough too
+        api.requests.clear()
+        assert fetcher.fetch({"last_modified": first["sync"]["last_modified"]}) is None
+        assert api.requests[0][1] == 304
+        
+        # Changed dataset: new ETag, fetched again
+        api.dataset = make_dataset(25, version=2)
+        api.version = 2
+        changed = fetcher.fetch(first["sync"])
+        assert changed is not None and changed["sync"]["etag"] == '"dataset-v2"'
+        assert fetcher.fetch({"last_modified": first["sync"]["last_modified"]}) is not None
+        assert changed["data"]["lectures"][0]["title"].endswith("v2")
+    finally:
+        api.close()
+    
+    print("✅ Unchanged dataset skipped with one 304 request, changed dataset refetched")
+
+
+def test_fingerprint_fallback_without_validators():
+    api = StandInAPI(make_dataset(25), page_size=10, pagination="cursor", validators=False)
+    try:
+        fetcher = make_fetcher(api.url)
+        first = fetcher.fetch()
+        assert first["num_pages"] == 3 and len(first["data"]["lectures"]) == 25
+        assert first["sync"]["etag"] is None and first["sync"]["fingerprint"]
+        
+        assert fetcher.fetch(first["sync"]) is None, "same bodies should match the stored fingerprint"
+        
+        api.dataset = make_dataset(25, version=2)
+        assert fetcher.fetch(first["sync"]) is not None
+    finally:
+        api.close()
+    
+    print("✅ Cursor pagination followed; fingerprint detects unchanged/changed data")
+
+
+def test_errors():
+    api = StandInAPI(make_dataset(5))
+    try:
+        api.failures = {1: ["status:503"] * 5}
+        try:
+            make_fetcher(api.url, max_retries=2).fetch()
+            raise AssertionError("expected HTTPError after retries")
+        except requests.HTTPError:
+            pass
+        assert len(api.requests) == 3, len(api.requests)
+        
+        api.requests.clear()
+        api.failures = {}
+        try:
+            TrainingDataFetcher(api.url, "wrong-key", backoff_seconds=0.01).fetch()
+            raise AssertionError("expected HTTPError for 401")
+        except requests.HTTPError:
+            pass
+        assert len(api.requests) == 1, "4xx must not be retried"
+    finally:
+        api.close()
+    
+    print("✅ Retries stop after max_retries, 4xx is not retried")
+
+
+def test_prewarm_bios_uses_fetched_lecturers():
+    api = StandInAPI(make_dataset(25), page_size=10)
+    os.environ["TRAIN_DATA_API_URL"] = api.url
+    os.environ["TRAIN_DATA_X_API_KEY"] = API_KEY
+    
+    import api_server
+    
+    started = []
+    original_start = api_server.start_bio_prewarm
+    api_server.start_bio_prewarm = lambda lecturers, source: started.append((lecturers, source)) or (PrewarmJobStub(), True)
+    try:
+        response = api_server.app.test_client().post('/prewarm-bios')
+    finally:
+        api_server.start_bio_prewarm = original_start
+        api.close()
+    
+    assert response.status_code == 202, (response.status_code, response.get_json())
+    lecturers, source = started[0]
+    assert source == "training-data"
+    assert sorted(l["lecturer_id"] for l in lecturers) == [f"recLecturer{i}" for i in range(7)], lecturers
+    print(f"✅ /prewarm-bios collected {len(lecturers)} lecturers from the fetched dataset")
+
+
+class PrewarmJobStub:
+    def progress(self):
+        return {}
+
+
+if __name__ == "__main__":
+    tests = [
+        test_paginated_fetch_with_retries,
+        test_conditional_fetch_skips_unchanged,
+        test_fingerprint_fallback_without_validators,
+        test_errors,
+        test_prewarm_bios_uses_fetched_lecturers
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {type(e).__name__}: {e}")
+    sys.exit(1 if failed else 0)